@@ -2,10 +2,11 @@ import tkinter as tk
 from tkinter import messagebox, ttk
 from tkinter.simpledialog import askstring, askfloat
 import numpy as np
-from scipy.optimize import linprog
 import uuid
 import math
 
+import transport
+
 class TransportProblemGUI:
     def __init__(self, root):
         self.root = root
@@ -240,43 +241,31 @@ class TransportProblemGUI:
         
         m = len(supply_nodes)
         n = len(demand_nodes)  # m == n
-        
-        c = []
-        A_eq = []
-        b_eq = []
+        edge_index = {(e["from"], e["to"]): e for e in self.edges}
+        try:
+            cost = transport.cost_matrix_from_index(
+                [s["id"] for s in supply_nodes], [d["id"] for d in demand_nodes], edge_index)
+        except transport.MissingEdgeError as e:
+            messagebox.showerror("Error", f"Falta la arista de {e.source[:4]} a {e.target[:4]}")
+            return
         
         # Construir matriz de costos
         result_text = "Función Objetivo (Asignación):\nMin Z = "
         cost_terms = []
-        for i, s in enumerate(supply_nodes):
-            for j, d in enumerate(demand_nodes):
-                cost = next((e["cost"] for e in self.edges if e["from"] == s["id"] and e["to"] == d["id"]), None)
-                if cost is None:
-                    messagebox.showerror("Error", f"Falta la arista de {s['id'][:4]} a {d['id'][:4]}")
-                    return
-                c.append(cost)
-                cost_terms.append(f"{cost}*x_{i+1}{j+1}")
+        for i in range(m):
+            for j in range(n):
+                cost_terms.append(f"{cost[i, j]}*x_{i+1}{j+1}")
         result_text += " + ".join(cost_terms) + "\n\n"
         
         # Restricciones: cada agente se asigna a una sola tarea (suma de cada fila = 1)
         result_text += "Restricciones de Agentes (suma por fila = 1):\n"
         for i in range(m):
-            row = [0] * (m * n)
-            for j in range(n):
-                row[i * n + j] = 1
-            A_eq.append(row)
-            b_eq.append(1)
             terms = [f"x_{i+1}{j+1}" for j in range(n)]
             result_text += f"{' + '.join(terms)} = 1 (Agente {supply_nodes[i]['id'][:4]})\n"
         
         # Restricciones: cada tarea se asigna a un solo agente (suma de cada columna = 1)
         result_text += "\nRestricciones de Tareas (suma por columna = 1):\n"
         for j in range(n):
-            row = [0] * (m * n)
-            for i in range(m):
-                row[i * n + j] = 1
-            A_eq.append(row)
-            b_eq.append(1)
             terms = [f"x_{i+1}{j+1}" for i in range(m)]
             result_text += f"{' + '.join(terms)} = 1 (Tarea {demand_nodes[j]['id'][:4]})\n"
         
@@ -284,24 +273,21 @@ class TransportProblemGUI:
         result_text += "\nRestricciones de Asignación:\n"
         result_text += ", ".join([f"x_{i+1}{j+1} ∈ {{0, 1}}" for i in range(m) for j in range(n)]) + "\n\n"
         
-        # Resolver usando linprog (forzando variables binarias con límites 0 y 1)
-        res = linprog(c, A_eq=A_eq, b_eq=b_eq, bounds=(0, 1), method="simplex")
+        # Resolver con el núcleo de transport (devuelve asignaciones 0 o 1)
+        sol = transport.solve_assignment(cost)
         
-        if res.success:
-            solution = np.round(res.x.reshape(m, n))  # Redondear para asegurar 0 o 1
+        if sol.success:
+            solution = sol.flows
             result_text += "Solución Óptima (Asignación):\n"
-            total_cost = 0
             for i, s in enumerate(supply_nodes):
                 for j, d in enumerate(demand_nodes):
                     if solution[i][j] == 1:
-                        cost = c[i * n + j]
-                        result_text += f"Agente {s['id'][:4]} asignado a Tarea {d['id'][:4]}: costo {cost}\n"
-                        total_cost += cost
-                        edge = next((e for e in self.edges if e["from"] == s["id"] and e["to"] == d["id"]), None)
+                        result_text += f"Agente {s['id'][:4]} asignado a Tarea {d['id'][:4]}: costo {cost[i, j]}\n"
+                        edge = edge_index.get((s["id"], d["id"]))
                         if edge and edge["line_id"]:
                             self.canvas.itemconfig(edge["line_id"], fill="#4CAF50", width=3)
                             self.solution_edges.append(edge)
-            result_text += f"Costo Total: {total_cost}\n"
+            result_text += f"Costo Total: {sol.objective}\n"
             messagebox.showinfo("Resultado", result_text)
         else:
             messagebox.showerror("Error", "No se pudo encontrar una solución óptima para el problema de asignación")
@@ -323,77 +309,54 @@ class TransportProblemGUI:
         total_supply = sum(n["supply"] for n in supply_nodes)
         total_demand = sum(n["demand"] for n in demand_nodes)
         
+        real_m, n = len(supply_nodes), len(demand_nodes)
+        edge_index = {(e["from"], e["to"]): e for e in self.edges}
+        try:
+            cost = transport.cost_matrix_from_index(
+                [s["id"] for s in supply_nodes], [d["id"] for d in demand_nodes], edge_index)
+        except transport.MissingEdgeError as e:
+            messagebox.showerror("Error", f"Falta la arista de {e.source[:4]} a {e.target[:4]}")
+            return
+        supply = np.array([s["supply"] for s in supply_nodes], dtype=float)
+        demand = np.array([d["demand"] for d in demand_nodes], dtype=float)
+        
         # Programación defensiva
         if total_supply < total_demand:
             shortfall = total_demand - total_supply
-            fict_node_id = str(uuid.uuid4())[:8]
-            supply_nodes.append({
-                "id": fict_node_id,
-                "x": 0,
-                "y": 0,
-                "supply": shortfall,
-                "demand": 0
-            })
+            # El nodo ficticio de oferta es sólo una fila más del modelo, con
+            # costo 10000 a cada demanda: no se agregan aristas a self.edges
+            supply, demand, cost, _ = transport.balance(supply, demand, cost, dummy_cost=10000)
+            supply_nodes = supply_nodes + [{"id": "Ficticio", "supply": shortfall, "demand": 0}]
             messagebox.showwarning(
                 "Advertencia",
                 f"La oferta total ({total_supply}) es menor que la demanda total ({total_demand}). "
                 f"Se agregó un nodo ficticio de oferta con {shortfall} unidades."
             )
-            for d in demand_nodes:
-                self.edges.append({
-                    "from": fict_node_id,
-                    "to": d["id"],
-                    "cost": 10000,
-                    "line_id": None,
-                    "text_id": None,
-                    "rect_id": None
-                })
         elif total_supply > total_demand:
             messagebox.showinfo(
                 "Información",
                 f"La oferta total ({total_supply}) es mayor que la demanda total ({total_demand}). "
                 "El exceso de oferta no se utilizará."
             )
-        
-        m, n = len(supply_nodes), len(demand_nodes)
-        c = []
-        A_eq = []
-        b_eq = []
-        A_ub = []
-        b_ub = []
+        m = len(supply_nodes)
         
         # Construir matriz de costos y función objetivo
         result_text = "Función Objetivo:\nMin Z = "
         cost_terms = []
-        for i, s in enumerate(supply_nodes):
-            for j, d in enumerate(demand_nodes):
-                cost = next((e["cost"] for e in self.edges if e["from"] == s["id"] and e["to"] == d["id"]), None)
-                if cost is None:
-                    messagebox.showerror("Error", f"Falta la arista de {s['id'][:4]} a {d['id'][:4]}")
-                    return
-                c.append(cost)
-                cost_terms.append(f"{cost}*x_{i+1}{j+1}")
+        for i in range(m):
+            for j in range(n):
+                cost_terms.append(f"{cost[i, j]}*x_{i+1}{j+1}")
         result_text += " + ".join(cost_terms) + "\n\n"
         
         # Restricciones de oferta (menor o igual)
         result_text += "Restricciones de Oferta (≤):\n"
         for i in range(m):
-            row = [0] * (m * n)
-            for j in range(n):
-                row[i * n + j] = 1
-            A_ub.append(row)
-            b_ub.append(supply_nodes[i]["supply"])
             terms = [f"x_{i+1}{j+1}" for j in range(n)]
             result_text += f"{' + '.join(terms)} ≤ {supply_nodes[i]['supply']} (Planta {supply_nodes[i]['id'][:4]})\n"
         
         # Restricciones de demanda (igual)
         result_text += "\nRestricciones de Demanda (=):\n"
         for j in range(n):
-            row = [0] * (m * n)
-            for i in range(m):
-                row[i * n + j] = 1
-            A_eq.append(row)
-            b_eq.append(demand_nodes[j]["demand"])
             terms = [f"x_{i+1}{j+1}" for i in range(m)]
             result_text += f"{' + '.join(terms)} = {demand_nodes[j]['demand']} (Comprador {demand_nodes[j]['id'][:4]})\n"
         
@@ -401,27 +364,24 @@ class TransportProblemGUI:
         result_text += "\nRestricciones de No Negatividad:\n"
         result_text += ", ".join([f"x_{i+1}{j+1} ≥ 0" for i in range(m) for j in range(n)]) + "\n\n"
         
-        # Resolver usando linprog
-        res = linprog(c, A_eq=A_eq, b_eq=b_eq, A_ub=A_ub, b_ub=b_ub, bounds=(0, None), method="simplex")
+        # Resolver con el núcleo de transport
+        sol = transport.solve_transport(supply, demand, cost)
         
-        if res.success:
-            solution = res.x.reshape(m, n)
+        if sol.success:
+            solution = sol.flows
             result_text += "Solución Óptima:\n"
-            total_cost = 0
             used_fictitious = False
             for i, s in enumerate(supply_nodes):
                 for j, d in enumerate(demand_nodes):
                     if solution[i][j] > 0:
-                        cost = c[i * n + j]
-                        result_text += f"De {s['id'][:4]} a {d['id'][:4]}: {solution[i][j]} unidades, costo: {cost * solution[i][j]}\n"
-                        total_cost += cost * solution[i][j]
-                        edge = next((e for e in self.edges if e["from"] == s["id"] and e["to"] == d["id"]), None)
+                        result_text += f"De {s['id'][:4]} a {d['id'][:4]}: {solution[i][j]} unidades, costo: {cost[i, j] * solution[i][j]}\n"
+                        edge = edge_index.get((s["id"], d["id"]))
                         if edge and edge["line_id"]:
                             self.canvas.itemconfig(edge["line_id"], fill="#4CAF50", width=3)
                             self.solution_edges.append(edge)
-                        if s["id"] in [n["id"] for n in supply_nodes if n["x"] == 0 and n["y"] == 0]:
+                        if i >= real_m:
                             used_fictitious = True
-            result_text += f"Costo Total: {total_cost}\n"
+            result_text += f"Costo Total: {sol.objective}\n"
             if used_fictitious:
                 result_text += "Nota: Se usó el nodo ficticio, indicando que no se puede satisfacer toda la demanda."
             messagebox.showinfo("Resultado", result_text)
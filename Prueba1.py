@@ -1,13 +1,199 @@
 import tkinter as tk
-from tkinter import messagebox, ttk
+from tkinter import filedialog, messagebox, ttk
 from tkinter.simpledialog import askstring, askfloat
 import numpy as np
-from scipy.optimize import linprog
+import json
+import queue
+import threading
+import time
 import uuid
 import math
 
+import transport
+
+
+# --------------------------------------------
+# Grilla jerárquica para ubicar nodos y aristas en el canvas
+# --------------------------------------------
+# Cada elemento es un segmento (x0, y0, x1, y1); un nodo es un segmento de
+# largo cero. Hay varios niveles de grilla, cada uno con celdas 4 veces más
+# grandes que el anterior, y cada segmento se guarda en el primer nivel en
+# que cruza a lo sumo unas pocas celdas: así una arista larga no ocupa
+# cientos de celdas. Un clic o la vista visible sólo revisan los elementos
+# de las celdas que tocan en cada nivel, no todo el dibujo.
+#
+# Las claves son filas de la red (enteros ≥ 0), así los segmentos
+# insertados se guardan en un arreglo indexado por la clave.
+class SpatialGrid:
+    SPAN_CELLS = 4  # largo máximo (en celdas de su nivel) de un segmento
+
+    def __init__(self, cell=40):
+        self.cell = cell
+        self.clear()
+
+    def clear(self):
+        self.levels = {}                    # nivel → {(cx, cy) → set de claves}
+        self.segments = np.zeros((0, 4))    # fila clave → (x0, y0, x1, y1) con que se insertó
+        self.present = np.zeros(0, dtype=bool)
+
+    def _level_of(self, coords):
+        span = np.maximum(np.abs(coords[:, 2] - coords[:, 0]), np.abs(coords[:, 3] - coords[:, 1]))
+        ratio = np.maximum(span / (self.SPAN_CELLS * self.cell), 1.0)
+        return np.ceil(np.log(ratio) / np.log(4)).astype(np.int64)
+
+    @staticmethod
+    def _cells_of(coords, c):
+        """Pares (posición del segmento, cx, cy) de las celdas de lado c que cruza cada segmento.
+
+        Se recorre cada columna de celdas que abarca el segmento y, dentro
+        de ella, el rango de filas entre las alturas del segmento en los
+        bordes de la columna. Todo vectorizado para cargar redes grandes.
+        """
+        x0, y0, x1, y1 = coords.T
+        flip = x0 > x1
+        x0, x1 = np.where(flip, x1, x0), np.where(flip, x0, x1)
+        y0, y1 = np.where(flip, y1, y0), np.where(flip, y0, y1)
+        cx0 = np.floor(x0 / c).astype(np.int64)
+        ncol = np.floor(x1 / c).astype(np.int64) - cx0 + 1
+        seg = np.repeat(np.arange(len(coords)), ncol)
+        cx = cx0[seg] + np.arange(seg.size) - np.repeat(np.cumsum(ncol) - ncol, ncol)
+
+        width = x1 - x0
+        slope = np.divide(y1 - y0, width, out=np.zeros_like(width), where=width > 0)
+        xa = np.maximum(x0[seg], cx * c)
+        xb = np.minimum(x1[seg], (cx + 1) * c)
+        sloped = width[seg] > 0
+        ya = np.where(sloped, y0[seg] + slope[seg] * (xa - x0[seg]), y0[seg])
+        yb = np.where(sloped, y0[seg] + slope[seg] * (xb - x0[seg]), y1[seg])
+        cy0 = np.floor(np.minimum(ya, yb) / c).astype(np.int64)
+        nrow = np.floor(np.maximum(ya, yb) / c).astype(np.int64) - cy0 + 1
+
+        pair = np.repeat(np.arange(seg.size), nrow)
+        cy = cy0[pair] + np.arange(pair.size) - np.repeat(np.cumsum(nrow) - nrow, nrow)
+        return seg[pair], cx[pair], cy
+
+    def _grouped(self, keys, coords):
+        """Recorre (nivel, celda, claves) agrupando los pares por celda."""
+        if keys.size == 0:
+            return
+        level = self._level_of(coords)
+        for lv in np.unique(level).tolist():
+            rows = np.flatnonzero(level == lv)
+            seg, cx, cy = self._cells_of(coords[rows], self.cell * 4 ** lv)
+            order = np.lexsort((cy, cx))
+            seg, cx, cy = rows[seg[order]], cx[order], cy[order]
+            starts = np.flatnonzero(np.r_[True, (cx[1:] != cx[:-1]) | (cy[1:] != cy[:-1])])
+            stops = np.r_[starts[1:], seg.size]
+            for start, stop in zip(starts.tolist(), stops.tolist()):
+                yield lv, (int(cx[start]), int(cy[start])), keys[seg[start:stop]].tolist()
+
+    def insert(self, keys, coords):
+        """Agrega los segmentos coords[k] = (x0, y0, x1, y1) con las claves keys[k]."""
+        keys = np.asarray(keys, dtype=np.int64).ravel()
+        coords = np.asarray(coords, dtype=float).reshape(-1, 4)
+        self.remove(keys)
+        size = int(keys.max()) + 1 if keys.size else 0
+        if size > self.present.size:
+            size = max(size, 2 * self.present.size)
+            self.segments = np.concatenate([self.segments, np.zeros((size - self.present.size, 4))])
+            self.present = np.concatenate([self.present, np.zeros(size - self.present.size, dtype=bool)])
+        self.segments[keys] = coords
+        self.present[keys] = True
+        for lv, cell, members in self._grouped(keys, coords):
+            self.levels.setdefault(lv, {}).setdefault(cell, set()).update(members)
+
+    def remove(self, keys):
+        keys = np.asarray(keys, dtype=np.int64).ravel()
+        keys = keys[keys < self.present.size]
+        keys = keys[self.present[keys]]
+        self.present[keys] = False
+        for lv, cell, members in self._grouped(keys, self.segments[keys]):
+            cells = self.levels.get(lv, {})
+            bucket = cells.get(cell)
+            if bucket is not None:
+                bucket.difference_update(members)
+                if not bucket:
+                    del cells[cell]
+
+    def query(self, x, y, radius):
+        """Claves de los segmentos en las celdas que toca el cuadrado de lado 2·radius en (x, y)."""
+        return self.query_rect(x - radius, y - radius, x + radius, y + radius)
+
+    def query_rect(self, x0, y0, x1, y1):
+        """Claves de los segmentos en las celdas que toca el rectángulo [x0, x1] × [y0, y1]."""
+        found = set()
+        for lv, cells in self.levels.items():
+            c = self.cell * 4 ** lv
+            cx0, cx1 = math.floor(x0 / c), math.floor(x1 / c)
+            cy0, cy1 = math.floor(y0 / c), math.floor(y1 / c)
+            if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(cells):
+                # Rectángulo con más celdas que las ocupadas: se recorren éstas
+                for (cx, cy), members in cells.items():
+                    if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                        found.update(members)
+                continue
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    found.update(cells.get((cx, cy), ()))
+        return found
+
+    def segments_in_rect(self, x0, y0, x1, y1):
+        """Claves de los segmentos que cortan de verdad el rectángulo (no sólo sus celdas)."""
+        keys = np.fromiter(self.query_rect(x0, y0, x1, y1), dtype=np.int64)
+        if keys.size == 0:
+            return set()
+        s = self.segments[keys]
+        inside = ((np.minimum(s[:, 0], s[:, 2]) <= x1) & (np.maximum(s[:, 0], s[:, 2]) >= x0)
+                  & (np.minimum(s[:, 1], s[:, 3]) <= y1) & (np.maximum(s[:, 1], s[:, 3]) >= y0))
+        # La recta del segmento no deja las 4 esquinas del mismo lado
+        dx, dy = s[:, 2] - s[:, 0], s[:, 3] - s[:, 1]
+        sides = np.stack([dx * (cy - s[:, 1]) - dy * (cx - s[:, 0])
+                          for cx, cy in ((x0, y0), (x1, y0), (x0, y1), (x1, y1))])
+        inside &= ~((sides > 0).all(axis=0) | (sides < 0).all(axis=0))
+        return set(keys[inside].tolist())
+
+
+# --------------------------------------------
+# Vistas de la red con los ítems de canvas de lo que está dibujado
+# --------------------------------------------
+# Los datos (id, posición, oferta/demanda, costo, flujo) viven en las
+# columnas de transport.Network; estas vistas sólo agregan los ids de los
+# ítems del canvas y existen mientras el nodo o la arista está en la vista.
+class NodeItem(transport.NodeView):
+    __slots__ = ("tag", "style", "oval_id", "label_id", "value_rect_id", "value_text_id")
+
+    def __init__(self, net, row):
+        super().__init__(net, row)
+        self.tag = self.style = None
+        self.oval_id = self.label_id = self.value_rect_id = self.value_text_id = None
+
+
+class EdgeItem(transport.EdgeView):
+    __slots__ = ("label", "line_id", "rect_id", "text_id")
+
+    def __init__(self, net, row):
+        super().__init__(net, row)
+        self.label = self.line_id = self.rect_id = self.text_id = None
+
 
 class TransportProblemGUI:
+    # Con más aristas visibles que esto no se dibujan las etiquetas de costo
+    # (tres ítems de canvas por arista en lugar de uno)
+    EDGE_LABEL_LIMIT = 2000
+
+    # Niveles de detalle de la vista: con escala menor que LABEL_SCALE no se
+    # dibujan costos ni recuadros de valor; con escala menor que
+    # CLUSTER_SCALE los nodos que caen en una misma celda de CLUSTER_CELL px
+    # se dibujan como un cúmulo y sus aristas como un haz
+    LABEL_SCALE = 0.75
+    CLUSTER_SCALE = 0.4
+    CLUSTER_CELL = 30
+    MIN_SCALE, MAX_SCALE = 0.01, 8.0
+
+    # Id con que aparece en el reporte el nodo ficticio del balanceo (no
+    # existe en el grafo, sólo en el modelo que se resuelve)
+    DUMMY_ID = "Ficticio"
+
     def __init__(self, root):
         self.root = root
         self.root.title("Problema de Transporte / Asignación")
@@ -15,29 +201,63 @@ class TransportProblemGUI:
         # ----------------------------
         # Estructuras de datos
         # ----------------------------
-        # Cada nodo: {
-        #    "id": str,
-        #    "x": float, "y": float,
-        #    "supply": float, "demand": float,
-        #    "fictitious": bool,
-        #    "oval_id": int, "label_id": int,
-        #    "value_rect_id": int, "value_text_id": int,
-        #    "tag": str
-        # }
-        self.nodes = []
-
-        # Cada arista: {
-        #    "from": nodo_origen_id,
-        #    "to": nodo_destino_id,
-        #    "cost": float,
-        #    "line_id": int, "rect_id": int, "text_id": int
-        # }
-        self.edges = []
-
-        # Para gestionar arrastre de nodos
+        # Nodos y aristas en columnas (transport.Network): cada nodo es una
+        # fila de x, y, supply, demand con su id en net.ids, y cada arista una
+        # fila de src, dst (filas de nodo), cost y flow (flujo de la última
+        # solución). Las filas son las claves de todo lo demás; las búsquedas
+        # por id (net.index), por par y por nodo (net.find_edge,
+        # net.incident) no recorren la red.
+        self.net = transport.Network()
+
+        # Grillas espaciales para el hit-testing de clics:
+        #    node_grid: fila de nodo → posición del nodo
+        #    edge_grid: fila de arista → segmento de la arista
+        self.node_grid = SpatialGrid()
+        self.edge_grid = SpatialGrid()
+
+        # Último simplex de transporte resuelto y sus (ofertas, demandas),
+        # para re-optimizar desde su base tras ediciones pequeñas
+        self.warm_engine = None
+        self.warm_key = None
+
+        # Vista del canvas: (x, y) es el punto del mundo que queda en la
+        # esquina superior izquierda y scale los píxeles por unidad; "drawn"
+        # es la vista con que se ubicaron los ítems actuales. Sólo los nodos y
+        # aristas que caen en la vista tienen ítems en el canvas:
+        #    drawn_nodes: fila de nodo → NodeItem dibujado
+        #    drawn_edges: fila de arista → EdgeItem dibujado
+        self.view = {"x": 0.0, "y": 0.0, "scale": 1.0, "w": 600, "h": 450, "drawn": None}
+        self.view_labels = True
+        self.view_clusters = False
+        self.drawn_nodes = {}
+        self.drawn_edges = {}
+        self.render_pending = None
+        self.pan_data = {"x": 0, "y": 0}
+
+        # Contexto de la última resolución de transporte (ids, datos, solución
+        # y motor) para el panel de sensibilidad
+        self.last_transport = None
+
+        # Resolución en curso en un hilo de trabajo: {"cancel": Event, "dialog": Toplevel}
+        self.solver_job = None
+
+        # Perfil por fases de la última resolución (transport.Timings) y
+        # archivo del log JSON de perfiles (None = no se registra)
+        self.last_timings = None
+        self.timing_log = None
+
+        # Soluciones ya calculadas por huella de la instancia (oferta,
+        # demanda, costos, tipo y método): resolver de nuevo una red sin
+        # cambios, o reabrirla, no vuelve a llamar al solver
+        self.solution_cache = transport.SolutionCache(maxsize=32)
+
+        # Para gestionar arrastre de nodos: (x0, y0) es la última posición
+        # dibujada, (x, y) la última recibida y "pending" el redibujo agendado
         self.drag_data = {
             "node": None,
-            "x0": 0, "y0": 0
+            "x0": 0, "y0": 0,
+            "x": 0, "y": 0,
+            "pending": None
         }
 
         # ----------------------------
@@ -52,7 +272,9 @@ class TransportProblemGUI:
             "4. Arrastra un nodo (clic izquierdo + mover) para reubicarlo.\n"
             "5. Haz clic en 'Resolver' para Asignación o Transporte.\n"
             "6. Botón 'Limpiar' para borrar todo el canvas.\n"
-            "\nLos nodos ficticios aparecen en gris, con oferta o demanda = diferencia."
+            "7. Rueda del ratón para acercar/alejar; botón central + arrastre para desplazar.\n"
+            "   Con la vista alejada los nodos cercanos se agrupan: clic para acercar.\n"
+            "\nSi oferta y demanda no están balanceadas, el reporte agrega un nodo 'Ficticio'."
         )
         ttk.Label(
             self.instruction_frame,
@@ -67,11 +289,20 @@ class TransportProblemGUI:
         # ----------------------------
         self.canvas = tk.Canvas(root, width=600, height=450, bg="#f0f0f0",
                                 highlightthickness=1, highlightbackground="#cccccc")
-        self.canvas.pack(pady=10)
+        self.canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         # Clic izquierdo: agregar nodo o iniciar arrastre
         self.canvas.bind("<Button-1>", self.on_canvas_click)
         # Clic derecho: opciones sobre nodo o arista
         self.canvas.bind("<Button-3>", self.canvas_options)
+        # Rueda: zoom en torno al cursor (Windows/macOS y X11)
+        self.canvas.bind("<MouseWheel>", self.on_wheel)
+        self.canvas.bind("<Button-4>", self.on_wheel)
+        self.canvas.bind("<Button-5>", self.on_wheel)
+        # Botón central + arrastre: desplazar la vista
+        self.canvas.bind("<Button-2>", self.start_pan)
+        self.canvas.bind("<B2-Motion>", self.do_pan)
+        # Cambio de tamaño: re-renderizar lo que ahora es visible
+        self.canvas.bind("<Configure>", lambda event: self.schedule_render())
 
         # ----------------------------
         # Panel de controles (botones, entrada de costo)
@@ -85,6 +316,19 @@ class TransportProblemGUI:
         self.cost_entry.grid(row=0, column=1, padx=5, pady=5)
         self.cost_entry.insert(0, "0")
 
+        # Método para el problema de transporte
+        ttk.Label(self.control_frame, text="Método Transporte:").grid(row=0, column=2, padx=5, pady=5)
+        self.method_var = tk.StringVar(value="auto")
+        self.method_combo = ttk.Combobox(self.control_frame, textvariable=self.method_var,
+                                         values=transport.TRANSPORT_METHODS, state="readonly", width=16)
+        self.method_combo.grid(row=0, column=3, padx=5, pady=5)
+
+        # Tiempo límite de la resolución (vacío = sin límite)
+        ttk.Label(self.control_frame, text="Tiempo límite (s):").grid(row=4, column=0, padx=5, pady=5)
+        self.time_limit_entry = ttk.Entry(self.control_frame)
+        self.time_limit_entry.grid(row=4, column=1, padx=5, pady=5)
+        self.time_limit_entry.insert(0, "60")
+
         # Botón Seleccionar Nodo
         self.select_btn = ttk.Button(self.control_frame, text="Seleccionar Nodo",
                                      command=self.select_node)
@@ -104,11 +348,78 @@ class TransportProblemGUI:
         self.clear_btn = ttk.Button(self.control_frame, text="Limpiar", command=self.clear_canvas)
         self.clear_btn.grid(row=1, column=2, columnspan=2, pady=5, sticky="ew")
 
+        # Botón Sensibilidad
+        self.sensitivity_btn = ttk.Button(self.control_frame, text="Sensibilidad",
+                                          command=self.show_sensitivity)
+        self.sensitivity_btn.grid(row=2, column=2, columnspan=2, pady=5, sticky="ew")
+
+        # Botón Escenarios (lote sobre la red dibujada)
+        self.scenarios_btn = ttk.Button(self.control_frame, text="Escenarios",
+                                        command=self.solve_scenarios)
+        self.scenarios_btn.grid(row=3, column=2, columnspan=2, pady=5, sticky="ew")
+
+        # Botón Importar (red completa desde archivo)
+        self.import_btn = ttk.Button(self.control_frame, text="Importar",
+                                     command=self.import_instance)
+        self.import_btn.grid(row=4, column=2, columnspan=2, pady=5, sticky="ew")
+
+        # Botón Ajustar Vista (encuadra toda la red)
+        self.fit_btn = ttk.Button(self.control_frame, text="Ajustar Vista", command=self.fit_view)
+        self.fit_btn.grid(row=5, column=0, columnspan=4, pady=5, sticky="ew")
+
+        # Botones Guardar / Abrir (sesión completa: posiciones, costos y flujos)
+        self.save_btn = ttk.Button(self.control_frame, text="Guardar", command=self.save_session)
+        self.save_btn.grid(row=6, column=0, columnspan=2, pady=5, sticky="ew")
+        self.open_btn = ttk.Button(self.control_frame, text="Abrir", command=self.open_session)
+        self.open_btn.grid(row=6, column=2, columnspan=2, pady=5, sticky="ew")
+
+        # Botón Costos por Distancia (todas las aristas desde la geometría)
+        self.geometry_btn = ttk.Button(self.control_frame, text="Costos por Distancia",
+                                       command=self.connect_by_geometry)
+        self.geometry_btn.grid(row=7, column=0, columnspan=4, pady=5, sticky="ew")
+
+        # ----------------------------
+        # Panel de tiempos: fases de la última resolución y datos del solver
+        # ----------------------------
+        self.timing_frame = ttk.LabelFrame(root, text="Tiempos de la última resolución", padding=5)
+        self.timing_frame.pack(fill=tk.X, padx=10, pady=(0, 5))
+        self.timing_label = ttk.Label(self.timing_frame, text="Sin resoluciones todavía.",
+                                      font=("Helvetica", 9), justify=tk.LEFT)
+        self.timing_label.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.timing_log_var = tk.BooleanVar(value=False)
+        self.timing_log_check = ttk.Checkbutton(self.timing_frame, text="Registrar en JSON",
+                                                variable=self.timing_log_var,
+                                                command=self.toggle_timing_log)
+        self.timing_log_check.pack(side=tk.RIGHT, padx=5)
+        self.disk_cache_var = tk.BooleanVar(value=False)
+        self.disk_cache_check = ttk.Checkbutton(self.timing_frame, text="Caché en disco",
+                                                variable=self.disk_cache_var,
+                                                command=self.toggle_disk_cache)
+        self.disk_cache_check.pack(side=tk.RIGHT, padx=5)
+
         # Tooltips (opcionales)
         self.create_tooltip(self.select_btn, "Ingresa ID parcial para seleccionar un nodo.")
         self.create_tooltip(self.connect_btn, "Conecta el nodo seleccionado con otro de demanda.")
         self.create_tooltip(self.solve_btn, "Resuelve el modelo de Asignación o Transporte.")
         self.create_tooltip(self.clear_btn, "Borra todos los nodos y aristas del canvas.")
+        self.create_tooltip(self.fit_btn, "Ajusta zoom y desplazamiento para ver toda la red.")
+        self.create_tooltip(self.import_btn, "Carga ofertas, demandas y costos desde .json, .csv o .npz.")
+        self.create_tooltip(self.save_btn,
+                            "Guarda la red tal como está (posiciones, costos, flujos y vista) en .npz, o en .json.")
+        self.create_tooltip(self.open_btn, "Abre una sesión guardada con Guardar (.npz o .json).")
+        self.create_tooltip(self.geometry_btn,
+                            "Conecta cada oferta con cada demanda: costo = distancia × tarifa + cargo fijo.")
+        self.create_tooltip(self.scenarios_btn,
+                            "Resuelve un lote .npz (costs: k×m×n, demands: k×n, supplies: k×m) en paralelo.")
+        self.create_tooltip(self.sensitivity_btn, "Precios sombra, costos reducidos y rangos de la última solución.")
+        self.create_tooltip(self.time_limit_entry, "Segundos antes de detener la resolución; vacío = sin límite.")
+        self.create_tooltip(self.method_combo,
+                            "auto: elige según tamaño y densidad; highs/highs-ds/highs-ipm: programación "
+                            "lineal (HiGHS, dual simplex, puntos interiores); transport-simplex: Vogel + MODI.")
+        self.create_tooltip(self.disk_cache_check,
+                            "Guarda también en una carpeta las soluciones (compartible entre usuarios).")
+        self.create_tooltip(self.timing_log_check,
+                            "Agrega los tiempos y datos del solver de cada resolución a un archivo (una línea JSON por resolución).")
 
     # --------------------------------------------
     # Tooltip
@@ -135,30 +446,100 @@ class TransportProblemGUI:
     # Limpia todo el canvas y estructura de datos
     # --------------------------------------------
     def clear_canvas(self):
+        self.cancel_solver()
         self.canvas.delete("all")
-        self.nodes = []
-        self.edges = []
-        self.drag_data = {"node": None, "x0": 0, "y0": 0}
+        self.net = transport.Network()
+        self.node_grid.clear()
+        self.edge_grid.clear()
+        self.warm_engine = None
+        self.warm_key = None
+        self.last_transport = None
+        self.drawn_nodes = {}
+        self.drawn_edges = {}
+        self.view.update(x=0.0, y=0.0, scale=1.0, drawn=None)
+        self.view_labels, self.view_clusters = True, False
+        self.drag_data = {"node": None, "x0": 0, "y0": 0, "x": 0, "y": 0, "pending": None}
         messagebox.showinfo("Información", "Canvas limpiao. Puedes empezar de nuevo.")
 
+    # --------------------------------------------
+    # Alta, baja e índices de nodos y aristas
+    # --------------------------------------------
+    def register_node(self, node_id, x, y, supply, demand):
+        row = self.net.add_node(node_id, x, y, supply, demand)
+        self.node_grid.insert([row], [self.node_segment(row)])
+        return row
+
+    def register_edge(self, src, dst, cost):
+        row = self.net.add_edge(src, dst, cost)
+        self.edge_grid.insert([row], self.net.segments([row]))
+        return row
+
+    def remove_node(self, node):
+        gone = self.net.remove_node(node.row)
+        self.node_grid.remove([node.row])
+        self.edge_grid.remove(gone)
+
+    def rename_node(self, node, new_id):
+        """Cambia el id de `node`; las aristas y grillas usan filas, no cambian."""
+        self.net.rename_node(node.row, new_id)
+
+    def remove_edge(self, edge):
+        self.net.remove_edge(edge.row)
+        self.edge_grid.remove([edge.row])
+
+    def rebuild_index(self):
+        net = self.net
+        nodes, edges = net.node_rows(), net.edge_rows()
+        self.node_grid.clear()
+        self.node_grid.insert(nodes,
+                              np.column_stack([net.x[nodes], net.y[nodes], net.x[nodes], net.y[nodes]]))
+        self.edge_grid.clear()
+        self.edge_grid.insert(edges, net.segments(edges))
+
+    def node_segment(self, row):
+        return (self.net.x[row], self.net.y[row], self.net.x[row], self.net.y[row])
+
+    def node_item(self, row):
+        """El NodeItem dibujado de la fila `row`, o uno nuevo si no está en la vista."""
+        node = self.drawn_nodes.get(row)
+        return node if node is not None else NodeItem(self.net, row)
+
+    def edge_item(self, row):
+        edge = self.drawn_edges.get(row)
+        return edge if edge is not None else EdgeItem(self.net, row)
+
+    # --------------------------------------------
+    # Hit-testing: el nodo más cercano al punto del mundo (x, y), a ≤ 15 px
+    # de pantalla
+    # --------------------------------------------
+    def find_node_at(self, x, y):
+        radius = 15 / self.view["scale"]
+        rows = np.fromiter(self.node_grid.query(x, y, radius), dtype=np.int64)
+        if rows.size == 0:
+            return None
+        dist = np.hypot(self.net.x[rows] - x, self.net.y[rows] - y)
+        best = int(np.argmin(dist))
+        return self.node_item(int(rows[best])) if dist[best] <= radius else None
+
     # --------------------------------------------
     # Al hacer clic izquierdo: agregar nodo o iniciar arrastre
     # --------------------------------------------
     def on_canvas_click(self, event):
         x, y = event.x, event.y
 
+        # Con nodos agrupados en cúmulos el clic acerca la vista
+        if self.view_clusters:
+            self.zoom_at(x, y, 2.0)
+            return
+
         # ¿Clic sobre un nodo?
-        clicked_node = None
-        for node in self.nodes:
-            if math.hypot(node["x"] - x, node["y"] - y) <= 15:
-                clicked_node = node
-                break
+        clicked_node = self.find_node_at(*self.to_world(x, y))
 
         if clicked_node:
             # Iniciar arrastre
             self.drag_data["node"] = clicked_node
-            self.drag_data["x0"] = x
-            self.drag_data["y0"] = y
+            self.drag_data["x0"] = self.drag_data["x"] = x
+            self.drag_data["y0"] = self.drag_data["y"] = y
             self.canvas.bind("<B1-Motion>", self.do_drag)
             self.canvas.bind("<ButtonRelease-1>", self.end_drag)
         else:
@@ -166,26 +547,42 @@ class TransportProblemGUI:
             self.add_node(event)
 
     # --------------------------------------------
-    # Durante arrastre (<B1-Motion>): mover nodo
+    # Durante arrastre (<B1-Motion>): guardar la posición y agendar un
+    # redibujo; los movimientos que llegan antes de que corra se funden en él
     # --------------------------------------------
     def do_drag(self, event):
+        if not self.drag_data["node"]:
+            return
+        self.drag_data["x"] = event.x
+        self.drag_data["y"] = event.y
+        if self.drag_data["pending"] is None:
+            self.drag_data["pending"] = self.root.after_idle(self.flush_drag)
+
+    # --------------------------------------------
+    # Mueve el nodo arrastrado a la última posición recibida
+    # --------------------------------------------
+    def flush_drag(self):
+        self.drag_data["pending"] = None
         node = self.drag_data["node"]
         if not node:
             return
 
-        dx = event.x - self.drag_data["x0"]
-        dy = event.y - self.drag_data["y0"]
-        node["x"] += dx
-        node["y"] += dy
+        dx = self.drag_data["x"] - self.drag_data["x0"]
+        dy = self.drag_data["y"] - self.drag_data["y0"]
+        if dx == dy == 0:
+            return
+        node["x"] += dx / self.view["scale"]
+        node["y"] += dy / self.view["scale"]
 
         # Mover todos los objetos del nodo usando su tag
-        self.canvas.move(node["tag"], dx, dy)
+        if node.get("oval_id") is not None:
+            self.canvas.move(node["tag"], dx, dy)
 
         # Actualizar aristas conectadas a este nodo
         self.update_edges_for_node(node)
 
-        self.drag_data["x0"] = event.x
-        self.drag_data["y0"] = event.y
+        self.drag_data["x0"] = self.drag_data["x"]
+        self.drag_data["y0"] = self.drag_data["y"]
 
     # --------------------------------------------
     # Al soltar (<ButtonRelease-1>): terminar arrastre
@@ -193,65 +590,134 @@ class TransportProblemGUI:
     def end_drag(self, event):
         self.canvas.unbind("<B1-Motion>")
         self.canvas.unbind("<ButtonRelease-1>")
+        if self.drag_data["pending"] is not None:
+            self.root.after_cancel(self.drag_data["pending"])
+            self.flush_drag()
+        node = self.drag_data["node"]
         self.drag_data["node"] = None
+        if node is None:
+            return
+        # Las grillas se actualizan una vez al soltar, no en cada movimiento
+        self.node_grid.insert([node.row], [self.node_segment(node.row)])
+        moved = self.net.incident(node.row)
+        self.edge_grid.insert(moved, self.net.segments(moved))
+        # Aristas que entraron o salieron de la vista con el nodo
+        self.sync_canvas()
 
     # --------------------------------------------
     # Redibuja las aristas conectadas a `node`
     # --------------------------------------------
     def update_edges_for_node(self, node):
-        for edge in self.edges:
-            if edge["from"] == node["id"] or edge["to"] == node["id"]:
-                n1 = next(n for n in self.nodes if n["id"] == edge["from"])
-                n2 = next(n for n in self.nodes if n["id"] == edge["to"])
-                x1, y1 = n1["x"], n1["y"]
-                x2, y2 = n2["x"], n2["y"]
-
-                # Mover línea
-                self.canvas.coords(edge["line_id"], x1, y1, x2, y2)
-
-                # Calcular nueva posición del texto de costo
-                mid_x, mid_y = (x1 + x2) / 2, (y1 + y2) / 2
-                dx, dy = x2 - x1, y2 - y1
-                length = math.hypot(dx, dy)
-                if length != 0:
-                    dx, dy = dx / length, dy / length
-                perp_dx, perp_dy = -dy, dx
-                text_x = mid_x + perp_dx * 15
-                text_y = mid_y + perp_dy * 15
-                text_x = max(30, min(text_x, 570))
-                text_y = max(30, min(text_y, 420))
-
-                self.canvas.coords(edge["rect_id"],
-                                   text_x - 15, text_y - 8, text_x + 15, text_y + 8)
-                self.canvas.coords(edge["text_id"], text_x, text_y)
+        for row in self.net.incident(node.row).tolist():
+            if row in self.drawn_edges:
+                self.place_edge(self.drawn_edges[row])
+
+    # --------------------------------------------
+    # Vista: coordenadas del mundo (las de los nodos) ↔ píxeles del canvas
+    # --------------------------------------------
+    def to_screen(self, x, y):
+        v = self.view
+        return (x - v["x"]) * v["scale"], (y - v["y"]) * v["scale"]
+
+    def to_world(self, sx, sy):
+        v = self.view
+        return sx / v["scale"] + v["x"], sy / v["scale"] + v["y"]
+
+    def canvas_size(self):
+        width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
+        if width <= 1:
+            width, height = 600, 450
+        return width, height
+
+    def schedule_render(self):
+        """Agenda un sync_canvas; los pedidos que llegan antes se funden en él."""
+        if self.render_pending is None:
+            self.render_pending = self.root.after_idle(self.sync_canvas)
+
+    def zoom_at(self, sx, sy, factor):
+        """Multiplica la escala por `factor` manteniendo fijo el punto (sx, sy) del canvas."""
+        v = self.view
+        wx, wy = self.to_world(sx, sy)
+        v["scale"] = min(max(v["scale"] * factor, self.MIN_SCALE), self.MAX_SCALE)
+        v["x"], v["y"] = wx - sx / v["scale"], wy - sy / v["scale"]
+        self.schedule_render()
+
+    def on_wheel(self, event):
+        closer = event.num == 4 or getattr(event, "delta", 0) > 0
+        self.zoom_at(event.x, event.y, 1.25 if closer else 1 / 1.25)
+
+    def start_pan(self, event):
+        self.pan_data = {"x": event.x, "y": event.y}
+
+    def do_pan(self, event):
+        scale = self.view["scale"]
+        self.view["x"] -= (event.x - self.pan_data["x"]) / scale
+        self.view["y"] -= (event.y - self.pan_data["y"]) / scale
+        self.pan_data = {"x": event.x, "y": event.y}
+        self.schedule_render()
+
+    def fit_view(self):
+        """Ajusta escala y desplazamiento para que entre toda la red (sin pasar de 1:1)."""
+        width, height = self.canvas_size()
+        rows = self.net.node_rows()
+        if rows.size == 0:
+            self.view.update(x=0.0, y=0.0, scale=1.0)
+        else:
+            xs, ys = self.net.x[rows], self.net.y[rows]
+            x0, x1, y0, y1 = float(xs.min()), float(xs.max()), float(ys.min()), float(ys.max())
+            scale = min((width - 80) / max(x1 - x0, 1), (height - 80) / max(y1 - y0, 1), 1.0)
+            scale = max(scale, self.MIN_SCALE)
+            self.view.update(scale=scale, x=(x0 + x1) / 2 - width / 2 / scale,
+                             y=(y0 + y1) / 2 - height / 2 / scale)
+        self.schedule_render()
+
+    # --------------------------------------------
+    # Posición del costo de una arista (en píxeles): a 15 px de su punto
+    # medio, en la perpendicular, sin salir del canvas
+    # --------------------------------------------
+    def edge_label_position(self, x1, y1, x2, y2):
+        mid_x, mid_y = (x1 + x2) / 2, (y1 + y2) / 2
+        dx, dy = x2 - x1, y2 - y1
+        length = math.hypot(dx, dy)
+        if length != 0:
+            dx, dy = dx / length, dy / length
+        perp_dx, perp_dy = -dy, dx
+        text_x = mid_x + perp_dx * 15
+        text_y = mid_y + perp_dy * 15
+        text_x = max(30, min(text_x, self.view["w"] - 30))
+        text_y = max(30, min(text_y, self.view["h"] - 30))
+        return text_x, text_y
 
     # --------------------------------------------
     # Dibuja un nodo completo (oval, etiqueta, recuadro, texto)
     # --------------------------------------------
+    def node_style(self, node):
+        """(color, etiqueta, texto de valor) con que se dibuja `node`."""
+        if node["supply"] > 0:
+            fill_color = "#90CAF9"
+            label_text = node["id"][:4]
+            value_text = f"O:{node['supply']}"
+        else:
+            fill_color = "#EF9A9A"
+            label_text = node["id"][:4]
+            value_text = f"D:{node['demand']}"
+        return fill_color, label_text, value_text
+
     def draw_node(self, node):
-        x, y = node["x"], node["y"]
-        tag = node["id"]
+        x, y = self.to_screen(node["x"], node["y"])
+        # Etiqueta por fila, no por id: Tk toma una etiqueta de sólo dígitos
+        # ("1", "2", comunes al importar) como id de ítem; la fila tampoco
+        # cambia al renombrar el nodo
+        tag = f"node{node.row}"
         node["tag"] = tag
-
-        if node.get("fictitious", False):
-            fill_color = "#B0BEC5"
-            label_text = f"{node['id'][:4]}\n({'O' if node['supply'] > 0 else 'D'} Fict.)"
-            value_text = f"{'O:' + str(node['supply']) if node['supply'] > 0 else 'D:' + str(node['demand'])}"
-        else:
-            if node["supply"] > 0:
-                fill_color = "#90CAF9"
-                label_text = node["id"][:4]
-                value_text = f"O:{node['supply']}"
-            else:
-                fill_color = "#EF9A9A"
-                label_text = node["id"][:4]
-                value_text = f"D:{node['demand']}"
+        node["style"] = fill_color, label_text, value_text = self.node_style(node)
+        self.drawn_nodes[node.row] = node
 
         # Creamos círculo (oval)
         node["oval_id"] = self.canvas.create_oval(
             x - 15, y - 15, x + 15, y + 15,
             fill=fill_color, outline="#333333", width=2,
-            tags=(tag,)
+            tags=(tag, "node_item")
         )
         # Etiqueta con ID corto
         node["label_id"] = self.canvas.create_text(
@@ -259,13 +725,16 @@ class TransportProblemGUI:
             text=label_text,
             fill="#333333",
             font=("Helvetica", 10, "bold"),
-            tags=(tag,)
+            tags=(tag, "node_item")
         )
+        if not self.view_labels:
+            node["value_rect_id"] = node["value_text_id"] = None
+            return
         # Recuadro para valor
         node["value_rect_id"] = self.canvas.create_rectangle(
             x - 20, y + 7, x + 20, y + 23,
             fill="#ffffff", outline="", stipple="gray50",
-            tags=(tag,)
+            tags=(tag, "node_item")
         )
         # Texto con oferta o demanda
         node["value_text_id"] = self.canvas.create_text(
@@ -273,62 +742,426 @@ class TransportProblemGUI:
             text=value_text,
             fill="#333333",
             font=("Helvetica", 9),
-            tags=(tag,)
+            tags=(tag, "node_item")
         )
 
+    def place_node(self, node):
+        """Reubica los ítems de `node` según la vista actual."""
+        x, y = self.to_screen(node["x"], node["y"])
+        self.canvas.coords(node["oval_id"], x - 15, y - 15, x + 15, y + 15)
+        self.canvas.coords(node["label_id"], x, y - 25)
+        if node["value_rect_id"] is not None:
+            self.canvas.coords(node["value_rect_id"], x - 20, y + 7, x + 20, y + 23)
+            self.canvas.coords(node["value_text_id"], x, y + 15)
+
     # --------------------------------------------
     # Dibuja una arista completa (línea + rectángulo + texto)
     # --------------------------------------------
+    def edge_ends(self, edge):
+        """Extremos (x1, y1, x2, y2) de `edge` en píxeles."""
+        x1, y1, x2, y2 = self.net.segments([edge.row])[0].tolist()
+        return (*self.to_screen(x1, y1), *self.to_screen(x2, y2))
+
+    def edge_color(self, edge):
+        """(color, ancho) de la línea: verde si lleva flujo en la solución mostrada."""
+        return ("#4CAF50", 3) if edge["flow"] > 0 else ("#666666", 2)
+
     def draw_edge(self, edge):
-        n1 = next(n for n in self.nodes if n["id"] == edge["from"])
-        n2 = next(n for n in self.nodes if n["id"] == edge["to"])
-        x1, y1 = n1["x"], n1["y"]
-        x2, y2 = n2["x"], n2["y"]
+        x1, y1, x2, y2 = self.edge_ends(edge)
+        self.drawn_edges[edge.row] = edge
 
-        # Línea con flecha
+        # Línea con flecha (verde si es parte de la solución mostrada)
+        fill, width = self.edge_color(edge)
         edge["line_id"] = self.canvas.create_line(
             x1, y1, x2, y2,
-            arrow=tk.LAST, fill="#666666", width=2
+            arrow=tk.LAST, fill=fill, width=width, tags=("edge_item",)
         )
+        if not self.view_labels:
+            edge["rect_id"] = edge["text_id"] = None
+            return
 
         # Calcular posición del texto
-        mid_x, mid_y = (x1 + x2) / 2, (y1 + y2) / 2
-        dx, dy = x2 - x1, y2 - y1
-        length = math.hypot(dx, dy)
-        if length != 0:
-            dx, dy = dx / length, dy / length
-        perp_dx, perp_dy = -dy, dx
-        text_x = mid_x + perp_dx * 15
-        text_y = mid_y + perp_dy * 15
-        text_x = max(30, min(text_x, 570))
-        text_y = max(30, min(text_y, 420))
+        text_x, text_y = self.edge_label_position(x1, y1, x2, y2)
 
         edge["rect_id"] = self.canvas.create_rectangle(
             text_x - 15, text_y - 8, text_x + 15, text_y + 8,
-            fill="#ffffff", outline="", stipple="gray50"
+            fill="#ffffff", outline="", stipple="gray50", tags=("edge_item",)
         )
+        edge["label"] = str(edge["cost"])
         edge["text_id"] = self.canvas.create_text(
             text_x, text_y,
-            text=str(edge["cost"]),
+            text=edge["label"],
             fill="#333333",
-            font=("Helvetica", 9)
+            font=("Helvetica", 9),
+            tags=("edge_item",)
         )
 
+    def place_edge(self, edge):
+        """Reubica la línea y el costo de `edge` según la vista y sus nodos."""
+        x1, y1, x2, y2 = self.edge_ends(edge)
+        self.canvas.coords(edge["line_id"], x1, y1, x2, y2)
+        if edge["text_id"] is None:
+            return
+        text_x, text_y = self.edge_label_position(x1, y1, x2, y2)
+        self.canvas.coords(edge["rect_id"], text_x - 15, text_y - 8, text_x + 15, text_y + 8)
+        self.canvas.coords(edge["text_id"], text_x, text_y)
+
+    # --------------------------------------------
+    # Cúmulos (vista alejada): un círculo con la cantidad de nodos y una
+    # línea por par de extremos en lugar de una por arista
+    # --------------------------------------------
+    def draw_cluster(self, x, y, count):
+        r = min(8 + 2 * math.log2(count), 22)
+        self.canvas.create_oval(x - r, y - r, x + r, y + r, fill="#CFD8DC", outline="#333333",
+                                width=1, tags=("cluster_item", "node_item"))
+        self.canvas.create_text(x, y, text=str(count), fill="#333333", font=("Helvetica", 8, "bold"),
+                                tags=("cluster_item", "node_item"))
+
+    def draw_bundle(self, x1, y1, x2, y2, rows):
+        highlighted = bool((self.net.flow[rows] > 0).any())
+        self.canvas.create_line(x1, y1, x2, y2, arrow=tk.LAST,
+                                fill="#4CAF50" if highlighted else "#90A4AE",
+                                width=min(1 + math.log2(len(rows)), 6), tags=("cluster_item",))
+
+    # --------------------------------------------
+    # Actualizaciones puntuales del canvas: sólo los ítems del nodo o arista
+    # que cambió
+    # --------------------------------------------
+    def refresh_node(self, node):
+        """Actualiza color y textos de `node` tras cambiar su id, oferta o demanda."""
+        if node.get("oval_id") is None:
+            return
+        node["style"] = fill_color, label_text, value_text = self.node_style(node)
+        self.canvas.itemconfig(node["oval_id"], fill=fill_color)
+        self.canvas.itemconfig(node["label_id"], text=label_text)
+        if node["value_text_id"] is not None:
+            self.canvas.itemconfig(node["value_text_id"], text=value_text)
+
+    def refresh_edge(self, edge):
+        """Actualiza el costo mostrado de `edge`."""
+        edge["label"] = str(edge["cost"])
+        if edge.get("text_id") is not None:
+            self.canvas.itemconfig(edge["text_id"], text=edge["label"])
+
+    def erase_edge(self, edge):
+        for key in ("line_id", "rect_id", "text_id"):
+            if edge.get(key) is not None:
+                self.canvas.delete(edge[key])
+            edge[key] = None
+        self.drawn_edges.pop(edge.row, None)
+
+    def erase_node_items(self, node):
+        if node.get("oval_id") is not None:
+            self.canvas.delete(node["tag"])
+        node["oval_id"] = node["label_id"] = node["value_rect_id"] = node["value_text_id"] = None
+        self.drawn_nodes.pop(node.row, None)
+
+    def erase_node(self, node):
+        """Borra del canvas el nodo y sus aristas (antes de remove_node)."""
+        for row in self.net.incident(node.row).tolist():
+            if row in self.drawn_edges:
+                self.erase_edge(self.drawn_edges[row])
+        self.erase_node_items(node)
+
+    # --------------------------------------------
+    # Renderizado por diferencias de lo visible: dibuja los nodos y aristas
+    # que entraron en la vista, borra los que salieron, reubica el resto si
+    # la vista se movió y actualiza sólo los textos o colores que cambiaron.
+    # El costo es proporcional a lo que se ve, no al tamaño de la red.
+    # --------------------------------------------
+    def sync_canvas(self):
+        if self.render_pending is not None:
+            self.root.after_cancel(self.render_pending)
+            self.render_pending = None
+        v = self.view
+        v["w"], v["h"] = self.canvas_size()
+        pad = 40 / v["scale"]
+        x0, y0 = self.to_world(0, 0)
+        x1, y1 = self.to_world(v["w"], v["h"])
+        node_rows = self.node_grid.query_rect(x0 - pad, y0 - pad, x1 + pad, y1 + pad)
+        edge_rows = self.edge_grid.segments_in_rect(x0 - pad, y0 - pad, x1 + pad, y1 + pad)
+
+        # Nivel de detalle; si cambió, los ítems existentes no sirven
+        labels = v["scale"] >= self.LABEL_SCALE and len(edge_rows) <= self.EDGE_LABEL_LIMIT
+        clusters = v["scale"] < self.CLUSTER_SCALE
+        if (labels, clusters) != (self.view_labels, self.view_clusters):
+            for edge in list(self.drawn_edges.values()):
+                self.erase_edge(edge)
+            for node in list(self.drawn_nodes.values()):
+                self.erase_node_items(node)
+            self.view_labels, self.view_clusters = labels, clusters
+        moved = v["drawn"] != (v["x"], v["y"], v["scale"])
+        v["drawn"] = (v["x"], v["y"], v["scale"])
+
+        # Cúmulos: nodos visibles que comparten celda de pantalla
+        self.canvas.delete("cluster_item")
+
+        def cell_of(row):
+            sx, sy = self.to_screen(self.net.x[row], self.net.y[row])
+            return int(sx // self.CLUSTER_CELL), int(sy // self.CLUSTER_CELL), sx, sy
+
+        cells = {}
+        if clusters:
+            for row in node_rows:
+                cx, cy, sx, sy = cell_of(row)
+                cells.setdefault((cx, cy), []).append((row, sx, sy))
+        rep = {}      # fila de nodo agrupado → celda de su cúmulo
+        centers = {}  # celda → (x, y, cantidad) del cúmulo
+        for cell, members in cells.items():
+            if len(members) > 1:
+                centers[cell] = (sum(m[1] for m in members) / len(members),
+                                 sum(m[2] for m in members) / len(members), len(members))
+                rep.update((m[0], cell) for m in members)
+
+        # Nodos
+        for row in [k for k in self.drawn_nodes if k not in node_rows or k in rep]:
+            self.erase_node_items(self.drawn_nodes[row])
+        for row in node_rows:
+            if row in rep:
+                continue
+            node = self.drawn_nodes.get(row)
+            if node is None:
+                self.draw_node(NodeItem(self.net, row))
+                continue
+            if moved:
+                self.place_node(node)
+            if node["style"] != self.node_style(node):
+                self.refresh_node(node)
+
+        # Aristas; con cúmulos, las que tocan uno o salen de la vista se
+        # agrupan en haces entre celdas
+        visible = list(edge_rows)
+        ends = zip(visible, self.net.src[visible].tolist(), self.net.dst[visible].tolist())
+
+        def bundled(a, b):
+            return clusters and not (a in node_rows and b in node_rows
+                                     and a not in rep and b not in rep)
+
+        def end_of(row):
+            if row in rep:
+                return rep[row]
+            if row in node_rows:
+                return row
+            return cell_of(row)[:2]
+
+        bundles = {}
+        for row in [k for k in self.drawn_edges
+                    if k not in edge_rows or bundled(int(self.net.src[k]), int(self.net.dst[k]))]:
+            self.erase_edge(self.drawn_edges[row])
+        for row, a, b in ends:
+            if bundled(a, b):
+                bundles.setdefault((end_of(a), end_of(b)), []).append(row)
+                continue
+            edge = self.drawn_edges.get(row)
+            if edge is None:
+                self.draw_edge(EdgeItem(self.net, row))
+            else:
+                if moved:
+                    self.place_edge(edge)
+                if edge["label"] != str(edge["cost"]):
+                    self.refresh_edge(edge)
+
+        def end_point(end):
+            if end in centers:
+                return centers[end][:2]
+            if isinstance(end, tuple):
+                return (end[0] + 0.5) * self.CLUSTER_CELL, (end[1] + 0.5) * self.CLUSTER_CELL
+            return self.to_screen(self.net.x[end], self.net.y[end])
+
+        for (a, b), rows in bundles.items():
+            self.draw_bundle(*end_point(a), *end_point(b), rows)
+        for x, y, count in centers.values():
+            self.draw_cluster(x, y, count)
+        self.canvas.tag_raise("node_item")
+
+    # --------------------------------------------
+    # Resaltado de la solución: es la columna flow de la red, así sobrevive
+    # a que la arista salga y vuelva a entrar en la vista
+    # --------------------------------------------
+    def show_flows(self, supply_rows, demand_rows, flows, timings):
+        """Guarda los flujos m x n de la solución en la red y resalta las aristas usadas."""
+        with timings.phase("extract"):
+            self.net.set_flows(supply_rows, demand_rows, flows)
+        with timings.phase("canvas"):
+            self.recolor_edges()
+
+    def clear_highlight(self):
+        """Devuelve a su color normal las aristas de la solución anterior."""
+        self.net.clear_flows()
+        self.recolor_edges()
+
+    def recolor_edges(self):
+        for edge in self.drawn_edges.values():
+            fill, width = self.edge_color(edge)
+            self.canvas.itemconfig(edge["line_id"], fill=fill, width=width)
+        if self.view_clusters:
+            self.sync_canvas()
+
     # --------------------------------------------
-    # Borra todo y redespliega nodos y aristas
+    # Borra todo y redespliega lo visible
     # --------------------------------------------
     def redraw_all(self):
         self.canvas.delete("all")
-        for edge in self.edges:
-            self.draw_edge(edge)
-        for node in self.nodes:
-            self.draw_node(node)
+        self.drawn_nodes = {}
+        self.drawn_edges = {}
+        self.view["drawn"] = None
+        self.sync_canvas()
+
+    # --------------------------------------------
+    # Importar una red completa (.json, .csv, .npz) de una sola vez:
+    # ofertas a la izquierda, demandas a la derecha, una arista por par
+    # --------------------------------------------
+    def import_instance(self):
+        path = filedialog.askopenfilename(
+            title="Importar instancia",
+            filetypes=[("Instancias", "*.json *.csv *.npz"), ("Todos", "*.*")])
+        if not path:
+            return
+        try:
+            instance = transport.load_instance(path)
+        except (OSError, transport.ModelError) as e:
+            messagebox.showerror("Error", f"No se pudo importar {path}:\n{e}")
+            return
+        if self.net.node_count and not messagebox.askyesno(
+                "Importar", "Se reemplazará la red actual. ¿Desea continuar?", parent=self.root):
+            return
+        self.load_network(instance)
+        messagebox.showinfo(
+            "Información",
+            f"Importados {len(instance.supply_ids)} nodos de oferta, {len(instance.demand_ids)} "
+            f"de demanda y {self.net.edge_count} aristas.")
+
+    def load_network(self, instance):
+        """Reemplaza nodos y aristas por los de `instance` y redibuja una vez."""
+        width, height = self.canvas_size()
+        m, n = len(instance.supply_ids), len(instance.demand_ids)
+        # Al menos 40 unidades entre nodos de una columna; la vista se ajusta
+        # después para mostrar la red completa
+        height = max(height, 40 * (max(m, n) + 1))
+        width = max(width, 0.75 * height)
+
+        def column(count):
+            return np.linspace(40, height - 40, count + 2)[1:-1]
+
+        # Todo en bloque: una arista por celda de costo finito
+        net = transport.Network()
+        s_rows = net.add_nodes(instance.supply_ids, 60, column(m), instance.supply, 0)
+        d_rows = net.add_nodes(instance.demand_ids, width - 60, column(n), 0, instance.demand)
+        i, j = np.nonzero(np.isfinite(instance.cost))
+        net.add_edges(s_rows[i], d_rows[j], instance.cost[i, j])
+        self.replace_network(net)
+
+    def replace_network(self, net, view=None):
+        """Usa `net` como red actual; `view` es (x, y, escala) o None para encuadrarla."""
+        self.cancel_solver()
+        self.net = net
+        self.rebuild_index()
+        self.warm_engine = None
+        self.warm_key = None
+        self.last_transport = None
+        if view is None:
+            self.fit_view()
+        else:
+            self.view["x"], self.view["y"], self.view["scale"] = (float(v) for v in view)
+        self.redraw_all()
+
+    # --------------------------------------------
+    # Costos por distancia: toda la matriz oferta × demanda en una sola
+    # operación (transport.geometry) y todas las aristas de una vez
+    # --------------------------------------------
+    def connect_by_geometry(self):
+        if not self.net.supply_rows().size or not self.net.demand_rows().size:
+            messagebox.showerror("Error", "Se necesita al menos un nodo de oferta y uno de demanda.")
+            return
+        metric = askstring(
+            "Costos por Distancia",
+            f"Métrica ({', '.join(transport.DISTANCE_METRICS)}; haversine usa x = longitud, "
+            "y = latitud en grados):", initialvalue="euclidean", parent=self.root)
+        if not metric:
+            return
+        metric = metric.strip().lower()
+        if metric not in transport.DISTANCE_METRICS:
+            messagebox.showerror("Error", f"Métrica desconocida: {metric}")
+            return
+        rate = askfloat("Costos por Distancia", "Costo por unidad de distancia:",
+                        initialvalue=1.0, minvalue=0.0, parent=self.root)
+        if rate is None:
+            return
+        fee = askfloat("Costos por Distancia", "Cargo fijo por ruta:",
+                       initialvalue=0.0, minvalue=0.0, parent=self.root)
+        if fee is None:
+            return
+        replace = True
+        if self.net.edge_count:
+            replace = messagebox.askyesno(
+                "Costos por Distancia",
+                "¿Reemplazar también el costo de las aristas existentes? (No = conservarlo)",
+                parent=self.root)
+
+        self.cancel_solver()
+        started = time.perf_counter()
+        added, updated = self.net.connect_by_geometry(metric, rate, fee, replace)
+        elapsed = time.perf_counter() - started
+        # Con otros costos la solución anterior ya no vale
+        self.net.clear_flows()
+        self.rebuild_index()
+        self.warm_engine = None
+        self.warm_key = None
+        self.last_transport = None
+        self.redraw_all()
+        messagebox.showinfo(
+            "Información",
+            f"{added} aristas nuevas y {updated} actualizadas en {elapsed * 1000:.1f} ms.")
+
+    # --------------------------------------------
+    # Sesiones: la red entera en columnas NumPy (.npz sin comprimir, se
+    # escribe y se lee de un tirón) o en JSON para otras herramientas
+    # --------------------------------------------
+    def save_session(self):
+        path = filedialog.asksaveasfilename(
+            title="Guardar sesión", defaultextension=".npz",
+            filetypes=[("Sesión", "*.npz"), ("JSON", "*.json")])
+        if not path:
+            return
+        try:
+            if path.lower().endswith(".json"):
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(self.net.to_dict(), f)
+            else:
+                view = np.array([self.view["x"], self.view["y"], self.view["scale"]])
+                self.net.save(path, view=view)
+        except OSError as e:
+            messagebox.showerror("Error", f"No se pudo guardar {path}:\n{e}")
+            return
+        messagebox.showinfo(
+            "Información",
+            f"Sesión guardada: {self.net.node_count} nodos y {self.net.edge_count} aristas.")
+
+    def open_session(self):
+        path = filedialog.askopenfilename(
+            title="Abrir sesión", filetypes=[("Sesiones", "*.npz *.json"), ("Todos", "*.*")])
+        if not path:
+            return
+        try:
+            if path.lower().endswith(".json"):
+                with open(path, encoding="utf-8") as f:
+                    net, extra = transport.Network.from_dict(json.load(f)), {}
+            else:
+                net, extra = transport.Network.load(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"No se pudo abrir {path}:\n{e}")
+            return
+        if self.net.node_count and not messagebox.askyesno(
+                "Abrir", "Se reemplazará la red actual. ¿Desea continuar?", parent=self.root):
+            return
+        view = extra.get("view")
+        self.replace_network(net, view if view is not None and view.shape == (3,) else None)
 
     # --------------------------------------------
     # Agregar un nuevo nodo en posición (event.x, event.y)
     # --------------------------------------------
     def add_node(self, event):
-        x, y = event.x, event.y
+        x, y = self.to_world(event.x, event.y)
         node_id = str(uuid.uuid4())[:8]
         is_supply = messagebox.askyesno("Tipo de Nodo", "¿Es un nodo de oferta?")
 
@@ -343,14 +1176,8 @@ class TransportProblemGUI:
                 return
             supply = 0
 
-        nodo = {
-            "id": node_id,
-            "x": x, "y": y,
-            "supply": supply, "demand": demand,
-            "fictitious": False
-        }
-        self.nodes.append(nodo)
-        self.draw_node(nodo)
+        self.register_node(node_id, x, y, supply, demand)
+        self.sync_canvas()
 
     # --------------------------------------------
     # Seleccionar nodo por ID parcial para conectar
@@ -358,16 +1185,25 @@ class TransportProblemGUI:
     def select_node(self):
         node_id = askstring("Seleccionar Nodo", "Ingrese ID del nodo:", parent=self.root)
         if node_id:
-            for node in self.nodes:
-                if node["id"].startswith(node_id):
-                    self.selected_node = node
-                    messagebox.showinfo("Nodo Seleccionado", f"Nodo {node_id[:4]} seleccionado.")
-                    break
+            node = self.find_node(node_id)
+            if node:
+                self.selected_node = node
+                messagebox.showinfo("Nodo Seleccionado", f"Nodo {node_id[:4]} seleccionado.")
             else:
                 messagebox.showerror("Error", "Nodo no encontrado.")
         else:
             messagebox.showinfo("Información", "Selección cancelada.")
 
+    # --------------------------------------------
+    # Busca un nodo por ID exacto o, si no existe, por prefijo
+    # --------------------------------------------
+    def find_node(self, node_id):
+        row = self.net.index.get(node_id)
+        if row is None:
+            row = next((r for r, n_id in enumerate(self.net.ids)
+                        if n_id is not None and n_id.startswith(node_id)), None)
+        return None if row is None else self.node_item(row)
+
     # --------------------------------------------
     # Conectar el nodo seleccionado con otro de demanda
     # --------------------------------------------
@@ -377,7 +1213,8 @@ class TransportProblemGUI:
         except AttributeError:
             node_origen = None
 
-        if not node_origen:
+        # Un nodo seleccionado que luego se borró (o de una red anterior) no vale
+        if not node_origen or node_origen.net is not self.net or node_origen["id"] is None:
             messagebox.showerror("Error", "Seleccione un nodo primero.")
             return
 
@@ -393,24 +1230,20 @@ class TransportProblemGUI:
             return
 
         # Buscar nodo destino
-        for nodo_dest in self.nodes:
-            if nodo_dest["id"].startswith(node2_id):
-                if node_origen["supply"] == 0 or nodo_dest["demand"] == 0:
-                    messagebox.showerror("Error", "Debe conectar oferta → demanda.")
-                    return
-                edge = {
-                    "from": node_origen["id"],
-                    "to": nodo_dest["id"],
-                    "cost": cost,
-                    "line_id": None, "rect_id": None, "text_id": None
-                }
-                self.edges.append(edge)
-                # Dibujarlo inmediatamente
-                self.draw_edge(edge)
-                break
-        else:
+        nodo_dest = self.find_node(node2_id)
+        if nodo_dest is None:
             messagebox.showerror("Error", "Nodo destino no encontrado.")
             return
+        if node_origen["supply"] == 0 or nodo_dest["demand"] == 0:
+            messagebox.showerror("Error", "Debe conectar oferta → demanda.")
+            return
+        if self.net.find_edge(node_origen.row, nodo_dest.row) is not None:
+            messagebox.showwarning("Advertencia", "Ya existe una arista entre estos nodos.")
+            self.selected_node = None
+            return
+        self.register_edge(node_origen.row, nodo_dest.row, cost)
+        # Dibujarlo inmediatamente
+        self.sync_canvas()
 
         # Limpiar selección
         self.selected_node = None
@@ -436,252 +1269,618 @@ class TransportProblemGUI:
     # Resolver problema de asignación
     # --------------------------------------------
     def solve_assignment(self):
-        supply_nodes = [n for n in self.nodes if n["supply"] > 0 and not n.get("fictitious", False)]
-        demand_nodes = [n for n in self.nodes if n["demand"] > 0 and not n.get("fictitious", False)]
+        supply_rows, demand_rows = self.net.supply_rows(), self.net.demand_rows()
 
-        if not supply_nodes or not demand_nodes:
+        if supply_rows.size == 0 or demand_rows.size == 0:
             messagebox.showerror("Error", "Debe haber al menos un nodo de oferta y uno de demanda.")
             return
 
-        if len(supply_nodes) != len(demand_nodes):
+        if supply_rows.size != demand_rows.size:
             messagebox.showerror("Error", "Para asignación, #ofertas = #demandas.")
             return
 
-        # Limpiar resaltado previo
-        for edge in self.edges:
-            if edge.get("line_id") is not None:
-                self.canvas.itemconfig(edge["line_id"], fill="#666666", width=2)
-        self.solution_edges = []
-
-        # Forzar supply=1 y demand=1
-        for s in supply_nodes: s["supply"] = 1
-        for d in demand_nodes: d["demand"] = 1
-
-        m = len(supply_nodes)
-        n = len(demand_nodes)  # = m
-        c = []
-        A_eq = []
-        b_eq = []
-
-        result_text = "Función Objetivo (Asignación):\nMin Z = "
-        cost_terms = []
-        for i, s in enumerate(supply_nodes):
-            for j, d in enumerate(demand_nodes):
-                cost = next((e["cost"] for e in self.edges
-                             if e["from"] == s["id"] and e["to"] == d["id"]), None)
-                if cost is None:
-                    messagebox.showerror("Error", f"Falta arista {s['id'][:4]} → {d['id'][:4]}.")
-                    return
-                c.append(cost)
-                cost_terms.append(f"{cost}*x_{i + 1}{j + 1}")
-        result_text += " + ".join(cost_terms) + "\n\n"
-
-        # Restricciones agentes (fila=1)
-        result_text += "Restricciones Agentes (≔1):\n"
-        for i in range(m):
-            row = [0] * (m * n)
-            for j in range(n):
-                row[i * n + j] = 1
-            A_eq.append(row)
-            b_eq.append(1)
-            terms = [f"x_{i + 1}{j + 1}" for j in range(n)]
-            result_text += f"{' + '.join(terms)} = 1 (Agente {supply_nodes[i]['id'][:4]})\n"
-
-        # Restricciones tareas (columna=1)
-        result_text += "\nRestricciones Tareas (≔1):\n"
-        for j in range(n):
-            row = [0] * (m * n)
-            for i in range(m):
-                row[i * n + j] = 1
-            A_eq.append(row)
-            b_eq.append(1)
-            terms = [f"x_{i + 1}{j + 1}" for i in range(m)]
-            result_text += f"{' + '.join(terms)} = 1 (Tarea {demand_nodes[j]['id'][:4]})\n"
-
-        result_text += "\nVariables binarias: " + ", ".join(
-            [f"x_{i + 1}{j + 1}" for i in range(m) for j in range(n)]) + "\n\n"
-
-        # Resolver con linprog
-        res = linprog(c, A_eq=A_eq, b_eq=b_eq, bounds=(0, 1), method="simplex")
-        if res.success:
-            solution = np.round(res.x.reshape(m, n))
-            result_text += "Solución Óptima:\n"
-            total_cost = 0
-            for i, s in enumerate(supply_nodes):
-                for j, d in enumerate(demand_nodes):
-                    if solution[i][j] == 1:
-                        cost = c[i * n + j]
-                        result_text += f"{s['id'][:4]} → {d['id'][:4]}: costo {cost}\n"
-                        total_cost += cost
-                        edge = next((e for e in self.edges
-                                     if e["from"] == s["id"] and e["to"] == d["id"]), None)
-                        if edge and edge.get("line_id") is not None:
-                            self.canvas.itemconfig(edge["line_id"], fill="#4CAF50", width=3)
-            result_text += f"Costo Total: {total_cost}\n"
-            messagebox.showinfo("Resultado Asignación", result_text)
-        else:
-            messagebox.showerror("Error", "No se encontró solución óptima para asignación.")
+        timings = transport.Timings("asignación")
+        with timings.phase("canvas"):
+            self.clear_highlight()
+
+            # Forzar supply=1 y demand=1 (y mostrarlo en los nodos que cambian)
+            self.net.supply[supply_rows] = 1
+            self.net.demand[demand_rows] = 1
+            self.sync_canvas()
+
+        with timings.phase("build"):
+            m = supply_rows.size
+            n = demand_rows.size  # = m
+            supply_ids = [self.net.ids[r] for r in supply_rows]
+            demand_ids = [self.net.ids[r] for r in demand_rows]
+            # Los pares sin arista quedan como rutas inexistentes (NaN)
+            cost = self.net.cost_matrix(supply_rows, demand_rows)
+            key = transport.fingerprint("assignment", np.ones(m), np.ones(n), cost, "auto")
+        timings.stats.update(mode="assignment", method="auto", m=m, n=n,
+                             arcs=int(np.isfinite(cost).sum()))
+
+        # Resolver con el núcleo de transport en el hilo de trabajo
+        def task(cancel, time_limit):
+            with timings.phase("solve"):
+                return transport.solve_assignment(cost, time_limit=time_limit, cancel=cancel)
+
+        def finish(sol):
+            if sol.success:
+                if not sol.stats.get("cached"):
+                    with timings.phase("extract"):
+                        self.solution_cache.put(key, sol)
+                self.show_flows(supply_rows, demand_rows, sol.flows, timings)
+                with timings.phase("format"):
+                    report = transport.Report(supply_ids, demand_ids,
+                                              np.ones(m), np.ones(n), cost, sol, mode="assignment",
+                                              notes=[self.cache_note(sol)])
+                    self.show_report("Resultado Asignación", report)
+                self.show_timings(timings, sol)
+            else:
+                self.show_timings(timings, sol)
+                messagebox.showerror("Error", "No se encontró solución óptima para asignación.\n"
+                                              + self.infeasibility_text(sol, demand_ids, "Tareas"))
+
+        # Misma instancia ya resuelta: la solución sale de la caché, sin hilo
+        with timings.phase("solve"):
+            cached = self.solution_cache.get(key)
+        if cached is not None:
+            finish(cached)
+            return
+        self.run_solver("Resolviendo asignación...", task, finish)
 
     # --------------------------------------------
     # Resolver problema de transporte
     # --------------------------------------------
     def solve_transport(self):
-        supply_nodes = [n for n in self.nodes if n["supply"] > 0 and not n.get("fictitious", False)]
-        demand_nodes = [n for n in self.nodes if n["demand"] > 0 and not n.get("fictitious", False)]
+        supply_rows, demand_rows = self.net.supply_rows(), self.net.demand_rows()
 
-        if not supply_nodes or not demand_nodes:
+        if supply_rows.size == 0 or demand_rows.size == 0:
             messagebox.showerror("Error", "Debe haber al menos un nodo de oferta y uno de demanda.")
             return
 
-        # Limpiar resaltado previo
-        for edge in self.edges:
-            if edge.get("line_id") is not None:
-                self.canvas.itemconfig(edge["line_id"], fill="#666666", width=2)
-        self.solution_edges = []
-
-        total_supply = sum(n["supply"] for n in supply_nodes)
-        total_demand = sum(n["demand"] for n in demand_nodes)
-
-        # Si demanda > oferta: nodo ficticio de oferta
-        if total_supply < total_demand:
-            shortfall = total_demand - total_supply
-            fict_id = str(uuid.uuid4())[:8]
-            x_fict, y_fict = 30, 30
-            self.nodes.append({
-                "id": fict_id,
-                "x": x_fict, "y": y_fict,
-                "supply": shortfall, "demand": 0,
-                "fictitious": True
-            })
-            supply_nodes.append(self.nodes[-1])
+        timings = transport.Timings("transporte")
+        with timings.phase("canvas"):
+            self.clear_highlight()
+
+        with timings.phase("build"):
+            # Construir modelo (columnas de la red, sin recorrer nodos ni aristas)
+            supply_ids = [self.net.ids[r] for r in supply_rows]
+            demand_ids = [self.net.ids[r] for r in demand_rows]
+            # Modelo por arcos: sólo las aristas existentes son variables
+            cost = self.net.cost_matrix(supply_rows, demand_rows)
+            supply = self.net.supply[supply_rows]
+            demand = self.net.demand[demand_rows]
+            m, n = len(supply_ids), len(demand_ids)
+            total_supply, total_demand = float(supply.sum()), float(demand.sum())
+
+            # Balanceo virtual: el nodo ficticio es sólo una fila o columna del
+            # modelo, no se agrega al grafo (resolver de nuevo no acumula nodos)
+            supply, demand, cost, dummy = transport.balance(supply, demand, cost)
+
+            # "auto" se resuelve acá para que el simplex de transporte elegido
+            # también pueda re-optimizar en caliente
+            method = self.method_var.get()
+            if method == "auto":
+                method = transport.choose_method("transport", cost)
+            key = transport.fingerprint("transport", supply, demand, cost, method)
+        timings.stats.update(mode="transport", method=method, m=m, n=n,
+                             arcs=int(np.isfinite(cost[:m, :n]).sum()), dummy=dummy)
+
+        # Los avisos del balanceo quedan fuera de la fase "build" (esperan al usuario)
+        if dummy == "supply":
+            supply_ids = supply_ids + [self.DUMMY_ID]
             messagebox.showwarning(
                 "Advertencia",
                 f"Oferta total ({total_supply}) < Demanda total ({total_demand}).\n"
-                f"Se agregó nodo ficticio de oferta con {shortfall} unidades."
+                f"Se agregó nodo ficticio de oferta con {total_demand - total_supply} unidades."
             )
-            # Dibujar nodo ficticio
-            self.draw_node(self.nodes[-1])
-            # Conectar con costo 0 a cada demanda real
-            for d in demand_nodes:
-                edge = {"from": fict_id, "to": d["id"], "cost": 0,
-                        "line_id": None, "rect_id": None, "text_id": None}
-                self.edges.append(edge)
-                self.draw_edge(edge)
-
-        # Si oferta > demanda: nodo ficticio de demanda
-        elif total_supply > total_demand:
-            excess = total_supply - total_demand
-            fict_id = str(uuid.uuid4())[:8]
-            x_fict, y_fict = 570, 420
-            self.nodes.append({
-                "id": fict_id,
-                "x": x_fict, "y": y_fict,
-                "supply": 0, "demand": excess,
-                "fictitious": True
-            })
-            demand_nodes.append(self.nodes[-1])
+        elif dummy == "demand":
+            demand_ids = demand_ids + [self.DUMMY_ID]
             messagebox.showinfo(
                 "Información",
                 f"Oferta total ({total_supply}) > Demanda total ({total_demand}).\n"
-                f"Se agregó nodo ficticio de demanda con {excess} unidades."
+                f"Se agregó nodo ficticio de demanda con {total_supply - total_demand} unidades."
             )
-            # Dibujar nodo ficticio
-            self.draw_node(self.nodes[-1])
-            # Conectar cada oferta real a este con costo 0
-            for s in supply_nodes:
-                edge = {"from": s["id"], "to": fict_id, "cost": 0,
-                        "line_id": None, "rect_id": None, "text_id": None}
-                self.edges.append(edge)
-                self.draw_edge(edge)
-
-        # Construir modelo
-        supply_nodes = [n for n in self.nodes if n["supply"] > 0]
-        demand_nodes = [n for n in self.nodes if n["demand"] > 0]
-        m = len(supply_nodes)
-        n = len(demand_nodes)
-        c = []
-        A_eq = []
-        b_eq = []
-        A_ub = []
-        b_ub = []
-
-        result_text = "Función Objetivo (Transporte):\nMin Z = "
-        cost_terms = []
-        for i, s in enumerate(supply_nodes):
-            for j, d in enumerate(demand_nodes):
-                cost = next((e["cost"] for e in self.edges
-                             if e["from"] == s["id"] and e["to"] == d["id"]), None)
-                if cost is None:
-                    messagebox.showerror("Error", f"Falta arista {s['id'][:4]} → {d['id'][:4]}.")
+
+        # El motor en caliente pasa a ser de esta resolución: el hilo de
+        # trabajo sólo usa `warm`, y el motor vuelve a la GUI en finish(),
+        # que no se llama si la resolución se canceló o la red cambió
+        warm = {"engine": None, "key": None}
+        if method == "transport-simplex":
+            warm["engine"], warm["key"] = self.warm_engine, self.warm_key
+
+        # Resolver con el núcleo de transport en el hilo de trabajo
+        def task(cancel, time_limit):
+            with timings.phase("solve"):
+                if method == "transport-simplex":
+                    return self.solve_transport_warm(warm, supply_ids, demand_ids, supply, demand,
+                                                     cost, time_limit, cancel)
+                return transport.solve_transport(supply, demand, cost, method=method,
+                                                 time_limit=time_limit, cancel=cancel), ""
+
+        def progress():
+            if warm["engine"] is not None:
+                return f", {warm['engine'].iterations} pivotes"
+            return ""
+
+        def finish(result):
+            sol, warm_note = result
+            self.last_transport = None
+            if method == "transport-simplex" and not sol.stats.get("cached"):
+                self.warm_engine, self.warm_key = warm["engine"], warm["key"]
+            if sol.success:
+                cached = sol.stats.get("cached", False)
+                with timings.phase("extract"):
+                    if not cached:
+                        self.solution_cache.put(key, sol)
+                    # Una solución de la caché no tiene base en el motor: la
+                    # sensibilidad la reconstruye por crossover
+                    self.last_transport = {
+                        "supply_ids": supply_ids, "demand_ids": demand_ids,
+                        "supply": supply, "demand": demand, "cost": cost, "solution": sol,
+                        "engine": warm["engine"] if not cached else None,
+                        "real": (m, n),
+                    }
+                    used_fict = bool((sol.flows[m:] > 0).any() or (sol.flows[:, n:] > 0).any())
+                self.show_flows(supply_rows, demand_rows, sol.flows[:m, :n], timings)
+                notes = [warm_note, self.cache_note(sol)]
+                if used_fict:
+                    notes.append("Nota: Se usaron nodos ficticios, el modelo no estaba balanceado.")
+                with timings.phase("format"):
+                    report = transport.Report(supply_ids, demand_ids, supply, demand, cost, sol, notes=notes)
+                    self.show_report("Resultado Transporte", report)
+                self.show_timings(timings, sol)
+            else:
+                self.show_timings(timings, sol)
+                messagebox.showerror("Error", "No se encontró solución óptima para transporte.\n"
+                                              + self.infeasibility_text(sol, demand_ids, "Compradores"))
+
+        with timings.phase("solve"):
+            cached = self.solution_cache.get(key)
+        if cached is not None:
+            finish((cached, ""))
+            return
+        if method == "transport-simplex" and self.warm_engine is not None:
+            engine, self.warm_engine = self.warm_engine, None
+            if not self.run_solver("Resolviendo transporte...", task, finish, progress):
+                self.warm_engine = engine
+            return
+        self.run_solver("Resolviendo transporte...", task, finish, progress)
+
+    # --------------------------------------------
+    # Mensaje de infactibilidad: nombra las demandas sin aristas entrantes
+    # --------------------------------------------
+    def infeasibility_text(self, sol, demand_ids, label):
+        if sol.unreachable is None:
+            return sol.message
+        ids = ", ".join(demand_ids[j][:4] for j in sol.unreachable[:20])
+        more = f" y {len(sol.unreachable) - 20} más" if len(sol.unreachable) > 20 else ""
+        return f"{label} sin aristas entrantes: {ids}{more}."
+
+    # --------------------------------------------
+    # Panel de tiempos y log JSON de perfiles
+    # --------------------------------------------
+    def show_timings(self, timings, sol):
+        """Muestra el perfil de una resolución terminada y lo agrega al log si está activo."""
+        timings.stats.update(sol.stats)
+        timings.stats.update(status=sol.status, objective=sol.objective)
+        self.last_timings = timings
+        self.timing_label.config(text=f"{timings.summary()}\n{timings.solver_summary()}")
+        if self.timing_log is None:
+            return
+        try:
+            transport.append_log(self.timing_log, timings)
+        except OSError as e:
+            self.timing_log = None
+            self.timing_log_var.set(False)
+            messagebox.showerror("Error", f"No se pudo escribir el log de tiempos: {e}")
+
+    def cache_note(self, sol):
+        if not sol.stats.get("cached"):
+            return ""
+        return "Solución tomada de la caché: esta misma instancia ya se había resuelto."
+
+    def toggle_disk_cache(self):
+        """Activa o desactiva la copia en disco de la caché de soluciones (compartible)."""
+        if not self.disk_cache_var.get():
+            self.solution_cache.directory = None
+            return
+        path = filedialog.askdirectory(title="Carpeta de la caché de soluciones")
+        if not path:
+            self.disk_cache_var.set(False)
+            return
+        self.solution_cache.directory = path
+
+    def toggle_timing_log(self):
+        if not self.timing_log_var.get():
+            self.timing_log = None
+            return
+        path = filedialog.asksaveasfilename(
+            title="Log de tiempos", defaultextension=".jsonl", confirmoverwrite=False,
+            filetypes=[("JSON (una línea por resolución)", "*.jsonl *.json"), ("Todos", "*.*")])
+        if not path:
+            self.timing_log_var.set(False)
+            return
+        self.timing_log = path
+
+    # --------------------------------------------
+    # Simplex de transporte en caliente: si las plantas y compradores son
+    # los mismos que en la resolución anterior, se parte de su base óptima
+    # (cambio de costo → MODI, cambio de oferta/demanda → simplex dual)
+    # --------------------------------------------
+    def solve_transport_warm(self, warm, supply_ids, demand_ids, supply, demand, cost,
+                             time_limit=None, cancel=None):
+        """Corre en el hilo de trabajo: usa y actualiza sólo `warm` ({"engine", "key"})."""
+        key = (tuple(supply_ids), tuple(demand_ids))
+        engine = warm["engine"]
+        if engine is not None and warm["key"] == key:
+            before = engine.iterations
+            sol = engine.resolve(supply, demand, cost, time_limit=time_limit, cancel=cancel)
+            pivots = engine.iterations - before
+            if engine.start in ("primal", "dual"):
+                return sol, (f"\nRe-optimizado desde la base anterior "
+                             f"({engine.start}, {pivots} pivotes).\n")
+            return sol, ""
+        engine = transport.TransportSimplex(supply, demand, cost)
+        warm["engine"], warm["key"] = engine, key
+        return engine.solve(time_limit=time_limit, cancel=cancel), ""
+
+    # --------------------------------------------
+    # Resolución en un hilo de trabajo: la ventana sigue respondiendo, se
+    # muestra el progreso con opción de cancelar y el resultado vuelve al
+    # hilo de Tk con root.after (tkinter no es seguro entre hilos)
+    # --------------------------------------------
+    def read_time_limit(self):
+        text = self.time_limit_entry.get().strip()
+        if not text:
+            return None
+        value = float(text)
+        if value <= 0:
+            raise ValueError(text)
+        return value
+
+    def run_solver(self, title, task, on_done, progress=None):
+        """Ejecuta task(cancel, time_limit) en segundo plano y luego on_done(resultado).
+
+        on_done sólo se llama si la resolución sigue siendo la vigente al
+        terminar. Devuelve False si no se pudo lanzar.
+        """
+        if self.solver_job is not None:
+            messagebox.showwarning("Advertencia", "Ya hay una resolución en curso.")
+            return False
+        try:
+            time_limit = self.read_time_limit()
+        except ValueError:
+            messagebox.showerror("Error", "Tiempo límite inválido (segundos > 0 o vacío).")
+            return False
+
+        cancel = threading.Event()
+        results = queue.Queue()
+
+        def work():
+            try:
+                results.put((True, task(cancel, time_limit)))
+            except Exception as e:
+                results.put((False, e))
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Resolviendo")
+        dialog.transient(self.root)
+        ttk.Label(dialog, text=title).pack(padx=20, pady=(15, 5))
+        bar = ttk.Progressbar(dialog, mode="indeterminate", length=250)
+        bar.pack(padx=20, pady=5)
+        bar.start(15)
+        status_label = ttk.Label(dialog, text="Tiempo: 0.0 s")
+        status_label.pack(padx=20, pady=5)
+        ttk.Button(dialog, text="Cancelar", command=self.cancel_solver).pack(pady=(5, 15))
+        dialog.protocol("WM_DELETE_WINDOW", self.cancel_solver)
+
+        job = {"cancel": cancel, "dialog": dialog}
+        self.solver_job = job
+        self.solve_btn.state(["disabled"])
+        started = time.monotonic()
+
+        def poll():
+            if self.solver_job is not job:
+                return  # cancelada: el resultado tardío se descarta
+            try:
+                ok, value = results.get_nowait()
+            except queue.Empty:
+                extra = progress() if progress is not None else ""
+                status_label.config(text=f"Tiempo: {time.monotonic() - started:.1f} s{extra}")
+                self.root.after(100, poll)
+                return
+            self.close_solver()
+            if ok:
+                on_done(value)
+            else:
+                messagebox.showerror("Error", f"Error al resolver: {value}")
+
+        threading.Thread(target=work, daemon=True).start()
+        self.root.after(100, poll)
+        return True
+
+    def close_solver(self):
+        job, self.solver_job = self.solver_job, None
+        if job is not None:
+            job["dialog"].destroy()
+            self.solve_btn.state(["!disabled"])
+        return job
+
+    def cancel_solver(self):
+        # HiGHS no se interrumpe: su hilo termina solo y el resultado se ignora
+        job = self.close_solver()
+        if job is not None:
+            job["cancel"].set()
+
+    # --------------------------------------------
+    # Lote de escenarios sobre la red dibujada (sin nodos ficticios): cada
+    # escenario reemplaza costos y/o demandas y se resuelve en paralelo
+    # --------------------------------------------
+    def solve_scenarios(self):
+        supply_rows, demand_rows = self.net.supply_rows(), self.net.demand_rows()
+        if supply_rows.size == 0 or demand_rows.size == 0:
+            messagebox.showerror("Error", "Debe haber al menos un nodo de oferta y uno de demanda.")
+            return
+        cost = self.net.cost_matrix(supply_rows, demand_rows)
+        supply = self.net.supply[supply_rows]
+        demand = self.net.demand[demand_rows]
+
+        path = filedialog.askopenfilename(title="Escenarios",
+                                          filetypes=[("NumPy", "*.npz"), ("Todos", "*.*")])
+        if not path:
+            return
+        try:
+            with np.load(path) as data:
+                stacks = {key: data[key] for key in ("costs", "demands", "supplies") if key in data}
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"No se pudo leer {path}: {e}")
+            return
+        if not stacks:
+            messagebox.showerror("Error", "El archivo no tiene 'costs', 'demands' ni 'supplies'.")
+            return
+
+        win = tk.Toplevel(self.root)
+        win.title("Escenarios")
+        tree = ttk.Treeview(win, columns=("Escenario", "Estado", "Costo Total"), show="headings", height=15)
+        for col in ("Escenario", "Estado", "Costo Total"):
+            tree.heading(col, text=col)
+            tree.column(col, width=120, anchor="center")
+        scroll = ttk.Scrollbar(win, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scroll.set)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # El lote corre en el hilo de trabajo; los resultados llegan en orden
+        # de término por una cola y el sondeo de run_solver (hilo de Tk) los
+        # agrega a la tabla, así se ven al llegar y se puede cancelar
+        method = self.method_var.get()
+        rows = queue.Queue()
+        shown = [0]
+
+        def drain():
+            while True:
+                try:
+                    index, sol = rows.get_nowait()
+                except queue.Empty:
                     return
-                c.append(cost)
-                cost_terms.append(f"{cost}*x_{i + 1}{j + 1}")
-        result_text += " + ".join(cost_terms) + "\n\n"
-
-        # Restricciones oferta (≤)
-        result_text += "Restricciones Oferta (≤):\n"
-        for i in range(m):
-            row = [0] * (m * n)
-            for j in range(n):
-                row[i * n + j] = 1
-            A_ub.append(row)
-            b_ub.append(supply_nodes[i]["supply"])
-            terms = [f"x_{i + 1}{j + 1}" for j in range(n)]
-            result_text += f"{' + '.join(terms)} ≤ {supply_nodes[i]['supply']} (Planta {supply_nodes[i]['id'][:4]})\n"
-
-        # Restricciones demanda (=)
-        result_text += "\nRestricciones Demanda (=):\n"
-        for j in range(n):
-            row = [0] * (m * n)
-            for i in range(m):
-                row[i * n + j] = 1
-            A_eq.append(row)
-            b_eq.append(demand_nodes[j]["demand"])
-            terms = [f"x_{i + 1}{j + 1}" for i in range(m)]
-            result_text += f"{' + '.join(terms)} = {demand_nodes[j]['demand']} (Comprador {demand_nodes[j]['id'][:4]})\n"
-
-        result_text += "\nVariables x_{ij} ≥ 0\n\n"
-
-        # Resolver con linprog
-        res = linprog(c, A_eq=A_eq, b_eq=b_eq, A_ub=A_ub, b_ub=b_ub,
-                      bounds=(0, None), method="simplex")
-        if res.success:
-            solution = res.x.reshape(m, n)
-            result_text += "Solución Óptima:\n"
-            total_cost = 0
-            used_fict = False
-            for i, s in enumerate(supply_nodes):
-                for j, d in enumerate(demand_nodes):
-                    qty = solution[i][j]
-                    if qty > 0:
-                        cost = c[i * n + j]
-                        result_text += f"{s['id'][:4]} → {d['id'][:4]}: {qty} unidades, costo {cost * qty}\n"
-                        total_cost += cost * qty
-                        edge = next((e for e in self.edges
-                                     if e["from"] == s["id"] and e["to"] == d["id"]), None)
-                        if edge and edge.get("line_id") is not None:
-                            self.canvas.itemconfig(edge["line_id"], fill="#4CAF50", width=3)
-                        if s.get("fictitious", False) or d.get("fictitious", False):
-                            used_fict = True
-            result_text += f"Costo Total: {total_cost}\n"
-            if used_fict:
-                result_text += "\nNota: Se usaron nodos ficticios, el modelo no estaba balanceado."
-            messagebox.showinfo("Resultado Transporte", result_text)
-        else:
-            messagebox.showerror("Error", "No se encontró solución óptima para transporte.")
+                objective = f"{sol.objective:.6g}" if sol.success else "-"
+                tree.insert("", tk.END, iid=str(index), values=(index + 1, sol.status, objective))
+                shown[0] += 1
+
+        def task(cancel, time_limit):
+            results = transport.solve_scenarios(supply, demand, cost, method=method, **stacks)
+            try:
+                for item in results:
+                    rows.put(item)
+                    if cancel.is_set():
+                        break
+            except transport.ModelError as e:
+                return str(e)
+            finally:
+                results.close()
+            return None
+
+        def progress():
+            drain()
+            return f", {shown[0]} escenarios"
+
+        def finish(error):
+            drain()
+            if error:
+                messagebox.showerror("Error", error, parent=win)
+
+        if not self.run_solver("Resolviendo escenarios...", task, finish, progress):
+            win.destroy()
+            return
+        job = self.solver_job
+
+        def close():
+            if self.solver_job is job:
+                self.cancel_solver()
+            win.destroy()
+
+        win.protocol("WM_DELETE_WINDOW", close)
+
+    # --------------------------------------------
+    # Vista del reporte: una sección y una página a la vez; el texto
+    # completo sólo se arma al exportar
+    # --------------------------------------------
+    REPORT_PAGE_SIZE = 200
+
+    def show_report(self, title, report):
+        win = tk.Toplevel(self.root)
+        win.title(title)
+
+        top = ttk.Frame(win, padding=5)
+        top.pack(fill=tk.X)
+        ttk.Label(top, text="Sección:").pack(side=tk.LEFT, padx=5)
+        section_var = tk.StringVar(value=transport.REPORT_SECTIONS[0])
+        ttk.Combobox(top, textvariable=section_var, values=transport.REPORT_SECTIONS,
+                     state="readonly", width=18).pack(side=tk.LEFT, padx=5)
+        page_label = ttk.Label(top, text="")
+        prev_btn = ttk.Button(top, text="◀ Anterior")
+        next_btn = ttk.Button(top, text="Siguiente ▶")
+        prev_btn.pack(side=tk.LEFT, padx=5)
+        page_label.pack(side=tk.LEFT, padx=5)
+        next_btn.pack(side=tk.LEFT, padx=5)
+        export_btn = ttk.Button(top, text="Exportar...")
+        export_btn.pack(side=tk.RIGHT, padx=5)
+
+        body = ttk.Frame(win)
+        body.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        text = tk.Text(body, wrap=tk.NONE, width=90, height=25, font=("Courier", 9))
+        yscroll = ttk.Scrollbar(body, orient=tk.VERTICAL, command=text.yview)
+        xscroll = ttk.Scrollbar(body, orient=tk.HORIZONTAL, command=text.xview)
+        text.configure(yscrollcommand=yscroll.set, xscrollcommand=xscroll.set)
+        yscroll.pack(side=tk.RIGHT, fill=tk.Y)
+        xscroll.pack(side=tk.BOTTOM, fill=tk.X)
+        text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        state = {"page": 0}
+        size = self.REPORT_PAGE_SIZE
+
+        def render(*_):
+            section = section_var.get()
+            pages = max(1, -(-report.section_length(section) // size))
+            state["page"] = max(0, min(state["page"], pages - 1))
+            start = state["page"] * size
+            text.config(state=tk.NORMAL)
+            text.delete("1.0", tk.END)
+            text.insert("1.0", "\n".join(report.lines(section, start, start + size)))
+            text.config(state=tk.DISABLED)
+            page_label.config(text=f"Página {state['page'] + 1} de {pages}")
+
+        def turn(step):
+            state["page"] += step
+            render()
+
+        def change_section(*_):
+            state["page"] = 0
+            render()
+
+        def export():
+            path = filedialog.asksaveasfilename(
+                parent=win, title="Exportar reporte", defaultextension=".txt",
+                filetypes=[("Texto", "*.txt"), ("Todos", "*.*")])
+            if not path:
+                return
+            try:
+                with open(path, "w", encoding="utf-8") as f:
+                    report.write(f)
+            except OSError as e:
+                messagebox.showerror("Error", f"No se pudo exportar: {e}", parent=win)
+                return
+            messagebox.showinfo("Información", f"Reporte exportado a {path}.", parent=win)
+
+        prev_btn.config(command=lambda: turn(-1))
+        next_btn.config(command=lambda: turn(1))
+        export_btn.config(command=export)
+        section_var.trace_add("write", change_section)
+        render()
+        return win
+
+    # --------------------------------------------
+    # Panel de sensibilidad: precios sombra, costos reducidos y rangos de la
+    # última solución de transporte; "qué pasa si" sin volver a resolver
+    # --------------------------------------------
+    def show_sensitivity(self):
+        ctx = self.last_transport
+        if ctx is None:
+            messagebox.showerror("Error", "Primero resuelva un problema de transporte.")
+            return
+        try:
+            sens = transport.analyze(ctx["supply"], ctx["demand"], ctx["cost"],
+                                     solution=ctx["solution"], engine=ctx["engine"])
+        except transport.ModelError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        supply_ids, demand_ids = ctx["supply_ids"], ctx["demand_ids"]
+
+        def fmt(value):
+            return "∞" if value == np.inf else "-∞" if value == -np.inf else f"{value:.4g}"
+
+        win = tk.Toplevel(self.root)
+        win.title("Análisis de Sensibilidad")
+
+        def make_tree(title, columns):
+            frame = ttk.LabelFrame(win, text=title, padding=5)
+            frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+            tree = ttk.Treeview(frame, columns=columns, show="headings", height=6)
+            for col in columns:
+                tree.heading(col, text=col)
+                tree.column(col, width=90, anchor="center")
+            scroll = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
+            tree.configure(yscrollcommand=scroll.set)
+            tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+            scroll.pack(side=tk.RIGHT, fill=tk.Y)
+            return tree
+
+        plants = make_tree("Plantas (oferta)", ("Planta", "Oferta", "Precio sombra", "Mín", "Máx"))
+        for i, sid in enumerate(supply_ids):
+            plants.insert("", tk.END, iid=f"s{i}", values=(
+                sid[:4], fmt(sens.supply[i]), fmt(sens.supply_duals[i]),
+                fmt(sens.supply_lower[i]), fmt(sens.supply_upper[i])))
+
+        buyers = make_tree("Compradores (demanda)", ("Comprador", "Demanda", "Precio sombra", "Mín", "Máx"))
+        for j, did in enumerate(demand_ids):
+            buyers.insert("", tk.END, iid=f"d{j}", values=(
+                did[:4], fmt(sens.demand[j]), fmt(sens.demand_duals[j]),
+                fmt(sens.demand_lower[j]), fmt(sens.demand_upper[j])))
+
+        lanes = make_tree("Aristas", ("Arista", "Costo", "Flujo", "Costo reducido", "Mín", "Máx"))
+        # Sólo las aristas reales: ni pares sin arista ni las del nodo ficticio
+        m, n = ctx["real"]
+        for i, j in np.argwhere(np.isfinite(ctx["cost"][:m, :n])).tolist():
+            sid, did = supply_ids[i], demand_ids[j]
+            lanes.insert("", tk.END, iid=f"e{i},{j}", values=(
+                f"{sid[:4]} → {did[:4]}", fmt(sens.cost[i, j]), fmt(sens.flows[i, j]),
+                fmt(sens.reduced_costs[i, j]), fmt(sens.cost_lower[i, j]), fmt(sens.cost_upper[i, j])))
+
+        # Qué pasa si: nuevo valor para la fila seleccionada en cualquier tabla
+        whatif = ttk.Frame(win, padding=5)
+        whatif.pack(fill=tk.X, padx=10, pady=5)
+        ttk.Label(whatif, text="Nuevo valor:").pack(side=tk.LEFT, padx=5)
+        value_entry = ttk.Entry(whatif, width=12)
+        value_entry.pack(side=tk.LEFT, padx=5)
+        result_label = ttk.Label(whatif, text="Seleccione una fila y escriba el nuevo valor.")
+
+        def evaluate():
+            selected = plants.selection() or buyers.selection() or lanes.selection()
+            if not selected:
+                result_label.config(text="Seleccione una fila.")
+                return
+            try:
+                value = float(value_entry.get())
+            except ValueError:
+                result_label.config(text="Valor inválido.")
+                return
+            key = selected[0]
+            if key.startswith("s"):
+                delta = sens.supply_change(int(key[1:]), value)
+            elif key.startswith("d"):
+                delta = sens.demand_change(int(key[1:]), value)
+            else:
+                i, j = map(int, key[1:].split(","))
+                delta = sens.cost_change(i, j, value)
+            if delta is None:
+                result_label.config(text="Fuera de rango: la base cambia, hay que volver a resolver.")
+            else:
+                result_label.config(text=f"Costo Total: {ctx['solution'].objective + delta:.6g} "
+                                         f"(Δ {delta:+.6g})")
+
+        ttk.Button(whatif, text="Evaluar", command=evaluate).pack(side=tk.LEFT, padx=5)
+        result_label.pack(side=tk.LEFT, padx=5)
 
     # --------------------------------------------
     # Opciones clic derecho: eliminar/modificar/cambiarID nodo o arista
     # --------------------------------------------
     def canvas_options(self, event):
-        x, y = event.x, event.y
+        x, y = self.to_world(event.x, event.y)
 
         # 1) Detectar nodo
-        clicked_node = None
-        for node in self.nodes:
-            if math.hypot(node["x"] - x, node["y"] - y) <= 15:
-                clicked_node = node
-                break
+        clicked_node = self.find_node_at(x, y)
 
         if clicked_node:
             action = askstring(
@@ -698,18 +1897,14 @@ class TransportProblemGUI:
 
             if action.startswith("elim"):
                 # Eliminar nodo y aristas asociadas
-                self.nodes = [n for n in self.nodes if n["id"] != clicked_node["id"]]
-                self.edges = [e for e in self.edges
-                              if e["from"] != clicked_node["id"] and e["to"] != clicked_node["id"]]
-                messagebox.showinfo("Información", f"Nodo {clicked_node['id'][:4]} eliminado.")
-                self.redraw_all()
+                node_id = clicked_node["id"]
+                self.erase_node(clicked_node)
+                self.remove_node(clicked_node)
+                messagebox.showinfo("Información", f"Nodo {node_id[:4]} eliminado.")
                 return
 
             elif action.startswith("mod"):
-                # Modificar oferta o demanda (si no es ficticio)
-                if clicked_node.get("fictitious", False):
-                    messagebox.showerror("Error", "No se puede modificar nodo ficticio.")
-                    return
+                # Modificar oferta o demanda
                 if clicked_node["supply"] > 0:
                     new_supply = askfloat(
                         "Modificar Oferta",
@@ -734,7 +1929,7 @@ class TransportProblemGUI:
                     clicked_node["supply"] = 0
                     messagebox.showinfo("Información",
                                         f"Demanda nodo {clicked_node['id'][:4]} actualizada a {new_demand}.")
-                self.redraw_all()
+                self.refresh_node(clicked_node)
                 return
 
             elif action.startswith("cambiarid"):
@@ -746,17 +1941,13 @@ class TransportProblemGUI:
                 )
                 if not new_id:
                     return
-                if any(n["id"] == new_id for n in self.nodes):
+                if new_id in self.net.index:
                     messagebox.showerror("Error", "Ese ID ya existe. Elija otro.")
                     return
                 # Actualizar nodo y aristas
-                clicked_node["id"] = new_id
-                clicked_node["tag"] = new_id
-                for e in self.edges:
-                    if e["from"] == old_id: e["from"] = new_id
-                    if e["to"] == old_id: e["to"] = new_id
+                self.rename_node(clicked_node, new_id)
+                self.refresh_node(clicked_node)
                 messagebox.showinfo("Información", f"ID cambiado de {old_id[:4]} a {new_id[:4]}.")
-                self.redraw_all()
                 return
 
             else:
@@ -777,15 +1968,12 @@ class TransportProblemGUI:
                 return
             action = action.strip().lower()
             if action.startswith("elim"):
-                self.edges = [
-                    e for e in self.edges
-                    if not (e["from"] == clicked_edge["from"] and e["to"] == clicked_edge["to"])
-                ]
+                self.erase_edge(clicked_edge)
+                self.remove_edge(clicked_edge)
                 messagebox.showinfo(
                     "Información",
                     f"Arista {clicked_edge['from'][:4]} → {clicked_edge['to'][:4]} eliminada."
                 )
-                self.redraw_all()
                 return
             elif action.startswith("mod"):
                 new_cost = askfloat(
@@ -796,40 +1984,34 @@ class TransportProblemGUI:
                 if new_cost is None:
                     return
                 clicked_edge["cost"] = new_cost
+                self.refresh_edge(clicked_edge)
                 messagebox.showinfo(
                     "Información",
                     f"Costo arista {clicked_edge['from'][:4]} → {clicked_edge['to'][:4]} actualizado a {new_cost}."
                 )
-                self.redraw_all()
                 return
             else:
                 messagebox.showinfo("Información", "Acción no reconocida. Use 'eliminar' o 'modificar'.")
                 return
 
     # --------------------------------------------
-    # Busca arista cercana a (x, y) (dist ≤ 5 px)
+    # Busca la arista más cercana al punto del mundo (x, y), a ≤ 5 px de pantalla
     # --------------------------------------------
     def find_edge_at(self, x, y):
-        for edge in self.edges:
-            n1 = next((n for n in self.nodes if n["id"] == edge["from"]), None)
-            n2 = next((n for n in self.nodes if n["id"] == edge["to"]), None)
-            if not n1 or not n2:
-                continue
-            x1, y1 = n1["x"], n1["y"]
-            x2, y2 = n2["x"], n2["y"]
-            dx, dy = x2 - x1, y2 - y1
-            if dx == dy == 0:
-                dist = math.hypot(x - x1, y - y1)
-            else:
-                t = ((x - x1) * dx + (y - y1) * dy) / (dx * dx + dy * dy)
-                t = max(0, min(1, t))
-                proj_x = x1 + t * dx
-                proj_y = y1 + t * dy
-                dist = math.hypot(x - proj_x, y - proj_y)
-            if dist <= 5:
-                return edge
-        return None
-
+        radius = 5 / self.view["scale"]
+        rows = np.fromiter(self.edge_grid.query(x, y, radius), dtype=np.int64)
+        if rows.size == 0:
+            return None
+        x1, y1, x2, y2 = self.net.segments(rows).T
+        dx, dy = x2 - x1, y2 - y1
+        length2 = dx * dx + dy * dy
+        # Proyección del punto sobre cada segmento, acotada a sus extremos
+        t = np.divide((x - x1) * dx + (y - y1) * dy, length2,
+                      out=np.zeros_like(length2), where=length2 > 0)
+        t = np.clip(t, 0, 1)
+        dist = np.hypot(x - (x1 + t * dx), y - (y1 + t * dy))
+        best = int(np.argmin(dist))
+        return self.edge_item(int(rows[best])) if dist[best] <= radius else None
 
 if __name__ == "__main__":
     root = tk.Tk()
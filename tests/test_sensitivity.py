@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+from transport import INFEASIBLE, OPTIMAL, analyze, solve_transport
+
+# Cada cambio dentro de un rango informado, resuelto de nuevo con HiGHS,
+# tiene que dar el objetivo base + Δ de la sensibilidad.
+
+BALANCED = ([20, 30, 25], [10, 25, 15, 25],
+            [[8, 6, 10, 9], [9, 12, 13, 7], [14, 9, 16, 5]])
+UNBALANCED = ([40, 30, 35], [10, 25, 15, 25],
+              [[8, 6, 10, 9], [9, 12, 13, 7], [14, 9, 16, 5]])
+SPARSE = ([30, 25, 20], [15, 20, 10, 25],
+          [[4, np.nan, 7, 3], [np.nan, 5, 2, np.nan], [6, 3, np.nan, 8]])
+DEGENERATE = ([10, 10, 10], [10, 10, 10],
+              [[1, 2, 3], [2, 1, 3], [3, 3, 1]])
+# Ruta inexistente en la base (con flujo 0): C1 sólo se abastece desde P2
+MISSING_BASIC = ([9, 16], [16, 3], [[np.nan, 2], [12, 12]])
+
+
+def _random(seed, m=4, n=5, holes=0.3):
+    rng = np.random.default_rng(seed)
+    supply = rng.integers(5, 30, m).astype(float)
+    demand = rng.integers(5, 20, n).astype(float)
+    demand *= supply.sum() / demand.sum() * 0.9
+    cost = rng.integers(1, 20, (m, n)).astype(float)
+    cost[rng.random((m, n)) < holes] = np.nan
+    return supply, demand, cost
+
+
+INSTANCES = {"balanced": BALANCED, "unbalanced": UNBALANCED, "sparse": SPARSE,
+             "degenerate": DEGENERATE, "missing_basic": MISSING_BASIC}
+# Semillas con solución factible (la 3 deja una demanda sin rutas)
+INSTANCES.update({f"random{seed}": _random(seed) for seed in (0, 1, 2, 4, 5, 6)})
+
+
+def _objective(supply, demand, cost):
+    sol = solve_transport(supply, demand, cost, method="highs")
+    return sol.objective if sol.status == OPTIMAL else None
+
+
+def _points(lower, upper, value, span=10.0):
+    upper = value + span if np.isinf(upper) else upper
+    lower = value - span if np.isinf(lower) else lower
+    return sorted({lower, (lower + value) / 2, (value + upper) / 2, upper})
+
+
+def _sensitivity(instance, source):
+    supply, demand, cost = (np.asarray(a, dtype=float) for a in instance)
+    base = solve_transport(supply, demand, cost, method="highs")
+    assert base.status == OPTIMAL
+    solution = base if source == "crossover" else None
+    return supply, demand, cost, base.objective, analyze(supply, demand, cost, solution=solution)
+
+
+@pytest.mark.parametrize("source", ["simplex", "crossover"])
+@pytest.mark.parametrize("name", sorted(INSTANCES))
+def test_cost_changes_inside_range(name, source):
+    supply, demand, cost, base, sens = _sensitivity(INSTANCES[name], source)
+    for i, j in zip(*np.nonzero(np.isfinite(cost))):
+        for value in _points(sens.cost_lower[i, j], sens.cost_upper[i, j], cost[i, j]):
+            delta = sens.cost_change(i, j, value)
+            assert delta is not None
+            changed = cost.copy()
+            changed[i, j] = value
+            assert _objective(supply, demand, changed) == pytest.approx(base + delta, abs=1e-6)
+
+
+@pytest.mark.parametrize("source", ["simplex", "crossover"])
+@pytest.mark.parametrize("name", sorted(INSTANCES))
+def test_supply_changes_inside_range(name, source):
+    supply, demand, cost, base, sens = _sensitivity(INSTANCES[name], source)
+    for i in range(supply.size):
+        assert sens.supply_lower[i] <= supply[i] <= sens.supply_upper[i]
+        for value in _points(sens.supply_lower[i], sens.supply_upper[i], supply[i]):
+            delta = sens.supply_change(i, value)
+            assert delta is not None
+            changed = supply.copy()
+            changed[i] = value
+            assert _objective(changed, demand, cost) == pytest.approx(base + delta, abs=1e-6)
+
+
+@pytest.mark.parametrize("source", ["simplex", "crossover"])
+@pytest.mark.parametrize("name", sorted(INSTANCES))
+def test_demand_changes_inside_range(name, source):
+    supply, demand, cost, base, sens = _sensitivity(INSTANCES[name], source)
+    for j in range(demand.size):
+        assert sens.demand_lower[j] <= demand[j] <= sens.demand_upper[j]
+        for value in _points(sens.demand_lower[j], sens.demand_upper[j], demand[j]):
+            delta = sens.demand_change(j, value)
+            assert delta is not None
+            changed = demand.copy()
+            changed[j] = value
+            assert _objective(supply, changed, cost) == pytest.approx(base + delta, abs=1e-6)
+
+
+def test_changes_outside_range_are_rejected():
+    supply, demand, cost, base, sens = _sensitivity(BALANCED, "simplex")
+    for bound, step in ((sens.cost_upper, 1), (sens.cost_lower, -1)):
+        i, j = np.argwhere(np.isfinite(bound))[0]
+        assert sens.cost_change(i, j, bound[i, j] + step) is None
+    assert sens.supply_change(0, sens.supply_lower[0] - 1) is None
+    assert sens.demand_change(0, sens.demand_upper[0] + 1) is None
+
+
+def test_missing_lanes_have_no_cost_range():
+    sens = _sensitivity(SPARSE, "simplex")[-1]
+    missing = np.isnan(np.asarray(SPARSE[2], dtype=float))
+    assert np.isnan(sens.cost_lower[missing]).all()
+    assert np.isnan(sens.reduced_costs[missing]).all()
+
+
+def test_missing_basic_lane_limits_supply_and_demand_ranges():
+    # C1 sólo se abastece desde P2: P2 no puede bajar de 16 ni C1 subir de 16
+    supply, demand, cost = MISSING_BASIC
+    sens = analyze(supply, demand, cost)
+
+    assert sens.supply_lower[1] == 16
+    assert sens.demand_upper[0] == 16
+    assert sens.supply_change(1, 15) is None
+    assert sens.demand_change(0, 17) is None
+    assert solve_transport([9, 15], demand, cost, method="highs").status == INFEASIBLE
+    assert solve_transport(supply, [17, 3], cost, method="highs").status == INFEASIBLE
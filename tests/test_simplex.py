@@ -0,0 +1,247 @@
+import numpy as np
+import pytest
+from scipy.optimize import linprog
+
+from transport import INFEASIBLE, OPTIMAL, TransportSimplex, solve_transport
+
+# El simplex de transporte contra linprog (HiGHS) armado aparte: mismo
+# modelo (oferta ≤, demanda =, una variable por ruta existente), mismo
+# objetivo, y flujos y duales que cumplen el modelo.
+
+
+def _reference(supply, demand, cost):
+    """(estado, objetivo) de HiGHS sobre las rutas existentes."""
+    m, n = cost.shape
+    rows, cols = np.nonzero(np.isfinite(cost))
+    a_ub = np.zeros((m, rows.size))
+    a_ub[rows, np.arange(rows.size)] = 1
+    a_eq = np.zeros((n, rows.size))
+    a_eq[cols, np.arange(rows.size)] = 1
+    res = linprog(cost[rows, cols], A_ub=a_ub, b_ub=supply, A_eq=a_eq, b_eq=demand,
+                  bounds=(0, None), method="highs")
+    return (OPTIMAL, res.fun) if res.status == 0 else (INFEASIBLE, None)
+
+
+def _check(supply, demand, cost):
+    supply, demand, cost = (np.asarray(a, dtype=float) for a in (supply, demand, cost))
+    status, objective = _reference(supply, demand, cost)
+    sol = TransportSimplex(supply, demand, cost).solve()
+    assert sol.status == status
+    if status != OPTIMAL:
+        return sol
+    assert sol.objective == pytest.approx(objective, rel=1e-9, abs=1e-7)
+
+    # Flujos factibles y sin pasar por rutas inexistentes
+    flows = sol.flows
+    missing = ~np.isfinite(cost)
+    assert (flows >= -1e-9).all()
+    assert (flows[missing] == 0).all()
+    assert (flows.sum(axis=1) <= supply + 1e-7).all()
+    assert flows.sum(axis=0) == pytest.approx(demand)
+    assert (flows[~missing] * cost[~missing]).sum() == pytest.approx(sol.objective)
+
+    # Duales factibles (costos reducidos ≥ 0 en las rutas existentes) y
+    # con el mismo objetivo que el primal
+    u, v = sol.supply_duals, sol.demand_duals
+    reduced = cost - u[:, None] - v[None, :]
+    assert (reduced[~missing] >= -1e-7).all()
+    assert (u <= 1e-9).all()
+    assert u @ supply + v @ demand == pytest.approx(sol.objective, rel=1e-9, abs=1e-7)
+    return sol
+
+
+def _random(seed, m, n, kind="balanced", holes=0.0, low=1, high=100):
+    rng = np.random.default_rng([seed, m, n])
+    supply = rng.integers(1, 50, m).astype(float)
+    weights = rng.random(n) + 0.1
+    total = supply.sum() / (1.25 if kind == "unbalanced" else 1.0)
+    demand = np.floor(weights / weights.sum() * total)
+    demand[0] += np.floor(total) - demand.sum()
+    cost = rng.integers(low, high, (m, n)).astype(float)
+    cost[rng.random((m, n)) < holes] = np.nan
+    return supply, demand, cost
+
+
+SHAPES = [(1, 1), (1, 6), (6, 1), (3, 4), (8, 6), (15, 20), (40, 30)]
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("shape", SHAPES)
+def test_balanced_matches_highs(shape, seed):
+    _check(*_random(seed, *shape))
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("shape", SHAPES)
+def test_unbalanced_matches_highs(shape, seed):
+    _check(*_random(seed, *shape, kind="unbalanced"))
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("shape", [(3, 4), (8, 6), (15, 20)])
+def test_ties_match_highs(shape, seed):
+    # Costos de 1 a 3: muchos empates en Vogel y en el precio
+    _check(*_random(seed, *shape, low=1, high=4))
+
+
+def test_degenerate_bases():
+    # Sumas parciales iguales: la esquina noroeste y Vogel cierran fila y
+    # columna a la vez, con celdas básicas de flujo 0
+    _check([10, 10, 10], [10, 10, 10], [[1, 2, 3], [2, 1, 3], [3, 3, 1]])
+    _check([10, 20, 30], [10, 20, 30], np.ones((3, 3)))
+    _check([5, 0, 5], [0, 5, 5], [[4, 1, 2], [1, 1, 1], [3, 2, 5]])
+    _check([0, 0], [0, 0], [[1, 2], [3, 4]])
+
+
+@pytest.mark.parametrize("seed", range(8))
+@pytest.mark.parametrize("shape", [(3, 4), (8, 6), (15, 20)])
+def test_sparse_matches_highs(shape, seed):
+    # Con rutas inexistentes: óptimo igual al de HiGHS o infactible en ambos
+    _check(*_random(seed, *shape, holes=0.4))
+
+
+def test_short_supply_is_infeasible():
+    sol = _check([5, 5], [8, 4], [[1, 2], [3, 4]])
+    assert sol.status == INFEASIBLE
+
+
+def test_demand_without_lanes_is_infeasible():
+    sol = _check([10, 10], [5, 5, 5], [[1, np.nan, 2], [3, np.nan, 4]])
+    assert sol.status == INFEASIBLE
+    assert list(sol.unreachable) == [1]
+
+
+def test_penalty_infeasible_when_lanes_cannot_carry_demand():
+    # Toda demanda tiene rutas, pero C1 sólo puede recibir 5 de P1: el
+    # óptimo penalizado manda flujo por P2 → C1 y el modelo es infactible
+    sol = _check([5, 5], [8, 2], [[1, np.nan], [np.nan, 1]])
+    assert sol.status == INFEASIBLE
+    assert sol.flows is None
+
+
+# --------------------------------------------
+# Re-resolución en caliente: cada cambio aplicado a un motor ya resuelto
+# debe dar lo mismo que resolver en frío los datos nuevos
+# --------------------------------------------
+def _warm(engine, supply, demand, cost):
+    """Re-resuelve el motor con los datos dados y lo compara con HiGHS; devuelve el arranque."""
+    warm = engine.resolve(supply, demand, cost)
+    cold = _check(supply, demand, cost)
+    assert warm.status == cold.status
+    if cold.status == OPTIMAL:
+        assert warm.objective == pytest.approx(cold.objective, rel=1e-9, abs=1e-7)
+        assert warm.flows.sum(axis=0) == pytest.approx(np.asarray(demand, dtype=float))
+    return engine.start
+
+
+def _solved(supply, demand, cost):
+    engine = TransportSimplex(supply, demand, cost)
+    assert engine.solve().status == OPTIMAL
+    return engine
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_cost_edit_resolves_primal(seed):
+    supply, demand, cost = _random(seed, 8, 6, kind="unbalanced")
+    engine = _solved(supply, demand, cost)
+    rng = np.random.default_rng(seed)
+    for _ in range(5):
+        cost = cost.copy()
+        i, j = rng.integers(8), rng.integers(6)
+        cost[i, j] = rng.integers(1, 100)
+        assert _warm(engine, supply, demand, cost) == "primal"
+
+
+def test_supply_and_demand_edits_resolve_dual_or_primal():
+    starts = set()
+    for seed in range(10):
+        supply, demand, cost = _random(seed, 8, 6, kind="unbalanced")
+        engine = _solved(supply, demand, cost)
+        rng = np.random.default_rng(seed)
+        for _ in range(5):
+            supply = supply.copy()
+            demand = demand.copy()
+            demand[rng.integers(6)] += rng.integers(-5, 6)
+            demand = np.maximum(demand, 0)
+            supply[rng.integers(8)] += rng.integers(0, 6)
+            starts.add(_warm(engine, supply, demand, cost))
+    # Sólo cambian oferta y demanda: los costos reducidos siguen ≥ 0 y nunca
+    # hace falta arrancar con Vogel
+    assert starts <= {"primal", "dual"}
+    assert "dual" in starts
+
+
+def test_cost_and_demand_edit_falls_back_to_vogel():
+    starts = set()
+    for seed in range(10):
+        supply, demand, cost = _random(seed, 8, 6, kind="unbalanced")
+        engine = _solved(supply, demand, cost)
+        rng = np.random.default_rng(seed)
+        new_cost = rng.integers(1, 100, cost.shape).astype(float)
+        new_demand = np.floor(demand[::-1] * 1.1)
+        starts.add(_warm(engine, supply, new_demand, new_cost))
+    assert "vogel" in starts
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_lane_turned_missing(seed):
+    supply, demand, cost = _random(seed, 8, 6, kind="unbalanced")
+    engine = _solved(supply, demand, cost)
+    # Se quitan una a una las rutas con flujo en el óptimo vigente (celdas
+    # básicas con flujo > 0) hasta que el modelo deja de ser factible
+    for _ in range(cost.size):
+        i, j = np.argwhere(engine.flows() > 0)[0]
+        cost = cost.copy()
+        cost[i, j] = np.nan
+        _warm(engine, supply, demand, cost)
+        if _reference(supply, demand, cost)[0] == INFEASIBLE:
+            break
+    assert _reference(supply, demand, cost)[0] == INFEASIBLE
+
+
+def test_infeasible_edit_and_recovery():
+    supply, demand, cost = _random(1, 5, 4, kind="unbalanced")
+    engine = _solved(supply, demand, cost)
+    # Oferta corta
+    short = demand * 2
+    assert engine.resolve(demand=short).status == INFEASIBLE
+    # Demanda sin rutas
+    holes = cost.copy()
+    holes[:, 2] = np.nan
+    sol = engine.resolve(demand=demand, cost=holes)
+    assert sol.status == INFEASIBLE
+    assert list(sol.unreachable) == [2]
+    # Rutas que no alcanzan: C1 sólo desde P1, con menos oferta que su
+    # demanda (la oferta total alcanza; lo detecta la penalización)
+    narrow = cost.copy()
+    narrow[1:, 0] = np.nan
+    narrow_demand = demand.copy()
+    narrow_demand[0] = supply[0] + 1
+    assert narrow_demand.sum() <= supply.sum()
+    sol = engine.resolve(supply, narrow_demand, narrow)
+    assert sol.status == INFEASIBLE and sol.unreachable is None
+    assert _reference(supply, narrow_demand, narrow)[0] == INFEASIBLE
+    # Con los datos originales vuelve al óptimo
+    _warm(engine, supply, demand, cost)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("holes", [0.0, 0.3])
+def test_crossover_from_highs(seed, holes):
+    supply, demand, cost = _random(seed, 8, 6, kind="unbalanced", holes=holes)
+    highs = solve_transport(supply, demand, cost, method="highs")
+    assert highs.status == OPTIMAL
+    engine = TransportSimplex(supply, demand, cost)
+    sol = engine.crossover(highs.flows, highs.supply_duals, highs.demand_duals)
+    assert sol is not None and sol.status == OPTIMAL
+    assert sol.objective == pytest.approx(highs.objective)
+    # La base reconstruida sirve para seguir en caliente
+    cost = cost.copy()
+    cost[np.isfinite(cost)] += 1
+    assert _warm(engine, supply, demand, cost) == "primal"
+
+
+def test_crossover_rejects_non_vertex():
+    # Flujo en un ciclo (cuatro celdas positivas en 2 x 2): no es un vértice
+    engine = TransportSimplex([10, 10], [10, 10], [[1, 1], [1, 1]])
+    assert engine.crossover(np.full((2, 2), 5.0)) is None
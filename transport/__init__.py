@@ -0,0 +1,99 @@
+"""Núcleo de resolución de problemas de transporte y asignación, sin tkinter."""
+
+from .batch import solve_scenarios
+from .cache import SolutionCache, fingerprint
+from .core import (
+    ASSIGNMENT_BACKENDS,
+    ASSIGNMENT_METHODS,
+    LP_METHODS,
+    TRANSPORT_BACKENDS,
+    TRANSPORT_METHODS,
+    balance,
+    choose_method,
+    cost_matrix_from_edges,
+    cost_matrix_from_index,
+    solve_assignment,
+    solve_transport,
+)
+from .geometry import DISTANCE_METRICS, distance_matrix, geometry_costs
+from .io import (
+    Instance,
+    instance_from_arrays,
+    instance_from_dict,
+    load_instance,
+    write_result_csv,
+)
+from .model import (
+    assignment_constraints,
+    demand_block,
+    supply_block,
+    transport_constraints,
+)
+from .network import EdgeView, Network, NodeView
+from .report import SECTIONS as REPORT_SECTIONS
+from .report import Report
+from .sensitivity import Sensitivity, analyze
+from .simplex import TransportSimplex, solve_transport_simplex
+from .solution import (
+    CANCELLED,
+    INFEASIBLE,
+    ITERATION_LIMIT,
+    NUMERICAL_ERROR,
+    OPTIMAL,
+    TIME_LIMIT,
+    UNBOUNDED,
+    MissingEdgeError,
+    ModelError,
+    Solution,
+)
+from .timing import Timings, append_log
+
+__all__ = [
+    "ASSIGNMENT_BACKENDS",
+    "ASSIGNMENT_METHODS",
+    "CANCELLED",
+    "DISTANCE_METRICS",
+    "EdgeView",
+    "INFEASIBLE",
+    "ITERATION_LIMIT",
+    "Instance",
+    "LP_METHODS",
+    "NUMERICAL_ERROR",
+    "Network",
+    "NodeView",
+    "OPTIMAL",
+    "REPORT_SECTIONS",
+    "TIME_LIMIT",
+    "TRANSPORT_BACKENDS",
+    "TRANSPORT_METHODS",
+    "UNBOUNDED",
+    "MissingEdgeError",
+    "ModelError",
+    "Report",
+    "Sensitivity",
+    "Solution",
+    "SolutionCache",
+    "Timings",
+    "TransportSimplex",
+    "analyze",
+    "append_log",
+    "assignment_constraints",
+    "balance",
+    "choose_method",
+    "cost_matrix_from_edges",
+    "cost_matrix_from_index",
+    "demand_block",
+    "distance_matrix",
+    "fingerprint",
+    "geometry_costs",
+    "instance_from_arrays",
+    "instance_from_dict",
+    "load_instance",
+    "solve_assignment",
+    "solve_scenarios",
+    "solve_transport",
+    "solve_transport_simplex",
+    "supply_block",
+    "transport_constraints",
+    "write_result_csv",
+]
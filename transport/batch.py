@@ -0,0 +1,161 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+from scipy import sparse
+
+from .core import (
+    ASSIGNMENT_METHODS,
+    LP_METHODS,
+    TRANSPORT_METHODS,
+    choose_method,
+    solve_assignment,
+    solve_transport,
+)
+from .model import arc_constraints, arcs, assignment_constraints, missing_lanes, transport_constraints
+from .simplex import TransportSimplex
+from .solution import ModelError
+
+# --------------------------------------------
+# Resolución por lotes de escenarios
+# --------------------------------------------
+# Una red base (oferta, demanda, costos) y una pila de escenarios que
+# reemplazan la matriz de costos y/o los vectores de oferta y demanda. Cada
+# proceso trabajador arma la estructura del modelo una sola vez (matrices
+# de restricciones dispersas o el simplex de transporte, que re-optimiza en
+# caliente desde la base del escenario anterior) y sólo recibe los datos
+# que cambian.
+
+MODES = ("transport", "assignment")
+
+# Estado por proceso, armado por _init_worker
+_worker = {}
+
+
+def _init_worker(mode, method, supply, demand, cost):
+    _worker.clear()
+    missing = missing_lanes(cost)
+    _worker.update(mode=mode, method=method, supply=supply, demand=demand, cost=cost,
+                   missing=missing, constraints=None, engine=None)
+    if method not in LP_METHODS:
+        return
+    # Las restricciones valen para el patrón de aristas de la red base; un
+    # escenario con otro patrón de rutas inexistentes las rearma
+    m, n = cost.shape
+    if missing.any():
+        rows, cols = arcs(cost)
+        A_ub, A_eq = arc_constraints(m, n, rows, cols)
+        if mode == "assignment":
+            _worker["constraints"] = sparse.vstack([A_ub, A_eq], format="csr")
+        else:
+            _worker["constraints"] = (A_ub, A_eq)
+    elif mode == "assignment":
+        _worker["constraints"] = assignment_constraints(n)
+    else:
+        _worker["constraints"] = transport_constraints(m, n)
+
+
+def _solve_one(supply, demand, cost):
+    w = _worker
+    supply = w["supply"] if supply is None else supply
+    demand = w["demand"] if demand is None else demand
+    constraints = w["constraints"]
+    if cost is None:
+        cost = w["cost"]
+    elif constraints is not None and not np.array_equal(missing_lanes(cost), w["missing"]):
+        constraints = None
+    if w["mode"] == "assignment":
+        return solve_assignment(cost, method=w["method"], constraints=constraints)
+    if w["method"] == "transport-simplex":
+        if w["engine"] is None:
+            w["engine"] = TransportSimplex(supply, demand, cost)
+            return w["engine"].solve()
+        return w["engine"].resolve(supply, demand, cost)
+    return solve_transport(supply, demand, cost, method=w["method"], constraints=constraints)
+
+
+def _solve_chunk(chunk):
+    return [(index, _solve_one(*data)) for index, data in chunk]
+
+
+def _stack(values, shape, name, k):
+    """Valida una pila de escenarios (k x shape) y devuelve su tamaño."""
+    if values is None:
+        return k
+    if values.ndim != len(shape) + 1 or values.shape[1:] != shape:
+        raise ModelError(f"{name} debe tener forma (escenarios, {', '.join(map(str, shape))}), "
+                         f"no {values.shape}")
+    if k is not None and values.shape[0] != k:
+        raise ModelError("Todas las pilas de escenarios deben tener el mismo largo")
+    return values.shape[0]
+
+
+def solve_scenarios(supply, demand, cost, costs=None, demands=None, supplies=None,
+                    mode="transport", method=None, workers=None, chunksize=8):
+    """Resuelve cada escenario sobre la red base y va entregando resultados.
+
+    costs (k x m x n), demands (k x n) y supplies (k x m) son pilas de
+    escenarios; las que se omiten toman el valor base. Genera pares
+    (índice, Solution) a medida que terminan, no en orden. `workers` es el
+    número de procesos (por defecto os.cpu_count(); 1 resuelve en este
+    proceso) y `chunksize` cuántos escenarios viajan juntos a un trabajador.
+    """
+    if mode not in MODES:
+        raise ModelError(f"Modo desconocido: {mode}")
+    methods = ASSIGNMENT_METHODS if mode == "assignment" else TRANSPORT_METHODS
+    method = methods[0] if method is None else method
+    if method not in methods:
+        raise ModelError(f"Método desconocido para {mode}: {method}")
+
+    supply = np.asarray(supply, dtype=float)
+    demand = np.asarray(demand, dtype=float)
+    cost = np.asarray(cost, dtype=float)
+    if cost.shape != (supply.size, demand.size):
+        raise ModelError(f"La matriz de costos debe ser {supply.size}x{demand.size}, no {cost.shape}")
+    costs = None if costs is None else np.asarray(costs, dtype=float)
+    demands = None if demands is None else np.asarray(demands, dtype=float)
+    supplies = None if supplies is None else np.asarray(supplies, dtype=float)
+
+    # "auto" se resuelve una vez con la red base: todos los escenarios
+    # comparten el método y la estructura armada por trabajador
+    if method == "auto":
+        method = choose_method(mode, cost)
+
+    k = _stack(costs, cost.shape, "costs", None)
+    k = _stack(demands, demand.shape, "demands", k)
+    k = _stack(supplies, supply.shape, "supplies", k)
+    if k is None:
+        k = 1
+
+    def scenario(index):
+        return (index, (None if supplies is None else supplies[index],
+                        None if demands is None else demands[index],
+                        None if costs is None else costs[index]))
+
+    chunksize = max(1, int(chunksize))
+    chunks = ([scenario(i) for i in range(start, min(start + chunksize, k))]
+              for start in range(0, k, chunksize))
+    workers = (os.cpu_count() or 1) if workers is None else max(1, int(workers))
+    init_args = (mode, method, supply, demand, cost)
+
+    if workers == 1 or k <= chunksize:
+        _init_worker(*init_args)
+        for chunk in chunks:
+            yield from _solve_chunk(chunk)
+        return
+
+    # Se mantienen a lo sumo 2 lotes por trabajador en vuelo para no
+    # serializar todos los escenarios de entrada de una vez
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=init_args) as pool:
+        pending = set()
+        for chunk in chunks:
+            pending.add(pool.submit(_solve_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
@@ -0,0 +1,325 @@
+import io
+import json
+import os
+import platform
+import statistics
+import time
+
+import numpy as np
+import scipy
+from scipy import sparse
+
+from .core import (
+    ASSIGNMENT_METHODS,
+    LP_METHODS,
+    TRANSPORT_METHODS,
+    balance,
+    choose_method,
+    solve_assignment,
+    solve_transport,
+)
+from .io import instance_from_arrays, write_result_csv
+from .model import arc_constraints, arcs, assignment_constraints, missing_lanes, transport_constraints
+from .network import Network
+from .report import SECTIONS, Report
+from .solution import ModelError
+
+# --------------------------------------------
+# Benchmark reproducible: armado del modelo, resolución y formato
+# --------------------------------------------
+# Cada caso es un tipo de problema, un tamaño por lado y una densidad de
+# aristas, generado con una semilla fija: la misma semilla da la misma
+# instancia en cualquier máquina y en cualquier commit. Se miden por
+# separado las tres fases que recorre la GUI al resolver:
+#
+#   build   red en columnas (Network) → matriz de costos → balanceo →
+#           restricciones dispersas
+#   solve   solve_transport / solve_assignment con esas restricciones
+#   format  Report (primera página de cada sección, lo que muestra la
+#           vista) y el CSV de resultados
+#
+# El resultado es un JSON con las versiones de Python, NumPy y SciPy y los
+# tiempos de cada caso; compare() marca los casos más lentos que una
+# corrida anterior.
+
+KINDS = ("balanced", "unbalanced", "assignment")
+SIZES = (10, 50, 100, 500, 1000, 5000)
+DENSITIES = (1.0, 0.05)
+PHASES = ("build", "solve", "format")
+
+# Un caso con más aristas que esto se salta (5000 × 5000 denso son 25M de
+# variables); se puede subir con max_arcs
+MAX_ARCS = 2_000_000
+
+# Aristas promedio por nodo de oferta en los casos dispersos de tamaño
+# chico, donde density · n daría menos de una
+_MIN_DEGREE = 4
+
+
+# --------------------------------------------
+# Generadores de instancias
+# --------------------------------------------
+def _northwest_cells(supply, demand):
+    """Celdas de la esquina noroeste: una solución factible con m + n - 1 celdas."""
+    cells = []
+    i, j = 0, 0
+    left_s, left_d = supply[0], demand[0]
+    while i < supply.size and j < demand.size:
+        cells.append((i, j))
+        if left_s < left_d:
+            left_d -= left_s
+            i += 1
+            left_s = supply[i] if i < supply.size else 0
+        else:
+            left_s -= left_d
+            j += 1
+            left_d = demand[j] if j < demand.size else 0
+    return tuple(np.array(axis, dtype=np.int64) for axis in zip(*cells))
+
+
+def effective_density(size, density):
+    """Densidad que usa generate(): en tamaños chicos se sube hasta _MIN_DEGREE aristas por nodo."""
+    if density >= 1:
+        return 1.0
+    return max(density, min(1.0, _MIN_DEGREE / int(size)))
+
+
+def generate(kind, size, density=1.0, seed=0):
+    """Instancia aleatoria reproducible de `size` nodos por lado.
+
+    kind es "balanced" (oferta total = demanda total), "unbalanced" (20 %
+    más de oferta que de demanda) o "assignment" (n x n, oferta y demanda
+    1). Con density < 1 cada par tiene arista con probabilidad
+    effective_density(size, density); las celdas de la esquina noroeste se
+    agregan siempre, así toda instancia dispersa sigue siendo factible.
+    """
+    if kind not in KINDS:
+        raise ModelError(f"Tipo de instancia desconocido: {kind}")
+    if size < 1 or not 0 < density <= 1:
+        raise ModelError("El tamaño debe ser ≥ 1 y la densidad estar en (0, 1]")
+    rng = np.random.default_rng([seed, KINDS.index(kind), size, int(density * 1e6)])
+    m = n = int(size)
+    cost = rng.integers(1, 100, size=(m, n)).astype(float)
+    if kind == "assignment":
+        supply, demand = np.ones(m), np.ones(n)
+    else:
+        supply = rng.integers(10, 100, size=m).astype(float)
+        weights = rng.random(n) + 0.1
+        total = supply.sum() / (1.2 if kind == "unbalanced" else 1.0)
+        demand = np.floor(weights / weights.sum() * total)
+        demand[0] += np.floor(total) - demand.sum()
+
+    if density < 1:
+        keep = rng.random((m, n)) < effective_density(n, density)
+        if kind == "assignment":
+            keep[np.arange(n), rng.permutation(n)] = True
+        else:
+            keep[_northwest_cells(supply, demand)] = True
+        cost[~keep] = np.nan
+    return instance_from_arrays(supply, demand, cost)
+
+
+# --------------------------------------------
+# Fases
+# --------------------------------------------
+def _build_network(instance):
+    """Red en columnas como la arma la GUI al cargar: nodos en grilla, una arista por ruta."""
+    m, n = len(instance.supply_ids), len(instance.demand_ids)
+    net = Network()
+    net.add_nodes(instance.supply_ids, np.zeros(m), np.arange(m) * 60.0, instance.supply, np.zeros(m))
+    net.add_nodes(instance.demand_ids, np.full(n, 400.0), np.arange(n) * 60.0, np.zeros(n),
+                  instance.demand)
+    rows, cols = arcs(instance.cost)
+    net.add_edges(rows, cols + m, instance.cost[rows, cols])
+    return net
+
+
+def _build(instance, mode, method):
+    """Fase build: devuelve (supply_ids, demand_ids, supply, demand, cost, constraints, método).
+
+    Con method="auto" el método concreto se elige acá, como en la GUI.
+    """
+    net = _build_network(instance)
+    supply_rows, demand_rows = net.supply_rows(), net.demand_rows()
+    supply_ids = [net.ids[r] for r in supply_rows]
+    demand_ids = [net.ids[r] for r in demand_rows]
+    cost = net.cost_matrix(supply_rows, demand_rows)
+    supply, demand = net.supply[supply_rows], net.demand[demand_rows]
+    n = cost.shape[1]
+    constraints = None
+    if mode == "assignment":
+        if method == "auto":
+            method = choose_method(mode, cost)
+        if method in LP_METHODS:
+            if missing_lanes(cost).any():
+                rows, cols = arcs(cost)
+                constraints = sparse.vstack(arc_constraints(n, n, rows, cols), format="csr")
+            else:
+                constraints = assignment_constraints(n)
+        return supply_ids, demand_ids, supply, demand, cost, constraints, method
+
+    supply, demand, cost, dummy = balance(supply, demand, cost)
+    if dummy == "supply":
+        supply_ids = supply_ids + ["Ficticio"]
+    elif dummy == "demand":
+        demand_ids = demand_ids + ["Ficticio"]
+    if method == "auto":
+        method = choose_method(mode, cost)
+    if method in LP_METHODS:
+        m, n = cost.shape
+        if missing_lanes(cost).any():
+            rows, cols = arcs(cost)
+            constraints = arc_constraints(m, n, rows, cols)
+        else:
+            constraints = transport_constraints(m, n)
+    return supply_ids, demand_ids, supply, demand, cost, constraints, method
+
+
+def _solve(model, mode):
+    supply_ids, demand_ids, supply, demand, cost, constraints, method = model
+    if mode == "assignment":
+        return solve_assignment(cost, method=method, constraints=constraints)
+    return solve_transport(supply, demand, cost, method=method, constraints=constraints)
+
+
+def _format(model, mode, solution, page=40):
+    """Fase format: lo que la vista del reporte muestra y el CSV de resultados."""
+    supply_ids, demand_ids, supply, demand, cost, constraints, method = model
+    report = Report(supply_ids, demand_ids, supply, demand, cost, solution, mode=mode)
+    for section in SECTIONS:
+        report.lines(section, 0, page)
+    instance = instance_from_arrays(supply, demand, cost, supply_ids, demand_ids)
+    write_result_csv(io.StringIO(), instance, solution)
+
+
+# --------------------------------------------
+# Corrida
+# --------------------------------------------
+def _timed(repeat, phase):
+    """(resultado de la última vez, tiempos de cada repetición en segundos)."""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = phase()
+        times.append(time.perf_counter() - started)
+    return result, times
+
+
+def _mode_method(kind, method):
+    """(modo, método) de un tipo de instancia; sin método, el por defecto del modo."""
+    mode = "assignment" if kind == "assignment" else "transport"
+    methods = ASSIGNMENT_METHODS if mode == "assignment" else TRANSPORT_METHODS
+    method = methods[0] if method is None else method
+    if method not in methods:
+        raise ModelError(f"Método desconocido para {mode}: {method}")
+    return mode, method
+
+
+def run_case(kind, size, density=1.0, seed=0, method=None, repeat=3):
+    """Genera y mide un caso; devuelve su dict de resultados."""
+    mode, method = _mode_method(kind, method)
+    repeat = max(1, int(repeat))
+
+    instance = generate(kind, size, density, seed)
+    model, build = _timed(repeat, lambda: _build(instance, mode, method))
+    solution, solve = _timed(repeat, lambda: _solve(model, mode))
+    _, fmt = _timed(repeat, lambda: _format(model, mode, solution))
+    case = {"kind": kind, "size": size, "density": density,
+            "effective_density": effective_density(size, density), "seed": seed, "method": method,
+            "backend": model[-1], "arcs": int(np.isfinite(instance.cost).sum()), "status": solution.status,
+            "objective": solution.objective}
+    for phase, times in zip(PHASES, (build, solve, fmt)):
+        case[phase] = {"min": min(times), "median": statistics.median(times)}
+    return case
+
+
+def case_key(case):
+    """Clave para emparejar casos entre corridas: tipo, tamaño, densidad, semilla y método.
+
+    La densidad es la efectiva (la pedida en corridas anteriores a
+    effective_density).
+    """
+    density = case.get("effective_density", case["density"])
+    return (case["kind"], case["size"], density, case["seed"], case["method"])
+
+
+def run(kinds=KINDS, sizes=SIZES, densities=DENSITIES, seed=0, methods=None, repeat=3,
+        max_arcs=MAX_ARCS, label=None, progress=None):
+    """Corre todos los casos y devuelve el dict que se guarda como JSON.
+
+    `methods` es {"transport": método, "assignment": método}; lo que falte
+    usa el método por defecto. Un caso con más de max_arcs aristas
+    esperadas queda con status "skipped". `progress(case)` se llama al
+    terminar cada caso.
+    """
+    methods = methods or {}
+    cases = []
+    for kind in kinds:
+        mode = "assignment" if kind == "assignment" else "transport"
+        method = _mode_method(kind, methods.get(mode))[1]
+        for size in sizes:
+            for density in densities:
+                if size * size * effective_density(size, density) > max_arcs:
+                    case = {"kind": kind, "size": size, "density": density,
+                            "effective_density": effective_density(size, density), "seed": seed,
+                            "method": method, "status": "skipped"}
+                else:
+                    case = run_case(kind, size, density, seed, method, repeat)
+                cases.append(case)
+                if progress is not None:
+                    progress(case)
+    return {
+        "meta": {
+            "label": label,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "scipy": scipy.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "cases": cases,
+    }
+
+
+def compare(old, new, tolerance=0.25, floor=0.005):
+    """Casos de `new` más lentos que en `old` en alguna fase.
+
+    Devuelve una lista de (clave, fase, tiempo viejo, tiempo nuevo) con el
+    mínimo de las repeticiones de cada fase, cuando el nuevo supera al
+    viejo en más de `tolerance` (0.25 = 25 %) y en más de `floor`
+    segundos (los casos chicos son puro ruido).
+    """
+    before = {case_key(c): c for c in old["cases"] if c.get("status") != "skipped"}
+    slower = []
+    for case in new["cases"]:
+        prev = before.get(case_key(case))
+        if prev is None or case.get("status") == "skipped":
+            continue
+        for phase in PHASES:
+            a, b = prev[phase]["min"], case[phase]["min"]
+            if b > a * (1 + tolerance) and b - a > floor:
+                slower.append((case_key(case), phase, a, b))
+    return slower
+
+
+def write_json(f, results):
+    json.dump(results, f, indent=2)
+    f.write("\n")
+
+
+def describe(case):
+    """Una línea legible de un caso (para la salida de la línea de comandos)."""
+    method = case["method"]
+    if case.get("backend", method) != method:
+        method = f"{method}→{case['backend']}"
+    density = f"{case['density']:g}"
+    if case.get("effective_density", case["density"]) != case["density"]:
+        density = f"{density}→{case['effective_density']:g}"
+    head = f"{case['kind']:<10} {case['size']:>5} d={density:<12} {method:<22}"
+    if case["status"] == "skipped":
+        return f"{head} (salteado: demasiadas aristas)"
+    times = "  ".join(f"{phase} {case[phase]['min'] * 1000:9.2f} ms" for phase in PHASES)
+    return f"{head} {case['arcs']:>9} aristas  {times}  {case['status']}"
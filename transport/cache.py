@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+from .solution import OPTIMAL, Solution
+
+# --------------------------------------------
+# Caché de soluciones por huella de la instancia
+# --------------------------------------------
+# La huella es un hash de la instancia canónica: tipo de problema, método
+# y opciones, forma y contenido de oferta, demanda y matriz de costos
+# (float64, toda ruta inexistente como NaN y -0.0 como 0.0). Los ids de
+# los nodos y su posición en el canvas no entran: dos redes con los mismos
+# números dan la misma solución.
+#
+# SolutionCache guarda en memoria las últimas `maxsize` soluciones (LRU) y,
+# si se le da un directorio, también en disco como <huella>.npz, así varios
+# usuarios o sesiones que resuelven la misma red comparten el resultado.
+# Sólo se guardan soluciones óptimas: un corte por tiempo límite o una
+# cancelación no es un resultado de la instancia.
+
+# Cambia si cambia la forma canónica o el formato en disco
+_VERSION = b"transport-cache-1"
+
+
+def _canonical(values):
+    values = np.ascontiguousarray(values, dtype=float) + 0.0
+    return np.where(np.isfinite(values), values, np.nan)
+
+
+def fingerprint(mode, supply, demand, cost, method, **options):
+    """Huella (hex) de una instancia: igual huella, igual solución.
+
+    `options` son otras opciones del solver que cambian el resultado;
+    valores JSON (números, texto, None).
+    """
+    h = hashlib.sha256(_VERSION)
+    h.update(json.dumps([mode, method, options], sort_keys=True).encode())
+    for values in (supply, demand, cost):
+        values = _canonical(values)
+        h.update(repr(values.shape).encode())
+        h.update(values.tobytes())
+    return h.hexdigest()
+
+
+def _copy(solution, cached=True):
+    """Copia de la solución (arreglos y stats propios), marcada como de la caché."""
+    def arr(values):
+        return None if values is None else np.array(values)
+    stats = dict(solution.stats)
+    if cached:
+        stats["cached"] = True
+    return Solution(solution.status, flows=arr(solution.flows), objective=solution.objective,
+                    message=solution.message, assignment=arr(solution.assignment),
+                    supply_duals=arr(solution.supply_duals),
+                    demand_duals=arr(solution.demand_duals),
+                    unreachable=arr(solution.unreachable), stats=stats)
+
+
+class SolutionCache:
+    """Soluciones por huella, en memoria (LRU) y opcionalmente en `directory`.
+
+    get() devuelve una copia con stats["cached"] = True, o None; hits y
+    misses cuentan las consultas. Un archivo de disco ilegible cuenta como
+    ausente.
+    """
+
+    _ARRAYS = ("flows", "assignment", "supply_duals", "demand_duals", "unreachable")
+
+    def __init__(self, maxsize=32, directory=None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self._memory)
+
+    def clear(self):
+        """Vacía la memoria (los archivos de disco se conservan)."""
+        self._memory.clear()
+
+    def get(self, key):
+        solution = self._memory.get(key)
+        if solution is not None:
+            self._memory.move_to_end(key)
+        elif self.directory is not None:
+            solution = self._read(key)
+            if solution is not None:
+                self._remember(key, solution)
+        if solution is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return _copy(solution)
+
+    def put(self, key, solution):
+        """Guarda una solución óptima (las demás se ignoran)."""
+        if solution.status != OPTIMAL:
+            return
+        solution = _copy(solution, cached=False)
+        solution.stats.pop("cached", None)
+        self._remember(key, solution)
+        if self.directory is not None:
+            self._write(key, solution)
+
+    def solve(self, key, compute):
+        """Solución de la caché o, si no está, compute() (que se guarda)."""
+        solution = self.get(key)
+        if solution is None:
+            solution = compute()
+            self.put(key, solution)
+        return solution
+
+    def _remember(self, key, solution):
+        self._memory[key] = solution
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    # --------------------------------------------
+    # Disco: un .npz por huella, escrito en un temporal y renombrado para
+    # que otro proceso nunca lea un archivo a medias
+    # --------------------------------------------
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".npz")
+
+    def _write(self, key, solution):
+        meta = {"status": solution.status, "objective": solution.objective,
+                "message": str(solution.message), "stats": solution.stats}
+        arrays = {name: getattr(solution, name) for name in self._ARRAYS
+                  if getattr(solution, name) is not None}
+        fd, tmp = tempfile.mkstemp(suffix=".npz", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, meta=np.array(json.dumps(meta, default=float)), **arrays)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def _read(self, key):
+        try:
+            with np.load(self._path(key), allow_pickle=False) as data:
+                meta = json.loads(str(data["meta"]))
+                arrays = {name: data[name] for name in self._ARRAYS if name in data}
+        except (OSError, KeyError, ValueError):
+            return None
+        return Solution(meta["status"], objective=meta["objective"], message=meta["message"],
+                        stats=meta["stats"], **arrays)
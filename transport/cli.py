@@ -0,0 +1,182 @@
+import argparse
+import json
+import os
+import sys
+
+from . import bench
+from .cache import SolutionCache, fingerprint
+from .core import ASSIGNMENT_METHODS, TRANSPORT_METHODS, balance, solve_assignment, solve_transport
+from .io import load_instance, write_result_csv
+from .solution import ModelError
+
+# --------------------------------------------
+# Línea de comandos (sin tkinter): python -m transport solve ...
+# --------------------------------------------
+# Códigos de salida: 0 todas las instancias óptimas, 1 alguna sin solución
+# óptima, 2 error de uso o de datos.
+
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m transport",
+        description="Resuelve problemas de transporte y asignación sin interfaz gráfica.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    solve = commands.add_parser("solve", help="resuelve una o más instancias")
+    solve.add_argument("instances", nargs="+", help="archivos de instancia (.json, .csv o .npz)")
+    solve.add_argument("--mode", choices=("transport", "assignment"), default="transport",
+                       help="tipo de problema (por defecto: transport)")
+    solve.add_argument("--method", default=None,
+                       help=f"transporte: {', '.join(TRANSPORT_METHODS)}; "
+                            f"asignación: {', '.join(ASSIGNMENT_METHODS)}")
+    solve.add_argument("--time-limit", type=float, default=None,
+                       help="segundos máximos por instancia")
+    solve.add_argument("--out", default=None,
+                       help="CSV de salida (una instancia) o directorio (varias); "
+                            "por defecto se escribe en la salida estándar")
+    solve.add_argument("--cache", default=None, metavar="DIR",
+                       help="directorio de la caché de soluciones: una instancia ya resuelta "
+                            "(con el mismo modo y método) no se vuelve a resolver")
+
+    run = commands.add_parser("bench", help="mide armado, resolución y formato en instancias generadas")
+    run.add_argument("--kinds", type=_names(bench.KINDS), default=bench.KINDS,
+                     help=f"tipos de instancia separados por comas (por defecto: {','.join(bench.KINDS)})")
+    run.add_argument("--sizes", type=_numbers(int), default=bench.SIZES,
+                     help=f"nodos por lado (por defecto: {','.join(map(str, bench.SIZES))})")
+    run.add_argument("--densities", type=_numbers(float), default=bench.DENSITIES,
+                     help="fracción de pares con arista (por defecto: "
+                          f"{','.join(map(str, bench.DENSITIES))})")
+    run.add_argument("--seed", type=int, default=0, help="semilla de los generadores (por defecto: 0)")
+    run.add_argument("--repeat", type=int, default=3,
+                     help="repeticiones por fase; se reporta el mínimo y la mediana (por defecto: 3)")
+    run.add_argument("--transport-method", choices=TRANSPORT_METHODS, default=None)
+    run.add_argument("--assignment-method", choices=ASSIGNMENT_METHODS, default=None)
+    run.add_argument("--max-arcs", type=int, default=bench.MAX_ARCS,
+                     help=f"saltea los casos con más aristas (por defecto: {bench.MAX_ARCS})")
+    run.add_argument("--label", default=None, help="etiqueta de la corrida (p. ej. el commit)")
+    run.add_argument("--out", default=None,
+                     help="JSON de salida; por defecto se escribe en la salida estándar")
+    run.add_argument("--compare", default=None, metavar="JSON",
+                     help="corrida anterior: sale con código 1 si alguna fase es más lenta")
+    run.add_argument("--tolerance", type=float, default=0.25,
+                     help="fracción de tiempo extra tolerada al comparar (por defecto: 0.25)")
+    return parser
+
+
+def _numbers(kind):
+    def parse(text):
+        try:
+            return tuple(kind(v) for v in text.split(",") if v.strip())
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"lista de números inválida: {text}") from None
+    return parse
+
+
+def _names(choices):
+    def parse(text):
+        names = tuple(v.strip() for v in text.split(",") if v.strip())
+        unknown = [v for v in names if v not in choices]
+        if unknown:
+            raise argparse.ArgumentTypeError(f"desconocidos: {', '.join(unknown)} "
+                                             f"(use {', '.join(choices)})")
+        return names
+    return parse
+
+
+def _bench(args):
+    old = None
+    if args.compare is not None:
+        try:
+            with open(args.compare, encoding="utf-8") as f:
+                old = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"{args.compare}: {e}", file=sys.stderr)
+            return 2
+    methods = {"transport": args.transport_method, "assignment": args.assignment_method}
+    try:
+        results = bench.run(args.kinds, args.sizes, args.densities, args.seed, methods, args.repeat,
+                            args.max_arcs, args.label,
+                            progress=lambda case: print(bench.describe(case), file=sys.stderr))
+    except ModelError as e:
+        print(e, file=sys.stderr)
+        return 2
+    if args.out is None:
+        bench.write_json(sys.stdout, results)
+    else:
+        with open(args.out, "w", encoding="utf-8") as f:
+            bench.write_json(f, results)
+    if old is None:
+        return 0
+    slower = bench.compare(old, results, args.tolerance)
+    for key, phase, before, after in slower:
+        print(f"más lento: {' '.join(map(str, key))} {phase}: "
+              f"{before * 1000:.2f} ms → {after * 1000:.2f} ms", file=sys.stderr)
+    return 1 if slower else 0
+
+
+def _solve(instance, mode, method, time_limit, cache=None):
+    """Devuelve (solución, dummy); en transporte se balancea antes, como en la GUI."""
+    supply, demand, cost, dummy = instance.supply, instance.demand, instance.cost, None
+    if mode == "assignment":
+        method = method or ASSIGNMENT_METHODS[0]
+
+        def compute():
+            return solve_assignment(cost, method=method, time_limit=time_limit)
+    else:
+        method = method or TRANSPORT_METHODS[0]
+        supply, demand, cost, dummy = balance(supply, demand, cost)
+
+        def compute():
+            return solve_transport(supply, demand, cost, method=method, time_limit=time_limit)
+    if cache is None:
+        return compute(), dummy
+    key = fingerprint(mode, supply, demand, cost, method)
+    return cache.solve(key, compute), dummy
+
+
+def _output_path(args, path):
+    if args.out is None:
+        return None
+    if len(args.instances) == 1 and not os.path.isdir(args.out):
+        return args.out
+    os.makedirs(args.out, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(args.out, stem + ".csv")
+
+
+def main(argv=None):
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.command == "bench":
+        return _bench(args)
+    methods = ASSIGNMENT_METHODS if args.mode == "assignment" else TRANSPORT_METHODS
+    if args.method is not None and args.method not in methods:
+        parser.error(f"--method para {args.mode} debe ser uno de: {', '.join(methods)}")
+
+    try:
+        cache = None if args.cache is None else SolutionCache(directory=args.cache)
+    except OSError as e:
+        print(f"{args.cache}: {e}", file=sys.stderr)
+        return 2
+
+    exit_code = 0
+    for path in args.instances:
+        try:
+            instance = load_instance(path)
+            solution, dummy = _solve(instance, args.mode, args.method, args.time_limit, cache)
+        except (OSError, ModelError) as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            return 2
+        out = _output_path(args, path)
+        if out is None:
+            write_result_csv(sys.stdout, instance, solution, dummy)
+        else:
+            with open(out, "w", newline="", encoding="utf-8") as f:
+                write_result_csv(f, instance, solution, dummy)
+        if solution.success:
+            cached = " (desde la caché)" if solution.stats.get("cached") else ""
+            print(f"{path}: costo total {solution.objective:.12g}{cached}", file=sys.stderr)
+        else:
+            print(f"{path}: {solution.status} ({solution.message})", file=sys.stderr)
+            exit_code = 1
+    return exit_code
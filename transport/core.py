@@ -0,0 +1,423 @@
+import time
+from functools import partial
+
+import numpy as np
+from scipy import sparse
+from scipy.optimize import linear_sum_assignment, linprog
+from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+
+from .model import (
+    arc_constraints,
+    arcs,
+    assignment_constraints,
+    missing_lanes,
+    transport_constraints,
+    unreachable_demands,
+)
+from .simplex import TransportSimplex
+from .solution import (
+    CANCELLED,
+    INFEASIBLE,
+    ITERATION_LIMIT,
+    NUMERICAL_ERROR,
+    OPTIMAL,
+    TIME_LIMIT,
+    UNBOUNDED,
+    MissingEdgeError,
+    ModelError,
+    Solution,
+)
+
+# Códigos de estado de scipy.optimize.linprog
+_LINPROG_STATUS = {
+    0: OPTIMAL,
+    1: ITERATION_LIMIT,
+    2: INFEASIBLE,
+    3: UNBOUNDED,
+    4: NUMERICAL_ERROR,
+}
+
+
+def _linprog(c, algorithm, time_limit, cancel, **kwargs):
+    """linprog con HiGHS (algorithm: "highs", "highs-ds" o "highs-ipm"), tiempo límite y cancelación.
+
+    HiGHS no se puede interrumpir desde linprog: la cancelación sólo se
+    comprueba antes y después, y el tiempo límite lo aplica HiGHS mismo.
+    Devuelve (estado, resultado, stats); el resultado es None si se
+    canceló antes. stats tiene el tamaño del modelo, las iteraciones y el
+    tiempo de la llamada a linprog. No incluye las reducciones del
+    presolve: linprog no las devuelve (HiGHS sólo las escribe en su log de
+    consola).
+    """
+    rows = sum(kwargs[k].shape[0] for k in ("A_ub", "A_eq") if kwargs.get(k) is not None)
+    nonzeros = sum(kwargs[k].nnz for k in ("A_ub", "A_eq") if kwargs.get(k) is not None)
+    stats = {"solver": algorithm, "variables": int(c.size), "constraints": int(rows),
+             "nonzeros": int(nonzeros)}
+    if cancel is not None and cancel.is_set():
+        return CANCELLED, None, stats
+    options = {} if time_limit is None else {"time_limit": float(time_limit)}
+    started = time.monotonic()
+    res = linprog(c, method=algorithm, options=options, **kwargs)
+    stats["solver_seconds"] = time.monotonic() - started
+    stats["iterations"] = int(getattr(res, "nit", 0) or 0)
+    status = _LINPROG_STATUS.get(res.status, NUMERICAL_ERROR)
+    if cancel is not None and cancel.is_set():
+        status = CANCELLED
+    elif status == ITERATION_LIMIT and time_limit is not None \
+            and stats["solver_seconds"] >= time_limit:
+        status = TIME_LIMIT
+    return status, res, stats
+
+
+def _stopped(status, res, stats):
+    message = "Resolución cancelada" if status == CANCELLED else res.message
+    return Solution(status, message=message, stats=stats)
+
+
+# --------------------------------------------
+# Conversión desde las estructuras de la GUI
+# --------------------------------------------
+def cost_matrix_from_edges(supply_ids, demand_ids, edges):
+    """Arma la matriz de costos m x n a partir de la lista de aristas de la GUI.
+
+    Lanza MissingEdgeError si algún par oferta → demanda no tiene arista.
+    """
+    edge_index = {(e["from"], e["to"]): e for e in edges}
+    return cost_matrix_from_index(supply_ids, demand_ids, edge_index)
+
+
+def cost_matrix_from_index(supply_ids, demand_ids, edge_index, allow_missing=False):
+    """Igual que cost_matrix_from_edges pero con un índice {(origen, destino): arista}.
+
+    Con allow_missing=True los pares sin arista quedan en NaN (ruta
+    inexistente) y sólo se recorren las aristas, O(E) en vez de O(m·n).
+    """
+    if allow_missing:
+        row = {s_id: i for i, s_id in enumerate(supply_ids)}
+        col = {d_id: j for j, d_id in enumerate(demand_ids)}
+        cost = np.full((len(supply_ids), len(demand_ids)), np.nan)
+        for (s_id, d_id), edge in edge_index.items():
+            i, j = row.get(s_id), col.get(d_id)
+            if i is not None and j is not None:
+                cost[i, j] = edge["cost"]
+        return cost
+    cost = np.empty((len(supply_ids), len(demand_ids)), dtype=float)
+    for i, s_id in enumerate(supply_ids):
+        for j, d_id in enumerate(demand_ids):
+            edge = edge_index.get((s_id, d_id))
+            if edge is None:
+                raise MissingEdgeError(s_id, d_id)
+            cost[i, j] = edge["cost"]
+    return cost
+
+
+def _as_vector(values, name):
+    vector = np.asarray(values, dtype=float)
+    if vector.ndim != 1 or vector.size == 0:
+        raise ModelError(f"{name} debe ser un vector no vacío")
+    if np.any(vector < 0):
+        raise ModelError(f"{name} no puede tener valores negativos")
+    return vector
+
+
+def _as_cost(cost, m, n):
+    cost = np.asarray(cost, dtype=float)
+    if cost.shape != (m, n):
+        raise ModelError(f"La matriz de costos debe ser {m}x{n}, no {cost.shape}")
+    if np.any(cost == -np.inf):
+        raise ModelError("Los costos no pueden ser -inf")
+    return cost
+
+
+def _unreachable(cost, demand, who):
+    """Solution INFEASIBLE si alguna demanda no tiene aristas, si no None."""
+    unreachable = unreachable_demands(missing_lanes(cost), demand)
+    if unreachable.size == 0:
+        return None
+    return Solution(INFEASIBLE, unreachable=unreachable,
+                    message=f"{unreachable.size} {who} sin aristas entrantes")
+
+
+# --------------------------------------------
+# Balanceo virtual
+# --------------------------------------------
+# El nodo ficticio que balancea oferta y demanda existe sólo en el modelo:
+# una fila o columna extra de costo dummy_cost que nunca toca el grafo de
+# la GUI. Así resolver varias veces el mismo problema da siempre el mismo
+# modelo, sin nodos ni aristas que se acumulen.
+def balance(supply, demand, cost, dummy_cost=0.0):
+    """Devuelve (supply, demand, cost, dummy) con la oferta total igual a la demanda total.
+
+    dummy es None si ya estaba balanceado, "supply" si se agregó al final
+    una fila ficticia con el faltante de oferta o "demand" si se agregó una
+    columna ficticia con el exceso. Los argumentos no se modifican.
+    """
+    supply = _as_vector(supply, "La oferta")
+    demand = _as_vector(demand, "La demanda")
+    cost = _as_cost(cost, supply.size, demand.size)
+    gap = float(demand.sum() - supply.sum())
+    if gap > 0:
+        return (np.append(supply, gap), demand.copy(),
+                np.vstack([cost, np.full((1, demand.size), float(dummy_cost))]), "supply")
+    if gap < 0:
+        return (supply.copy(), np.append(demand, -gap),
+                np.hstack([cost, np.full((supply.size, 1), float(dummy_cost))]), "demand")
+    return supply.copy(), demand.copy(), cost.copy(), None
+
+
+# --------------------------------------------
+# Elección automática del método
+# --------------------------------------------
+# "auto" elige el método por tipo de problema, tamaño y densidad de
+# aristas. Los umbrales salen de `python -m transport bench`: el simplex
+# de transporte gana en redes densas (10x sobre HiGHS con 1000 x 1000),
+# HiGHS por puntos interiores en redes dispersas grandes y el dual simplex
+# de HiGHS en las chicas; en asignación, LAPJVsp (sparse-matching) gana
+# cuando faltan la mayoría de los pares.
+
+# Densidad (aristas / celdas) desde la que el transporte usa el simplex de transporte
+DENSE_TRANSPORT = 0.15
+# Aristas desde las que una red dispersa de transporte usa puntos interiores
+IPM_ARCS = 20_000
+# Densidad hasta la que la asignación usa el emparejamiento disperso
+SPARSE_ASSIGNMENT = 0.25
+
+
+def choose_method(mode, cost):
+    """Método que usa "auto" para esta matriz de costos ("transport" o "assignment")."""
+    cost = np.asarray(cost, dtype=float)
+    lanes = int(np.isfinite(cost).sum())
+    density = lanes / cost.size if cost.size else 1.0
+    if mode == "assignment":
+        return "sparse-matching" if density <= SPARSE_ASSIGNMENT else "hungarian"
+    if density >= DENSE_TRANSPORT:
+        return "transport-simplex"
+    return "highs-ipm" if lanes >= IPM_ARCS else "highs-ds"
+
+
+# --------------------------------------------
+# Problema de transporte
+# --------------------------------------------
+def _transport_lp(algorithm, supply, demand, cost, sparse_lanes, constraints, time_limit, cancel):
+    """Transporte con linprog (HiGHS); ver solve_transport."""
+    m, n = cost.shape
+    # Oferta: sum_j x_ij ≤ s_i, demanda: sum_i x_ij = d_j (matrices dispersas)
+    built = time.perf_counter()
+    if sparse_lanes:
+        rows, cols = arcs(cost)
+        A_ub, A_eq = constraints if constraints is not None else arc_constraints(m, n, rows, cols)
+        c = cost[rows, cols]
+    else:
+        A_ub, A_eq = constraints if constraints is not None else transport_constraints(m, n)
+        c = cost.ravel()
+    model_seconds = time.perf_counter() - built
+    status, res, stats = _linprog(c, algorithm, time_limit, cancel, A_ub=A_ub, b_ub=supply,
+                                  A_eq=A_eq, b_eq=demand, bounds=(0, None))
+    stats["model_seconds"] = model_seconds
+    if status != OPTIMAL:
+        return _stopped(status, res, stats)
+    if sparse_lanes:
+        flows = np.zeros((m, n))
+        flows[rows, cols] = res.x
+    else:
+        flows = res.x.reshape(m, n)
+    return Solution(status, flows=flows, objective=float(res.fun),
+                    message=res.message, supply_duals=res.ineqlin.marginals,
+                    demand_duals=res.eqlin.marginals, stats=stats)
+
+
+def _transport_simplex(supply, demand, cost, sparse_lanes, constraints, time_limit, cancel):
+    """Transporte con el simplex de transporte (Vogel + MODI); no usa restricciones armadas."""
+    return TransportSimplex(supply, demand, cost).solve(time_limit=time_limit, cancel=cancel)
+
+
+# Backends de transporte: nombre → función(supply, demand, cost, sparse_lanes,
+# constraints, time_limit, cancel) que devuelve una Solution. Se puede
+# registrar otro backend agregándolo a este dict.
+TRANSPORT_BACKENDS = {
+    "highs": partial(_transport_lp, "highs"),
+    "highs-ds": partial(_transport_lp, "highs-ds"),
+    "highs-ipm": partial(_transport_lp, "highs-ipm"),
+    "transport-simplex": _transport_simplex,
+}
+TRANSPORT_METHODS = ("auto",) + tuple(TRANSPORT_BACKENDS)
+
+# Métodos que resuelven con linprog y aceptan restricciones ya armadas
+LP_METHODS = ("highs", "highs-ds", "highs-ipm")
+
+
+def solve_transport(supply, demand, cost, method="auto", constraints=None,
+                    time_limit=None, cancel=None):
+    """Resuelve min sum c_ij x_ij con oferta (≤) por fila y demanda (=) por columna.
+
+    method es uno de TRANSPORT_METHODS: "highs" (HiGHS elige el
+    algoritmo), "highs-ds" (dual simplex), "highs-ipm" (puntos
+    interiores), "transport-simplex" (Vogel + MODI directamente sobre la
+    matriz de costos) o "auto", que elige con choose_method. El método
+    usado queda en solution.stats["method"].
+
+    Las celdas de costo NaN o +inf son rutas inexistentes: HiGHS arma el
+    modelo con una variable por arco existente (arc_constraints) y el
+    simplex de transporte las penaliza. Una demanda sin aristas devuelve
+    INFEASIBLE con `unreachable`.
+
+    `constraints` permite pasar (A_ub, A_eq) ya construidas para el mismo
+    patrón de aristas (transport_constraints(m, n) con la matriz completa,
+    arc_constraints si faltan rutas), para no rearmarlas en cada escenario;
+    sólo la usan los métodos de LP_METHODS.
+    `time_limit` (s)
+    y `cancel` (threading.Event) detienen la resolución con estado
+    TIME_LIMIT o CANCELLED.
+    """
+    supply = _as_vector(supply, "La oferta")
+    demand = _as_vector(demand, "La demanda")
+    cost = _as_cost(cost, supply.size, demand.size)
+    if method == "auto":
+        method = choose_method("transport", cost)
+    if method not in TRANSPORT_BACKENDS:
+        raise ModelError(f"Método de transporte desconocido: {method}")
+
+    sparse_lanes = missing_lanes(cost).any()
+    if sparse_lanes:
+        blocked = _unreachable(cost, demand, "demanda(s)")
+        if blocked is not None:
+            return blocked
+
+    solution = TRANSPORT_BACKENDS[method](supply, demand, cost, sparse_lanes, constraints,
+                                          time_limit, cancel)
+    solution.stats["method"] = method
+    return solution
+
+
+# --------------------------------------------
+# Problema de asignación
+# --------------------------------------------
+def _assignment_flows(n, cols):
+    flows = np.zeros((n, n), dtype=int)
+    flows[np.arange(n), cols] = 1
+    return flows
+
+
+def _assignment_hungarian(cost, missing, constraints, time_limit, cancel):
+    """Húngaro denso (linear_sum_assignment, O(n³), sin redondeos)."""
+    n = cost.shape[0]
+    stats = {"solver": "hungarian", "variables": int(n * n - missing.sum())}
+    started = time.perf_counter()
+    try:
+        # linear_sum_assignment trata +inf como par prohibido
+        rows, cols = linear_sum_assignment(np.where(missing, np.inf, cost))
+    except ValueError as e:
+        # Sin asignación completa de costo finito
+        return Solution(INFEASIBLE, message=str(e), stats=stats)
+    finally:
+        stats["solver_seconds"] = time.perf_counter() - started
+    if cancel is not None and cancel.is_set():
+        return Solution(CANCELLED, message="Resolución cancelada", stats=stats)
+    return Solution(OPTIMAL, flows=_assignment_flows(n, cols), objective=float(cost[rows, cols].sum()),
+                    message="Asignación óptima (húngaro)", assignment=cols, stats=stats)
+
+
+def _assignment_sparse(cost, missing, constraints, time_limit, cancel):
+    """Emparejamiento de costo mínimo sobre las aristas existentes (LAPJVsp)."""
+    n = cost.shape[0]
+    rows, cols = np.nonzero(~missing)
+    stats = {"solver": "sparse-matching", "variables": int(rows.size)}
+    # Un cero de la matriz dispersa es una arista ausente: se desplazan
+    # todos los costos a ≥ 1, lo que no cambia el óptimo porque cada agente
+    # toma exactamente una arista
+    weights = cost[rows, cols]
+    shifted = weights - weights.min() + 1.0
+    started = time.perf_counter()
+    try:
+        agents, tasks = min_weight_full_bipartite_matching(
+            sparse.csr_matrix((shifted, (rows, cols)), shape=(n, n)))
+    except ValueError as e:
+        # Sin emparejamiento completo
+        return Solution(INFEASIBLE, message=str(e), stats=stats)
+    finally:
+        stats["solver_seconds"] = time.perf_counter() - started
+    if cancel is not None and cancel.is_set():
+        return Solution(CANCELLED, message="Resolución cancelada", stats=stats)
+    assignment = np.empty(n, dtype=np.int64)
+    assignment[agents] = tasks
+    return Solution(OPTIMAL, flows=_assignment_flows(n, assignment),
+                    objective=float(cost[np.arange(n), assignment].sum()),
+                    message="Asignación óptima (emparejamiento disperso)", assignment=assignment,
+                    stats=stats)
+
+
+def _assignment_lp(algorithm, cost, missing, constraints, time_limit, cancel):
+    """Relajación lineal de la asignación con linprog (HiGHS)."""
+    n = cost.shape[0]
+    # Cada agente a una tarea (filas) y cada tarea a un agente (columnas)
+    built = time.perf_counter()
+    sparse_lanes = missing.any()
+    if sparse_lanes:
+        rows, cols = arcs(cost)
+        if constraints is None:
+            constraints = sparse.vstack(arc_constraints(n, n, rows, cols), format="csr")
+        c = cost[rows, cols]
+    else:
+        c = cost.ravel()
+    A_eq = constraints if constraints is not None else assignment_constraints(n)
+    b_eq = np.ones(2 * n)
+    model_seconds = time.perf_counter() - built
+
+    status, res, stats = _linprog(c, algorithm, time_limit, cancel, A_eq=A_eq, b_eq=b_eq,
+                                  bounds=(0, 1))
+    stats["model_seconds"] = model_seconds
+    if status != OPTIMAL:
+        return _stopped(status, res, stats)
+    if sparse_lanes:
+        flows = np.zeros((n, n), dtype=int)
+        flows[rows, cols] = res.x > 0.5
+    else:
+        flows = np.where(res.x > 0.5, 1, 0).reshape(n, n)
+    return Solution(status, flows=flows, objective=float(cost[flows == 1].sum()),
+                    message=res.message, assignment=flows.argmax(axis=1), stats=stats)
+
+
+# Backends de asignación: nombre → función(cost, missing, constraints,
+# time_limit, cancel) que devuelve una Solution
+ASSIGNMENT_BACKENDS = {
+    "hungarian": _assignment_hungarian,
+    "sparse-matching": _assignment_sparse,
+    "highs": partial(_assignment_lp, "highs"),
+    "highs-ds": partial(_assignment_lp, "highs-ds"),
+    "highs-ipm": partial(_assignment_lp, "highs-ipm"),
+}
+ASSIGNMENT_METHODS = ("auto",) + tuple(ASSIGNMENT_BACKENDS)
+
+
+def solve_assignment(cost, method="auto", constraints=None, time_limit=None, cancel=None):
+    """Resuelve la asignación n x n; los flujos devueltos son 0 o 1.
+
+    method es uno de ASSIGNMENT_METHODS: "hungarian" usa
+    scipy.optimize.linear_sum_assignment (O(n³), sin redondeos),
+    "sparse-matching" min_weight_full_bipartite_matching (LAPJVsp) sólo
+    sobre las aristas existentes, "highs"/"highs-ds"/"highs-ipm" resuelven
+    la relajación lineal con linprog y "auto" elige con choose_method.
+    `constraints` es A_eq de assignment_constraints(n) ya construida (o
+    del modelo por arcos, si faltan rutas), para los métodos de
+    LP_METHODS. Las celdas NaN o +inf son pares agente-tarea sin arista.
+    Los métodos combinatorios no admiten tiempo límite; `cancel` se revisa
+    al terminar.
+    """
+    cost = np.asarray(cost, dtype=float)
+    if cost.ndim != 2 or cost.shape[0] != cost.shape[1] or cost.size == 0:
+        raise ModelError("Para asignación, #ofertas = #demandas.")
+    n = cost.shape[0]
+    cost = _as_cost(cost, n, n)
+    if method == "auto":
+        method = choose_method("assignment", cost)
+    if method not in ASSIGNMENT_BACKENDS:
+        raise ModelError(f"Método de asignación desconocido: {method}")
+    missing = missing_lanes(cost)
+    if missing.any():
+        blocked = _unreachable(cost, np.ones(n), "tarea(s)")
+        if blocked is not None:
+            return blocked
+
+    solution = ASSIGNMENT_BACKENDS[method](cost, missing, constraints, time_limit, cancel)
+    solution.stats["method"] = method
+    return solution
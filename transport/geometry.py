@@ -0,0 +1,54 @@
+import numpy as np
+
+from .solution import ModelError
+
+# --------------------------------------------
+# Costos a partir de la posición de los nodos
+# --------------------------------------------
+# En vez de escribir el costo de cada arista, se calcula toda la matriz
+# oferta × demanda de una vez: distancia entre cada par de nodos × tarifa
+# por unidad de distancia, más un cargo fijo por ruta. Las distancias salen
+# de restas "outer" sobre las columnas x, y (sin recorrer pares en Python),
+# así 1000 × 1000 pares son unos milisegundos.
+#
+# Métricas:
+#   euclidean   √(dx² + dy²), en las unidades de x, y (en la GUI, las del canvas)
+#   manhattan   |dx| + |dy|
+#   haversine   gran círculo en km, con x = longitud e y = latitud en grados
+
+DISTANCE_METRICS = ("euclidean", "manhattan", "haversine")
+
+# Radio medio de la Tierra (km)
+EARTH_RADIUS_KM = 6371.0088
+
+
+def distance_matrix(x0, y0, x1, y1, metric="euclidean"):
+    """Distancias m x n entre los puntos (x0[i], y0[i]) y (x1[j], y1[j])."""
+    x0, y0, x1, y1 = (np.asarray(v, dtype=float).ravel() for v in (x0, y0, x1, y1))
+    if metric == "euclidean":
+        return np.hypot(np.subtract.outer(x0, x1), np.subtract.outer(y0, y1))
+    if metric == "manhattan":
+        dist = np.abs(np.subtract.outer(x0, x1))
+        dist += np.abs(np.subtract.outer(y0, y1))
+        return dist
+    if metric == "haversine":
+        lon0, lat0, lon1, lat1 = (np.radians(v) for v in (x0, y0, x1, y1))
+        h = np.sin(np.subtract.outer(lat0, lat1) / 2) ** 2
+        h += np.outer(np.cos(lat0), np.cos(lat1)) * np.sin(np.subtract.outer(lon0, lon1) / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+    raise ModelError(f"Métrica desconocida: {metric} (use {', '.join(DISTANCE_METRICS)})")
+
+
+def geometry_costs(x0, y0, x1, y1, metric="euclidean", rate=1.0, fee=0.0):
+    """Matriz de costos m x n: distancia × rate + fee.
+
+    `fee` es un cargo fijo por ruta, un número o un arreglo m x n (NaN o
+    +inf en una celda = ruta inexistente).
+    """
+    cost = distance_matrix(x0, y0, x1, y1, metric)
+    cost *= float(rate)
+    try:
+        cost += np.asarray(fee, dtype=float)
+    except ValueError as e:
+        raise ModelError(f"El cargo fijo debe ser un número o una matriz {cost.shape}") from e
+    return cost
@@ -0,0 +1,188 @@
+import csv
+import json
+import os
+
+import numpy as np
+
+from .core import cost_matrix_from_index
+from .solution import ModelError
+
+# --------------------------------------------
+# Lectura y escritura de instancias y resultados
+# --------------------------------------------
+# Formatos de instancia (se eligen por la extensión del archivo):
+#
+# .json, con la misma forma que usa la GUI:
+#   {"nodes": [{"id": "P1", "supply": 20, "demand": 0}, ...],
+#    "edges": [{"from": "P1", "to": "C1", "cost": 8}, ...]}
+# o, en forma compacta, {"supply": {"P1": 20}, "demand": {"C1": 10},
+# "edges": [...]}. Un nodo con oferta > 0 es de oferta y uno con
+# demanda > 0 es de demanda, igual que en la GUI.
+#
+# .csv, la tabla de transporte clásica (una celda vacía = sin arista):
+#   ,C1,C2,oferta
+#   P1,8,,20
+#   P2,9,12,30
+#   demanda,10,25,
+#
+# .npz, con los arreglos supply (m), demand (n) y cost (m x n), y
+# opcionalmente supply_ids y demand_ids.
+#
+# Los pares sin arista quedan con costo NaN (ruta inexistente).
+
+# Id de la fila o columna que agrega balance() en los resultados
+DUMMY_ID = "Ficticio"
+
+
+class Instance:
+    """Red de transporte lista para resolver: ids, vectores y matriz de costos."""
+
+    def __init__(self, supply_ids, demand_ids, supply, demand, cost):
+        self.supply_ids = supply_ids
+        self.demand_ids = demand_ids
+        self.supply = supply
+        self.demand = demand
+        self.cost = cost
+
+    def __repr__(self):
+        return f"Instance({len(self.supply_ids)} ofertas, {len(self.demand_ids)} demandas)"
+
+
+def instance_from_arrays(supply, demand, cost, supply_ids=None, demand_ids=None):
+    """Valida vectores y matriz de costos y arma una Instance.
+
+    Sin ids, las ofertas se llaman O1..Om y las demandas D1..Dn.
+    """
+    supply = np.asarray(supply, dtype=float).ravel()
+    demand = np.asarray(demand, dtype=float).ravel()
+    cost = np.asarray(cost, dtype=float)
+    m, n = supply.size, demand.size
+    if m == 0 or n == 0:
+        raise ModelError("Debe haber al menos un nodo de oferta y uno de demanda.")
+    if cost.shape != (m, n):
+        raise ModelError(f"La matriz de costos debe ser {m}x{n}, no {cost.shape}")
+    if np.any(cost == -np.inf):
+        i, j = np.argwhere(cost == -np.inf)[0]
+        raise ModelError(f"Costo inválido en la fila {i + 1}, columna {j + 1}")
+    if np.any(supply < 0) or np.any(demand < 0):
+        raise ModelError("La oferta y la demanda no pueden ser negativas")
+    supply_ids = [f"O{i + 1}" for i in range(m)] if supply_ids is None else [str(k) for k in supply_ids]
+    demand_ids = [f"D{j + 1}" for j in range(n)] if demand_ids is None else [str(k) for k in demand_ids]
+    if len(supply_ids) != m or len(demand_ids) != n:
+        raise ModelError("La cantidad de ids no coincide con la oferta o la demanda")
+    if len(set(supply_ids) | set(demand_ids)) != m + n:
+        raise ModelError("Los ids de los nodos deben ser únicos")
+    return Instance(supply_ids, demand_ids, supply, demand, cost)
+
+
+def instance_from_dict(data):
+    """Arma una Instance desde el dict del JSON; lanza ModelError si no es válido."""
+    if not isinstance(data, dict):
+        raise ModelError("La instancia debe ser un objeto JSON")
+    if "nodes" in data:
+        supply = {}
+        demand = {}
+        for node in data["nodes"]:
+            node_id = str(node["id"])
+            if float(node.get("supply", 0)) > 0:
+                supply[node_id] = float(node["supply"])
+            if float(node.get("demand", 0)) > 0:
+                demand[node_id] = float(node["demand"])
+    elif "supply" in data and "demand" in data:
+        supply = {str(k): float(v) for k, v in data["supply"].items()}
+        demand = {str(k): float(v) for k, v in data["demand"].items()}
+    else:
+        raise ModelError("La instancia necesita 'nodes' o 'supply' y 'demand'")
+    if not supply or not demand:
+        raise ModelError("Debe haber al menos un nodo de oferta y uno de demanda.")
+
+    edges = [{"from": str(e["from"]), "to": str(e["to"]), "cost": float(e["cost"])}
+             for e in data.get("edges", [])]
+    supply_ids = list(supply)
+    demand_ids = list(demand)
+    edge_index = {(e["from"], e["to"]): e for e in edges}
+    cost = cost_matrix_from_index(supply_ids, demand_ids, edge_index, allow_missing=True)
+    return instance_from_arrays([supply[i] for i in supply_ids], [demand[j] for j in demand_ids],
+                                cost, supply_ids, demand_ids)
+
+
+def _load_json(path):
+    with open(path, encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ModelError(f"JSON inválido en {path}: {e}") from e
+    return instance_from_dict(data)
+
+
+def _load_csv(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        rows = [row for row in csv.reader(f) if any(cell.strip() for cell in row)]
+    if len(rows) < 3:
+        raise ModelError("La tabla CSV necesita encabezado, filas de oferta y fila de demanda")
+    header, body, last = rows[0], rows[1:-1], rows[-1]
+    n = len(header) - 2
+    if n < 1 or any(len(row) < n + 2 for row in body) or len(last) < n + 1:
+        raise ModelError("Todas las filas de la tabla CSV deben tener una celda por demanda")
+    table = np.array([[cell.strip() or "nan" for cell in row[1:n + 2]] for row in body], dtype=float)
+    return instance_from_arrays(table[:, n], [float(v) for v in last[1:n + 1]], table[:, :n],
+                                [row[0].strip() for row in body], [h.strip() for h in header[1:n + 1]])
+
+
+def _load_npz(path):
+    with np.load(path) as data:
+        missing = [k for k in ("supply", "demand", "cost") if k not in data]
+        if missing:
+            raise ModelError(f"Faltan los arreglos {', '.join(missing)} en {path}")
+        return instance_from_arrays(
+            data["supply"], data["demand"], data["cost"],
+            data["supply_ids"].tolist() if "supply_ids" in data else None,
+            data["demand_ids"].tolist() if "demand_ids" in data else None)
+
+
+_LOADERS = {".json": _load_json, ".csv": _load_csv, ".npz": _load_npz}
+
+
+def load_instance(path):
+    """Lee una instancia .json, .csv o .npz (ver los formatos al inicio del módulo)."""
+    loader = _LOADERS.get(os.path.splitext(path)[1].lower())
+    if loader is None:
+        raise ModelError(f"Formato no soportado: {path} (use .json, .csv o .npz)")
+    try:
+        return loader(path)
+    except ModelError:
+        raise
+    except (KeyError, TypeError, ValueError) as e:
+        raise ModelError(f"Instancia inválida en {path}: {e!r}") from e
+
+
+def _number(value):
+    return f"{float(value):.12g}"
+
+
+def write_result_csv(f, instance, solution, dummy=None):
+    """Escribe los flujos positivos y el costo total como CSV en el archivo f.
+
+    Columnas: origen, destino, flujo, costo_unitario, costo. La última fila
+    es "total" con el valor objetivo; sin solución óptima sólo se escribe
+    el estado. `dummy` es el de balance(): la fila ("supply") o columna
+    ("demand") ficticia de la solución se escribe como DUMMY_ID, con costo 0.
+    """
+    writer = csv.writer(f)
+    writer.writerow(["origen", "destino", "flujo", "costo_unitario", "costo"])
+    if not solution.success:
+        writer.writerow(["estado", solution.status, "", "", ""])
+        return
+    supply_ids, demand_ids, cost = list(instance.supply_ids), list(instance.demand_ids), instance.cost
+    if dummy == "supply":
+        supply_ids.append(DUMMY_ID)
+        cost = np.vstack([cost, np.zeros((1, cost.shape[1]))])
+    elif dummy == "demand":
+        demand_ids.append(DUMMY_ID)
+        cost = np.hstack([cost, np.zeros((cost.shape[0], 1))])
+    rows, cols = np.nonzero(solution.flows > 0)
+    for i, j in zip(rows, cols):
+        flow = solution.flows[i, j]
+        writer.writerow([supply_ids[i], demand_ids[j], _number(flow),
+                         _number(cost[i, j]), _number(flow * cost[i, j])])
+    writer.writerow(["total", "", "", "", _number(solution.objective)])
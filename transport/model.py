@@ -0,0 +1,67 @@
+import numpy as np
+from scipy import sparse
+
+
+# --------------------------------------------
+# Bloques de restricciones dispersos (CSR)
+# --------------------------------------------
+# La variable x_ij ocupa la columna i * n + j. Cada variable aparece en
+# exactamente una fila de oferta y una de demanda, así que cada bloque
+# tiene m * n elementos no nulos en vez de (m + n) * m * n celdas densas.
+
+def supply_block(m, n):
+    """Filas sum_j x_ij (una por nodo de oferta), matriz m x (m * n)."""
+    cols = np.arange(m * n)
+    rows = cols // n
+    data = np.ones(m * n)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(m, m * n))
+
+
+def demand_block(m, n):
+    """Filas sum_i x_ij (una por nodo de demanda), matriz n x (m * n)."""
+    cols = np.arange(m * n)
+    rows = cols % n
+    data = np.ones(m * n)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(n, m * n))
+
+
+def transport_constraints(m, n):
+    """Devuelve (A_ub, A_eq): oferta (≤) y demanda (=) del modelo de transporte."""
+    return supply_block(m, n), demand_block(m, n)
+
+
+def assignment_constraints(n):
+    """Devuelve A_eq (2n x n²): una fila por agente y una por tarea."""
+    return sparse.vstack([supply_block(n, n), demand_block(n, n)], format="csr")
+
+
+# --------------------------------------------
+# Modelo por arcos: una variable por arista existente
+# --------------------------------------------
+# Una celda de costo NaN o +inf es una ruta inexistente. Con sólo E
+# aristas, la variable k es el arco (rows[k], cols[k]) y cada bloque tiene
+# E elementos no nulos en lugar de m * n.
+
+def missing_lanes(cost):
+    """Máscara m x n de celdas sin arista (costo NaN o +inf)."""
+    return ~np.isfinite(cost)
+
+
+def arcs(cost):
+    """Arcos existentes en orden de filas: (rows, cols) de las celdas finitas."""
+    return np.nonzero(np.isfinite(cost))
+
+
+def arc_constraints(m, n, rows, cols):
+    """Devuelve (A_ub, A_eq) del transporte con una columna por arco."""
+    E = rows.size
+    data = np.ones(E)
+    index = np.arange(E)
+    A_ub = sparse.csr_matrix((data, (rows, index)), shape=(m, E))
+    A_eq = sparse.csr_matrix((data, (cols, index)), shape=(n, E))
+    return A_ub, A_eq
+
+
+def unreachable_demands(missing, demand, tol=0.0):
+    """Índices de las demandas > tol cuya columna de `missing` no tiene aristas."""
+    return np.flatnonzero(np.all(missing, axis=0) & (np.asarray(demand) > tol))
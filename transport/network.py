@@ -0,0 +1,463 @@
+import zipfile
+
+import numpy as np
+
+from .geometry import geometry_costs
+from .solution import ModelError
+
+# Versión del formato de sesión (.npz) que escriben save() y lee load()
+SESSION_FORMAT = "transport-session-1"
+
+# --------------------------------------------
+# Red en columnas: nodos y aristas como arreglos de NumPy
+# --------------------------------------------
+# Cada nodo es una fila de x, y, supply, demand y cada arista una fila de
+# src, dst (filas de nodo), cost y flow: unos 50 bytes por arista en lugar
+# de un dict por arista, y el modelo (matriz de costos, flujos de la
+# solución) se arma con operaciones sobre columnas enteras. Las filas no
+# cambian al borrar (sólo se marcan como muertas), así que una fila sirve
+# de clave estable para la GUI.
+#
+# Las búsquedas por par (src, dst) y por nodo usan un índice ordenado que
+# se arma al primer uso tras un alta o baja de aristas: O(log E) por
+# búsqueda y O(E log E) una vez por cambio de estructura.
+
+
+def _grown(array, size):
+    """`array` con capacidad para al menos `size` filas (duplicando)."""
+    if size <= array.shape[0]:
+        return array
+    grown = np.zeros(max(size, 2 * array.shape[0], 16), dtype=array.dtype)
+    grown[:array.shape[0]] = array
+    return grown
+
+
+class Network:
+    """Nodos y aristas de una red de transporte, en columnas.
+
+    `ids[r]` es el id del nodo de la fila r (None si se borró) y `index`
+    el mapa id → fila. Las columnas x, y, supply, demand (nodos) y src,
+    dst, cost, flow (aristas) son vistas de los arreglos internos: se
+    pueden leer y escribir en bloque.
+    """
+
+    def __init__(self):
+        self.ids = []
+        self.index = {}
+        self._x = np.zeros(0)
+        self._y = np.zeros(0)
+        self._supply = np.zeros(0)
+        self._demand = np.zeros(0)
+        self._node_alive = np.zeros(0, dtype=bool)
+        self._src = np.zeros(0, dtype=np.int32)
+        self._dst = np.zeros(0, dtype=np.int32)
+        self._cost = np.zeros(0)
+        self._flow = np.zeros(0)
+        self._edge_alive = np.zeros(0, dtype=bool)
+        self._edge_rows = 0
+        self._edge_count = 0
+        self._pairs = None
+
+    # --------------------------------------------
+    # Columnas
+    # --------------------------------------------
+    @property
+    def x(self):
+        return self._x[:len(self.ids)]
+
+    @property
+    def y(self):
+        return self._y[:len(self.ids)]
+
+    @property
+    def supply(self):
+        return self._supply[:len(self.ids)]
+
+    @property
+    def demand(self):
+        return self._demand[:len(self.ids)]
+
+    @property
+    def src(self):
+        return self._src[:self._edge_rows]
+
+    @property
+    def dst(self):
+        return self._dst[:self._edge_rows]
+
+    @property
+    def cost(self):
+        return self._cost[:self._edge_rows]
+
+    @property
+    def flow(self):
+        return self._flow[:self._edge_rows]
+
+    @property
+    def node_count(self):
+        return len(self.index)
+
+    @property
+    def edge_count(self):
+        return self._edge_count
+
+    @property
+    def nbytes(self):
+        """Bytes de los arreglos de NumPy (sin ids ni índice de pares)."""
+        return sum(a.nbytes for a in (self._x, self._y, self._supply, self._demand,
+                                      self._node_alive, self._src, self._dst, self._cost,
+                                      self._flow, self._edge_alive))
+
+    def node_rows(self):
+        return np.flatnonzero(self._node_alive[:len(self.ids)])
+
+    def supply_rows(self):
+        """Filas de los nodos de oferta, en orden de alta."""
+        return np.flatnonzero(self._node_alive[:len(self.ids)] & (self.supply > 0))
+
+    def demand_rows(self):
+        """Filas de los nodos de demanda, en orden de alta."""
+        return np.flatnonzero(self._node_alive[:len(self.ids)] & (self.demand > 0))
+
+    def edge_rows(self):
+        return np.flatnonzero(self._edge_alive[:self._edge_rows])
+
+    # --------------------------------------------
+    # Altas y bajas de nodos
+    # --------------------------------------------
+    def add_node(self, node_id, x, y, supply=0.0, demand=0.0):
+        return int(self.add_nodes([node_id], [x], [y], [supply], [demand])[0])
+
+    def add_nodes(self, ids, x, y, supply, demand):
+        """Agrega nodos en bloque y devuelve sus filas."""
+        ids = [str(node_id) for node_id in ids]
+        if len(set(ids)) != len(ids) or any(node_id in self.index for node_id in ids):
+            raise ModelError("Los ids de los nodos deben ser únicos")
+        start, stop = len(self.ids), len(self.ids) + len(ids)
+        for name in ("_x", "_y", "_supply", "_demand", "_node_alive"):
+            setattr(self, name, _grown(getattr(self, name), stop))
+        self._x[start:stop] = x
+        self._y[start:stop] = y
+        self._supply[start:stop] = supply
+        self._demand[start:stop] = demand
+        self._node_alive[start:stop] = True
+        self.ids.extend(ids)
+        self.index.update(zip(ids, range(start, stop)))
+        return np.arange(start, stop)
+
+    def remove_node(self, row):
+        """Borra el nodo y sus aristas; devuelve las filas de las aristas borradas."""
+        gone = self.incident(row)
+        self._edge_alive[gone] = False
+        self._edge_count -= gone.size
+        if gone.size:
+            self._pairs = None
+        del self.index[self.ids[row]]
+        self.ids[row] = None
+        self._node_alive[row] = False
+        return gone
+
+    def rename_node(self, row, new_id):
+        """Cambia el id de la fila `row`; las aristas apuntan a la fila, no cambian."""
+        new_id = str(new_id)
+        if new_id in self.index:
+            raise ModelError("Los ids de los nodos deben ser únicos")
+        del self.index[self.ids[row]]
+        self.ids[row] = new_id
+        self.index[new_id] = row
+
+    # --------------------------------------------
+    # Altas y bajas de aristas
+    # --------------------------------------------
+    def add_edge(self, src, dst, cost):
+        return int(self.add_edges([src], [dst], [cost])[0])
+
+    def add_edges(self, src, dst, cost):
+        """Agrega aristas src[k] → dst[k] (filas de nodo) y devuelve sus filas."""
+        src = np.asarray(src, dtype=np.int32).ravel()
+        dst = np.asarray(dst, dtype=np.int32).ravel()
+        start, stop = self._edge_rows, self._edge_rows + src.size
+        for name in ("_src", "_dst", "_cost", "_flow", "_edge_alive"):
+            setattr(self, name, _grown(getattr(self, name), stop))
+        self._src[start:stop] = src
+        self._dst[start:stop] = dst
+        self._cost[start:stop] = cost
+        self._flow[start:stop] = 0.0
+        self._edge_alive[start:stop] = True
+        self._edge_rows = stop
+        self._edge_count += src.size
+        self._pairs = None
+        return np.arange(start, stop)
+
+    def remove_edge(self, row):
+        if self._edge_alive[row]:
+            self._edge_alive[row] = False
+            self._edge_count -= 1
+            self._pairs = None
+
+    # --------------------------------------------
+    # Búsquedas con el índice ordenado
+    # --------------------------------------------
+    def _index(self):
+        """(claves src·2³²+dst ordenadas, sus filas, ídem con dst·2³²+src)."""
+        if self._pairs is None:
+            rows = self.edge_rows().astype(np.int32)
+            src = self._src[rows].astype(np.int64)
+            dst = self._dst[rows].astype(np.int64)
+            pairs = []
+            for key in ((src << 32) | dst, (dst << 32) | src):
+                order = np.argsort(key, kind="stable")
+                pairs += [key[order], rows[order]]
+            self._pairs = tuple(pairs)
+        return self._pairs
+
+    def find_edges(self, src, dst):
+        """Filas de las aristas src[k] → dst[k], -1 donde no existe."""
+        keys, rows = self._index()[:2]
+        want = (np.asarray(src, dtype=np.int64) << 32) | np.asarray(dst, dtype=np.int64)
+        if keys.size == 0:
+            return np.full(want.shape, -1, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(keys, want), keys.size - 1)
+        return np.where(keys[pos] == want, rows[pos], -1).astype(np.int64)
+
+    def find_edge(self, src, dst):
+        """Fila de la arista src → dst o None."""
+        row = int(self.find_edges([src], [dst])[0])
+        return None if row < 0 else row
+
+    def incident(self, row):
+        """Filas de las aristas que salen o entran al nodo `row`."""
+        out_keys, out_rows, in_keys, in_rows = self._index()
+        span = np.array([row, row + 1], dtype=np.int64) << 32
+        a, b = np.searchsorted(out_keys, span)
+        c, d = np.searchsorted(in_keys, span)
+        return np.concatenate([out_rows[a:b], in_rows[c:d]]).astype(np.int64)
+
+    # --------------------------------------------
+    # Modelo
+    # --------------------------------------------
+    def segments(self, rows):
+        """(x0, y0, x1, y1) de las aristas `rows`, una fila por arista."""
+        src, dst = self._src[rows], self._dst[rows]
+        return np.column_stack([self._x[src], self._y[src], self._x[dst], self._y[dst]])
+
+    def _positions(self, supply_rows, demand_rows):
+        """Fila i y columna j del modelo de cada arista viva (-1 si no entra)."""
+        row_of = np.full(len(self.ids), -1, dtype=np.int64)
+        col_of = np.full(len(self.ids), -1, dtype=np.int64)
+        row_of[supply_rows] = np.arange(len(supply_rows))
+        col_of[demand_rows] = np.arange(len(demand_rows))
+        rows = self.edge_rows()
+        i, j = row_of[self._src[rows]], col_of[self._dst[rows]]
+        keep = (i >= 0) & (j >= 0)
+        return rows[keep], i[keep], j[keep]
+
+    def cost_matrix(self, supply_rows, demand_rows):
+        """Matriz de costos m x n entre esos nodos; NaN donde no hay arista."""
+        cost = np.full((len(supply_rows), len(demand_rows)), np.nan)
+        rows, i, j = self._positions(supply_rows, demand_rows)
+        cost[i, j] = self._cost[rows]
+        return cost
+
+    def set_flows(self, supply_rows, demand_rows, flows):
+        """Copia a la columna flow los flujos m x n de una solución (el resto queda en 0)."""
+        self.flow[:] = 0.0
+        rows, i, j = self._positions(supply_rows, demand_rows)
+        self._flow[rows] = np.asarray(flows)[i, j]
+
+    def clear_flows(self):
+        self.flow[:] = 0.0
+
+    def connect_by_geometry(self, metric="euclidean", rate=1.0, fee=0.0, replace=True):
+        """Una arista por par oferta → demanda, con costo según la posición de los nodos.
+
+        El costo es geometry_costs() entre supply_rows() y demand_rows(); un
+        `fee` matricial va en ese orden. Los pares de costo no finito quedan
+        sin arista. Una arista que ya existe toma el costo calculado si
+        replace=True y si no conserva el suyo. Devuelve (nuevas, actualizadas).
+        """
+        supply_rows, demand_rows = self.supply_rows(), self.demand_rows()
+        cost = geometry_costs(self._x[supply_rows], self._y[supply_rows],
+                              self._x[demand_rows], self._y[demand_rows], metric, rate, fee)
+        i, j = np.nonzero(np.isfinite(cost))
+        src, dst, cost = supply_rows[i], demand_rows[j], cost[i, j]
+        keep = src != dst
+        src, dst, cost = src[keep], dst[keep], cost[keep]
+        rows = self.find_edges(src, dst)
+        old = rows >= 0
+        if replace:
+            self._cost[rows[old]] = cost[old]
+        self.add_edges(src[~old], dst[~old], cost[~old])
+        return int(src.size - old.sum()), int(old.sum()) if replace else 0
+
+    # --------------------------------------------
+    # Persistencia
+    # --------------------------------------------
+    # Una sesión es un .npz sin comprimir con una columna por arreglo, sólo
+    # con las filas vivas (las aristas apuntan a la posición compactada de
+    # su nodo): cargarla son lecturas de bloques contiguos, sin recorrer
+    # nodos ni aristas en Python salvo los ids.
+    _COLUMNS = ("x", "y", "supply", "demand", "src", "dst", "cost", "flow")
+
+    @classmethod
+    def from_columns(cls, ids, x, y, supply, demand, src, dst, cost, flow=None):
+        """Red armada directamente desde columnas (src y dst son posiciones en `ids`)."""
+        net = cls()
+        rows = net.add_nodes(ids, x, y, supply, demand)
+        src = np.asarray(src, dtype=np.int64).ravel()
+        dst = np.asarray(dst, dtype=np.int64).ravel()
+        if src.size != dst.size or np.size(cost) != src.size:
+            raise ModelError("src, dst y cost deben tener el mismo largo")
+        if src.size and (min(src.min(), dst.min()) < 0 or max(src.max(), dst.max()) >= rows.size):
+            raise ModelError("Hay aristas que apuntan a nodos inexistentes")
+        edges = net.add_edges(src, dst, cost)
+        if flow is not None:
+            net._flow[edges] = flow
+        return net
+
+    def compacted(self):
+        """Columnas de las filas vivas: (ids, {nombre: arreglo}) con src y dst renumerados."""
+        nodes, edges = self.node_rows(), self.edge_rows()
+        position = np.full(len(self.ids), -1, dtype=np.int32)
+        position[nodes] = np.arange(nodes.size, dtype=np.int32)
+        columns = {name: getattr(self, name)[nodes] for name in ("x", "y", "supply", "demand")}
+        columns.update(src=position[self._src[edges]], dst=position[self._dst[edges]],
+                       cost=self._cost[edges], flow=self._flow[edges])
+        return [self.ids[r] for r in nodes.tolist()], columns
+
+    def save(self, f, **extra):
+        """Guarda la red en `f` (ruta o archivo) como sesión .npz.
+
+        `extra` son arreglos adicionales que se guardan con la red (p. ej.
+        la vista del canvas) y que load() devuelve aparte.
+        """
+        ids, columns = self.compacted()
+        reserved = set(columns) | {"ids", "format"}
+        if reserved & set(extra):
+            raise ModelError(f"Nombres reservados en la sesión: {', '.join(sorted(reserved & set(extra)))}")
+        np.savez(f, format=np.array(SESSION_FORMAT), ids=np.array(ids, dtype=str), **columns, **extra)
+
+    @classmethod
+    def load(cls, f):
+        """Lee una sesión de save(); devuelve (red, dict con los arreglos extra)."""
+        try:
+            with np.load(f, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+        except (ValueError, zipfile.BadZipFile) as e:
+            raise ModelError(f"El archivo no es una sesión .npz legible: {e}") from e
+        if "format" not in arrays or str(arrays["format"]) != SESSION_FORMAT:
+            raise ModelError("El archivo no es una sesión guardada por esta versión")
+        missing = [name for name in ("ids",) + cls._COLUMNS if name not in arrays]
+        if missing:
+            raise ModelError(f"Faltan los arreglos {', '.join(missing)} en la sesión")
+        net = cls.from_columns(arrays.pop("ids").tolist(),
+                               *(arrays.pop(name) for name in cls._COLUMNS))
+        arrays.pop("format")
+        return net, arrays
+
+    def to_dict(self):
+        """La red como dict JSON: el formato de instancia ("nodes"/"edges") con posición y flujo."""
+        ids, columns = self.compacted()
+        nodes = [{"id": node_id, "x": x, "y": y, "supply": s, "demand": d}
+                 for node_id, x, y, s, d in zip(ids, *(columns[k].tolist()
+                                                       for k in ("x", "y", "supply", "demand")))]
+        edges = [{"from": ids[a], "to": ids[b], "cost": c, "flow": q}
+                 for a, b, c, q in zip(*(columns[k].tolist() for k in ("src", "dst", "cost", "flow")))]
+        return {"nodes": nodes, "edges": edges}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Red desde el dict de to_dict() (sin "x"/"y" los nodos quedan en el origen)."""
+        try:
+            nodes, edges = data["nodes"], data.get("edges", [])
+            ids = [str(node["id"]) for node in nodes]
+            columns = [[float(node.get(k, 0)) for node in nodes] for k in ("x", "y", "supply", "demand")]
+            position = {node_id: k for k, node_id in enumerate(ids)}
+            src = [position[str(e["from"])] for e in edges]
+            dst = [position[str(e["to"])] for e in edges]
+            cost = [float(e["cost"]) for e in edges]
+            flow = [float(e.get("flow", 0)) for e in edges]
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            raise ModelError(f"Red JSON inválida: {e!r}") from e
+        return cls.from_columns(ids, *columns, src, dst, cost, flow)
+
+
+# --------------------------------------------
+# Vistas de una fila
+# --------------------------------------------
+# Objetos livianos (con __slots__) que leen y escriben las columnas de la
+# red; también aceptan el acceso por clave de los dicts que usaba la GUI
+# (node["x"], edge["from"]), así el código que dibuja no cambia. Una
+# subclase puede agregar slots para sus propios datos (p. ej. los ítems
+# del canvas).
+
+class _RowView:
+    __slots__ = ("net", "row")
+    _KEYS = {}  # clave de dict → atributo
+
+    def __init__(self, net, row):
+        self.net = net
+        self.row = int(row)
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, self._KEYS.get(key, key))
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        setattr(self, self._KEYS.get(key, key), value)
+
+    def get(self, key, default=None):
+        return getattr(self, self._KEYS.get(key, key), default)
+
+    def __eq__(self, other):
+        return type(other) is type(self) and other.net is self.net and other.row == self.row
+
+    def __hash__(self):
+        return hash((id(self.net), self.row))
+
+
+def _column(name):
+    """Propiedad que lee y escribe net.<name>[row] como float."""
+    def fget(self):
+        return float(getattr(self.net, name)[self.row])
+
+    def fset(self, value):
+        getattr(self.net, name)[self.row] = value
+    return property(fget, fset)
+
+
+class NodeView(_RowView):
+    """Un nodo de la red: id, x, y, supply, demand."""
+    __slots__ = ()
+
+    x = _column("x")
+    y = _column("y")
+    supply = _column("supply")
+    demand = _column("demand")
+
+    @property
+    def id(self):
+        return self.net.ids[self.row]
+
+    @id.setter
+    def id(self, value):
+        self.net.rename_node(self.row, value)
+
+
+class EdgeView(_RowView):
+    """Una arista de la red: source y target (ids), cost y flow."""
+    __slots__ = ()
+    _KEYS = {"from": "source", "to": "target"}
+
+    cost = _column("cost")
+    flow = _column("flow")
+
+    @property
+    def source(self):
+        return self.net.ids[self.net.src[self.row]]
+
+    @property
+    def target(self):
+        return self.net.ids[self.net.dst[self.row]]
@@ -0,0 +1,155 @@
+import numpy as np
+
+# --------------------------------------------
+# Reporte de formulación y solución, generado bajo demanda
+# --------------------------------------------
+# Cada sección se arma línea por línea con acceso directo (line(k)): la
+# vista muestra una página a la vez y el texto completo sólo se produce
+# al exportar. Una línea de la función objetivo corresponde a una fila
+# de la matriz de costos, así ninguna línea crece con m·n. Las celdas sin
+# arista (costo NaN o +inf) no son variables y no aparecen.
+
+SECTIONS = ("Resumen", "Función Objetivo", "Restricciones", "Solución")
+
+
+class Report:
+    """Reporte de un problema de transporte o asignación y su solución.
+
+    `mode` es "transport" o "assignment"; `notes` son avisos que se agregan
+    al resumen (nodos ficticios, arranque en caliente, etc.).
+    """
+
+    def __init__(self, supply_ids, demand_ids, supply, demand, cost, solution,
+                 mode="transport", notes=()):
+        self.supply_ids = supply_ids
+        self.demand_ids = demand_ids
+        self.supply = supply
+        self.demand = demand
+        self.cost = cost
+        self.solution = solution
+        self.mode = mode
+        self.notes = [note.strip() for note in notes if note and note.strip()]
+        self.m, self.n = len(supply_ids), len(demand_ids)
+        self.lanes = np.isfinite(cost)
+        self._flow_cells = None
+
+    # --------------------------------------------
+    # Acceso por sección
+    # --------------------------------------------
+    def section_length(self, section):
+        m, n = self.m, self.n
+        if section == "Resumen":
+            return len(self._summary())
+        if section == "Función Objetivo":
+            return 1 + m
+        if section == "Restricciones":
+            return 1 + m + 2 + n + 2
+        if section == "Solución":
+            return 1 + len(self._flows()) + 1
+        raise KeyError(section)
+
+    def line(self, section, k):
+        if section == "Resumen":
+            return self._summary()[k]
+        if section == "Función Objetivo":
+            return self._objective_line(k)
+        if section == "Restricciones":
+            return self._constraint_line(k)
+        if section == "Solución":
+            return self._solution_line(k)
+        raise KeyError(section)
+
+    def lines(self, section, start=0, stop=None):
+        """Líneas [start, stop) de una sección (una página de la vista)."""
+        total = self.section_length(section)
+        stop = total if stop is None else min(stop, total)
+        return [self.line(section, k) for k in range(max(start, 0), stop)]
+
+    def write(self, f):
+        """Escribe el reporte completo en el archivo de texto f."""
+        for section in SECTIONS:
+            f.write(f"== {section} ==\n")
+            for k in range(self.section_length(section)):
+                f.write(self.line(section, k) + "\n")
+            f.write("\n")
+
+    # --------------------------------------------
+    # Secciones
+    # --------------------------------------------
+    def _summary(self):
+        sol = self.solution
+        kind = "Asignación" if self.mode == "assignment" else "Transporte"
+        rows = "Agentes" if self.mode == "assignment" else "Plantas"
+        cols = "Tareas" if self.mode == "assignment" else "Compradores"
+        lines = [f"Problema de {kind}: {self.m} {rows.lower()} × {self.n} {cols.lower()} "
+                 f"({int(self.lanes.sum())} variables)",
+                 f"Estado: {sol.status}"]
+        if sol.success:
+            lines.append(f"Costo Total: {sol.objective}")
+        elif sol.message:
+            lines.append(f"Mensaje: {sol.message}")
+        return lines + self.notes
+
+    def _var(self, i, j):
+        return f"x_{i + 1}{j + 1}"
+
+    def _sum(self, cells):
+        terms = " + ".join(self._var(i, j) for i, j in cells)
+        return terms or "0 (sin aristas)"
+
+    def _objective_line(self, k):
+        if k == 0:
+            return f"Min Z = (una línea por {'agente' if self.mode == 'assignment' else 'planta'})"
+        i = k - 1
+        terms = " + ".join(f"{self.cost[i, j]}*{self._var(i, j)}"
+                           for j in np.flatnonzero(self.lanes[i]))
+        return ("    " if i == 0 else "  + ") + (terms or "0")
+
+    def _constraint_line(self, k):
+        m, n = self.m, self.n
+        assignment = self.mode == "assignment"
+        if k == 0:
+            return "Restricciones Agentes (=1):" if assignment else "Restricciones Oferta (≤):"
+        if k <= m:
+            i = k - 1
+            terms = self._sum((i, j) for j in np.flatnonzero(self.lanes[i]))
+            if assignment:
+                return f"{terms} = 1 (Agente {self.supply_ids[i][:4]})"
+            return f"{terms} ≤ {self.supply[i]} (Planta {self.supply_ids[i][:4]})"
+        k -= m + 1
+        if k == 0:
+            return ""
+        if k == 1:
+            return "Restricciones Tareas (=1):" if assignment else "Restricciones Demanda (=):"
+        if k < n + 2:
+            j = k - 2
+            terms = self._sum((i, j) for i in np.flatnonzero(self.lanes[:, j]))
+            if assignment:
+                return f"{terms} = 1 (Tarea {self.demand_ids[j][:4]})"
+            return f"{terms} = {self.demand[j]} (Comprador {self.demand_ids[j][:4]})"
+        if k == n + 2:
+            return ""
+        return "Variables binarias x_ij ∈ {0, 1}" if assignment else "Variables x_{ij} ≥ 0"
+
+    def _flows(self):
+        if self._flow_cells is None:
+            if self.solution.success:
+                rows, cols = np.nonzero(self.solution.flows > 0)
+                self._flow_cells = list(zip(rows.tolist(), cols.tolist()))
+            else:
+                self._flow_cells = []
+        return self._flow_cells
+
+    def _solution_line(self, k):
+        sol = self.solution
+        cells = self._flows()
+        if k == 0:
+            return "Solución Óptima:" if sol.success else "Sin solución óptima."
+        if k <= len(cells):
+            i, j = cells[k - 1]
+            s_id, d_id = self.supply_ids[i][:4], self.demand_ids[j][:4]
+            if self.mode == "assignment":
+                return f"{s_id} → {d_id}: costo {self.cost[i, j]}"
+            qty = sol.flows[i, j]
+            return f"{s_id} → {d_id}: {qty} unidades, costo {self.cost[i, j] * qty}"
+        return f"Costo Total: {sol.objective}" if sol.success else f"Estado: {sol.status}"
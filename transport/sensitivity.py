@@ -0,0 +1,160 @@
+import numpy as np
+
+from .simplex import TransportSimplex
+from .solution import ModelError
+
+
+# --------------------------------------------
+# Análisis de sensibilidad del problema de transporte
+# --------------------------------------------
+# Todo se obtiene de la base óptima (árbol de celdas básicas): los precios
+# sombra son los potenciales u-v, los costos reducidos c_ij - u_i - v_j, y
+# los rangos salen de cortar el árbol por la celda (costos) o de empujar
+# flujo por el camino hasta la columna de holgura (oferta/demanda).
+
+class Sensitivity:
+    """Precios sombra, costos reducidos y rangos de validez de la base óptima.
+
+    Dentro de un rango la base no cambia, así que el efecto sobre el costo
+    total es lineal y se calcula sin volver a resolver (ver *_change).
+    """
+
+    def __init__(self, supply, demand, cost, flows, supply_duals, demand_duals,
+                 reduced_costs, cost_lower, cost_upper, supply_lower, supply_upper,
+                 demand_lower, demand_upper):
+        self.supply = supply
+        self.demand = demand
+        self.cost = cost
+        self.flows = flows
+        self.supply_duals = supply_duals
+        self.demand_duals = demand_duals
+        self.reduced_costs = reduced_costs
+        self.cost_lower = cost_lower
+        self.cost_upper = cost_upper
+        self.supply_lower = supply_lower
+        self.supply_upper = supply_upper
+        self.demand_lower = demand_lower
+        self.demand_upper = demand_upper
+
+    def cost_change(self, i, j, new_cost):
+        """Variación del costo total si c_ij pasa a new_cost, o None fuera de rango."""
+        if not self.cost_lower[i, j] <= new_cost <= self.cost_upper[i, j]:
+            return None
+        return float(self.flows[i, j] * (new_cost - self.cost[i, j]))
+
+    def supply_change(self, i, new_supply):
+        """Variación del costo total si la oferta i pasa a new_supply, o None."""
+        if not self.supply_lower[i] <= new_supply <= self.supply_upper[i]:
+            return None
+        return float(self.supply_duals[i] * (new_supply - self.supply[i]))
+
+    def demand_change(self, j, new_demand):
+        """Variación del costo total si la demanda j pasa a new_demand, o None."""
+        if not self.demand_lower[j] <= new_demand <= self.demand_upper[j]:
+            return None
+        return float(self.demand_duals[j] * (new_demand - self.demand[j]))
+
+
+def analyze(supply, demand, cost, solution=None, engine=None):
+    """Sensibilidad de la solución óptima de transporte.
+
+    Se reutiliza la base de `engine` (un TransportSimplex ya resuelto) o se
+    reconstruye desde `solution` (p. ej. la de HiGHS) por crossover; sólo
+    si no hay ninguna de las dos se resuelve el modelo.
+    """
+    if engine is None:
+        engine = TransportSimplex(supply, demand, cost)
+        result = None
+        if solution is not None:
+            if not solution.success:
+                raise ModelError("La sensibilidad requiere una solución óptima")
+            result = engine.crossover(solution.flows, solution.supply_duals,
+                                      solution.demand_duals)
+        if result is None:
+            result = engine.solve()
+        if not result.success:
+            raise ModelError("La sensibilidad requiere una solución óptima")
+    return from_engine(engine)
+
+
+def from_engine(engine):
+    """Sensibilidad a partir de un TransportSimplex en su base óptima."""
+    m, n, N = engine.m, engine.n, engine.N
+    engine._potentials()
+    reduced = engine.cost - engine.u[:, None] - engine.v[None, :]
+    # Las rutas inexistentes no pueden entrar a la base: no limitan rangos
+    reduced[engine.missing] = np.inf
+    supply_duals, demand_duals = engine.duals()
+    cost = engine.cost[:, :n].copy()
+
+    # Celdas no básicas: el costo puede bajar hasta anular su costo reducido
+    cost_lower = cost - reduced[:, :n]
+    cost_upper = np.full((m, n), np.inf)
+
+    # Celdas básicas: al cambiar c_ij en δ cambian los potenciales del
+    # subárbol que cuelga de la celda; los costos reducidos de las celdas
+    # que cruzan el corte suben o bajan δ y deben seguir ≥ 0.
+    for s, (i, j) in enumerate(zip(engine._rows, engine._cols)):
+        child = i if engine._parent[i] == s else m + j
+        sub_rows, sub_cols = engine._subtree(child)
+        in_rows = np.zeros(m, dtype=bool)
+        in_rows[sub_rows] = True
+        in_cols = np.zeros(N, dtype=bool)
+        in_cols[sub_cols] = True
+        # La propia celda cruza el corte; se excluye mientras se miden los lados
+        reduced[i, j] = np.inf
+        row_side = reduced[in_rows][:, ~in_cols]
+        col_side = reduced[~in_rows][:, in_cols]
+        row_min = row_side.min() if row_side.size else np.inf
+        col_min = col_side.min() if col_side.size else np.inf
+        if child == m + j:
+            up, down = col_min, row_min
+        else:
+            up, down = row_min, col_min
+        if j < n:
+            cost_lower[i, j] = cost[i, j] - down
+            cost_upper[i, j] = cost[i, j] + up
+        reduced[i, j] = 0.0
+
+    # Oferta/demanda: el cambio se compensa con la columna de holgura y
+    # recorre el camino del árbol hasta ella alternando +δ y -δ. Una ruta
+    # inexistente básica (con flujo 0) no puede recibir flujo: si está del
+    # lado que sube, ese sentido tiene margen 0.
+    flows = engine._flows
+    excess = engine.demand[n]
+
+    def limit(falling, rising):
+        if any(engine.missing[engine._rows[s], engine._cols[s]] for s in rising):
+            return 0.0
+        return min((flows[s] for s in falling), default=np.inf)
+
+    def path_limits(node):
+        up_a, up_b = engine._climb(node, m + n)
+        path = up_a + up_b[::-1]
+        plus, minus = path[0::2], path[1::2]
+        return limit(minus, plus), limit(plus, minus)
+
+    supply_lower = np.empty(m)
+    supply_upper = np.empty(m)
+    for i in range(m):
+        up, down = path_limits(i)
+        supply_upper[i] = engine.supply[i] + up
+        supply_lower[i] = engine.supply[i] - min(down, excess)
+
+    demand_lower = np.empty(n)
+    demand_upper = np.empty(n)
+    for j in range(n):
+        up, down = path_limits(m + j)
+        demand_upper[j] = engine.demand[j] + min(up, excess)
+        demand_lower[j] = engine.demand[j] - down
+
+    missing = engine.missing[:, :n]
+    for matrix in (cost, cost_lower, cost_upper):
+        matrix[missing] = np.nan
+    reduced_costs = reduced[:, :n]
+    reduced_costs[missing] = np.nan
+    return Sensitivity(
+        engine.supply.copy(), engine.demand[:n].copy(), cost, engine.flows(),
+        supply_duals, demand_duals, reduced_costs, cost_lower, cost_upper,
+        supply_lower, supply_upper, demand_lower, demand_upper,
+    )
@@ -0,0 +1,649 @@
+import time
+
+import numpy as np
+
+from .model import missing_lanes, unreachable_demands
+from .solution import (
+    CANCELLED,
+    INFEASIBLE,
+    ITERATION_LIMIT,
+    OPTIMAL,
+    TIME_LIMIT,
+    ModelError,
+    Solution,
+)
+
+_STOP_MESSAGES = {
+    CANCELLED: "Resolución cancelada",
+    TIME_LIMIT: "Se alcanzó el tiempo límite",
+}
+
+
+# --------------------------------------------
+# Simplex de transporte (Vogel + MODI)
+# --------------------------------------------
+# El problema se balancea con una columna de holgura de costo 0 que
+# recibe el exceso de oferta (restricciones de oferta ≤). La base es un
+# árbol generador del grafo bipartito filas/columnas con m + n aristas
+# (celdas básicas); los nodos 0..m-1 son filas y m..m+n son columnas.
+
+class TransportSimplex:
+    """Simplex de transporte sobre la matriz de costos m x n.
+
+    Inicio con la aproximación de Vogel, precios con potenciales u-v
+    (MODI) y pivotes por el ciclo de la piedra que rueda (stepping-stone).
+    La base ocupa O(m + n) memoria; sólo el precio usa la matriz completa.
+
+    Las celdas de costo NaN o +inf (rutas inexistentes) llevan un costo de
+    penalización mayor que cualquier diferencia de potenciales de una base
+    sin ellas; si el óptimo aún les asigna flujo, el modelo es infactible.
+    """
+
+    # Número de bloques de filas para el precio parcial
+    PRICING_BLOCKS = 8
+    # Cada cuántos pasos se revisan el tiempo límite y la cancelación
+    CHECK_EVERY = 32
+
+    def __init__(self, supply, demand, cost, tol=1e-9):
+        self.supply = np.asarray(supply, dtype=float)
+        demand = np.asarray(demand, dtype=float)
+        self.m, self.n = self.supply.size, demand.size
+        self.N = self.n + 1  # columnas incluyendo la holgura
+        self.tol = tol
+
+        self.excess = float(self.supply.sum() - demand.sum())
+        self.demand = np.append(demand, max(self.excess, 0.0))
+        self.cost = np.zeros((self.m, self.N))
+        self.missing = np.zeros((self.m, self.N), dtype=bool)
+        self._set_cost(cost)
+
+        self.iterations = 0
+        # Interrupciones: instante límite (time.monotonic) y evento de
+        # cancelación (threading.Event u otro objeto con is_set())
+        self.deadline = None
+        self.cancel = None
+        # Cómo arrancó la última resolución: "vogel", "primal" o "dual"
+        self.start = None
+        self.u = None
+        self.v = None
+        self._parent = None
+        self._depth = None
+        # Celdas básicas (listas de Python: se recorren escalar por escalar)
+        self._rows = []
+        self._cols = []
+        self._flows = []
+        self._costs = []
+        self._adj = []
+
+    # --------------------------------------------
+    # Resolución completa
+    # --------------------------------------------
+    def solve(self, max_iter=None, time_limit=None, cancel=None):
+        started, before = time.perf_counter(), self.iterations
+        self._arm(time_limit, cancel)
+        blocked = self._precheck()
+        if blocked is not None:
+            return self._stamped(blocked, started, before)
+        return self._stamped(self._vogel_optimize(max_iter), started, before)
+
+    def _stamped(self, solution, started, before):
+        """Agrega a solution.stats los pivotes y el tiempo de esta resolución."""
+        solution.stats.update(solver="transport-simplex", start=self.start,
+                              iterations=self.iterations - before,
+                              solver_seconds=time.perf_counter() - started)
+        return solution
+
+    def _vogel_optimize(self, max_iter):
+        self.start = "vogel"
+        if not self._vogel():
+            halt = self._interrupted()
+            return Solution(halt, message=_STOP_MESSAGES[halt])
+        return self.optimize(max_iter)
+
+    def _short(self):
+        return self.excess < -self.tol * max(1.0, float(self.supply.sum()))
+
+    def _precheck(self):
+        """Solution INFEASIBLE evidente (oferta corta o demanda sin aristas), o None."""
+        if self._short():
+            return Solution(INFEASIBLE, message="La oferta total es menor que la demanda total.")
+        if self.missing.any():
+            unreachable = unreachable_demands(self.missing[:, :self.n], self.demand[:self.n])
+            if unreachable.size:
+                return Solution(INFEASIBLE, unreachable=unreachable,
+                                message=f"{unreachable.size} demanda(s) sin aristas entrantes")
+        return None
+
+    def _set_cost(self, cost):
+        cost = np.asarray(cost, dtype=float)
+        missing = missing_lanes(cost)
+        self.missing[:, :self.n] = missing
+        if missing.any():
+            # Las potenciales de una base sin celdas penalizadas están acotadas
+            # por (m + N) · max|c|; la penalización supera el doble de eso.
+            finite = cost[~missing]
+            top = float(np.abs(finite).max()) if finite.size else 0.0
+            penalty = 2.0 * (self.m + self.N) * max(top, 1.0) + 1.0
+            cost = np.where(missing, penalty, cost)
+        self.cost[:, :self.n] = cost
+
+    def _arm(self, time_limit, cancel):
+        self.deadline = None if time_limit is None else time.monotonic() + time_limit
+        self.cancel = cancel
+
+    def _interrupted(self):
+        """CANCELLED o TIME_LIMIT si hay que detenerse, si no None."""
+        if self.cancel is not None and self.cancel.is_set():
+            return CANCELLED
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return TIME_LIMIT
+        return None
+
+    # --------------------------------------------
+    # Re-resolución desde la última base (arranque en caliente)
+    # --------------------------------------------
+    def resolve(self, supply=None, demand=None, cost=None, max_iter=None,
+                time_limit=None, cancel=None):
+        """Re-optimiza tras cambiar costos y/o oferta/demanda, conservando la base.
+
+        Un cambio de costos mantiene la base factible: se re-precian las celdas
+        y se sigue con MODI (primal). Un cambio de oferta/demanda mantiene los
+        costos reducidos ≥ 0: se recalculan los flujos básicos y se usa el
+        simplex dual. Si ambas factibilidades se pierden, se arranca con Vogel.
+        """
+        if not self._rows:
+            self._update_data(supply, demand, cost)
+            return self.solve(max_iter, time_limit, cancel)
+        started, before = time.perf_counter(), self.iterations
+        self._arm(time_limit, cancel)
+        self._update_data(supply, demand, cost)
+        blocked = self._precheck()
+        if blocked is not None:
+            return self._stamped(blocked, started, before)
+        return self._stamped(self._warm_optimize(max_iter), started, before)
+
+    def _warm_optimize(self, max_iter):
+        self._tree_flows()
+        flow_tol = self.tol * max(1.0, float(self.supply.sum()))
+        if min(self._flows) >= -flow_tol:
+            self.start = "primal"
+            self._flows = [max(f, 0.0) for f in self._flows]
+            return self.optimize(max_iter)
+
+        self._potentials()
+        cost_tol = self.tol * max(1.0, float(np.abs(self.cost).max()))
+        reduced = self.cost - self.u[:, None] - self.v[None, :]
+        if reduced.min() >= -cost_tol:
+            self.start = "dual"
+            return self.dual_optimize(max_iter)
+
+        return self._vogel_optimize(max_iter)
+
+    # --------------------------------------------
+    # Base a partir de una solución externa (p. ej. HiGHS)
+    # --------------------------------------------
+    def crossover(self, flows, supply_duals=None, demand_duals=None):
+        """Reconstruye una base árbol desde los flujos de un vértice óptimo.
+
+        Las celdas con flujo positivo forman un bosque que se completa con
+        celdas de flujo 0 (preferentemente de costo reducido 0 según los
+        duales dados). Devuelve la Solution tras verificar optimalidad con
+        MODI, o None si los flujos no forman un vértice.
+        """
+        self._arm(None, None)
+        m, n, N = self.m, self.n, self.N
+        full = np.zeros((m, N))
+        full[:, :n] = flows
+        full[:, n] = np.maximum(self.supply - full[:, :n].sum(axis=1), 0.0)
+        flow_tol = self.tol * max(1.0, float(self.supply.sum()))
+
+        root = list(range(m + N))
+
+        def find(x):
+            while root[x] != x:
+                root[x] = root[root[x]]
+                x = root[x]
+            return x
+
+        rows, cols, values = [], [], []
+
+        def link(i, j, value):
+            a, b = find(i), find(m + j)
+            if a == b:
+                return False
+            root[a] = b
+            rows.append(i); cols.append(j); values.append(value)
+            return True
+
+        for i, j in zip(*np.nonzero(full > flow_tol)):
+            if not link(int(i), int(j), float(full[i, j])):
+                return None
+        if supply_duals is not None and demand_duals is not None:
+            v = np.append(np.asarray(demand_duals, dtype=float), 0.0)
+            order = np.argsort(np.abs(self.cost - np.asarray(supply_duals)[:, None] - v), axis=None)
+        else:
+            order = np.argsort(self.cost, axis=None)
+        for k in order:
+            if len(rows) == m + N - 1:
+                break
+            i, j = divmod(int(k), N)
+            if full[i, j] <= flow_tol:
+                link(i, j, 0.0)
+
+        self.start = "crossover"
+        self._set_basis(rows, cols, values)
+        return self.optimize()
+
+    def _update_data(self, supply, demand, cost):
+        if supply is not None:
+            supply = np.asarray(supply, dtype=float)
+            if supply.shape != self.supply.shape:
+                raise ModelError("La re-resolución no admite cambiar el número de ofertas")
+            self.supply = supply.copy()
+        if demand is not None:
+            demand = np.asarray(demand, dtype=float)
+            if demand.shape != (self.n,):
+                raise ModelError("La re-resolución no admite cambiar el número de demandas")
+            self.demand[:self.n] = demand
+        self.excess = float(self.supply.sum() - self.demand[:self.n].sum())
+        self.demand[self.n] = max(self.excess, 0.0)
+        if cost is not None:
+            cost = np.asarray(cost, dtype=float)
+            if cost.shape != (self.m, self.n):
+                raise ModelError("La re-resolución no admite cambiar la forma de los costos")
+            self._set_cost(cost)
+            self._costs = [float(self.cost[i, j]) for i, j in zip(self._rows, self._cols)]
+
+    def _tree_flows(self):
+        """Flujos básicos que satisfacen oferta y demanda actuales (pueden ser < 0)."""
+        self._potentials()
+        m = self.m
+        residual = list(self.supply) + list(self.demand)
+        parent = self._parent
+        # De las hojas hacia la raíz: el flujo de la celda padre cierra el balance
+        for node in sorted(range(1, m + self.N), key=self._depth.__getitem__, reverse=True):
+            s = parent[node]
+            flow = residual[node]
+            self._flows[s] = flow
+            residual[self._other(node, s)] -= flow
+
+    def dual_optimize(self, max_iter=None):
+        """Simplex dual desde una base con costos reducidos ≥ 0."""
+        if max_iter is None:
+            max_iter = self.iterations + 50 * (self.m + self.N) + 1000
+        m = self.m
+        flow_tol = self.tol * max(1.0, float(self.supply.sum()))
+        self._potentials()
+        steps = 0
+        while self.iterations < max_iter:
+            steps += 1
+            if steps % self.CHECK_EVERY == 0:
+                halt = self._interrupted()
+                if halt:
+                    # Los flujos del simplex dual aún no son factibles
+                    return Solution(halt, message=_STOP_MESSAGES[halt])
+            leave = min(range(len(self._flows)), key=self._flows.__getitem__)
+            if self._flows[leave] >= -flow_tol:
+                self._flows = [max(f, 0.0) for f in self._flows]
+                # Con factibilidad primal recuperada, MODI confirma el óptimo
+                return self.optimize(max_iter)
+
+            # Al quitar la celda saliente (i, j) el árbol se parte en A (con la
+            # fila i) y B (con la columna j). Entra la celda de menor costo
+            # reducido con fila en B y columna en A.
+            i, j = self._rows[leave], self._cols[leave]
+            child = i if self._parent[i] == leave else m + j
+            sub_rows, sub_cols = self._subtree(child)
+            in_sub_rows = np.zeros(m, dtype=bool)
+            in_sub_rows[sub_rows] = True
+            in_sub_cols = np.zeros(self.N, dtype=bool)
+            in_sub_cols[sub_cols] = True
+            if child == i:
+                rows_b, cols_a = ~in_sub_rows, in_sub_cols
+            else:
+                rows_b, cols_a = in_sub_rows, ~in_sub_cols
+            rb = np.flatnonzero(rows_b)
+            ca = np.flatnonzero(cols_a)
+            if rb.size == 0 or ca.size == 0:
+                return Solution(INFEASIBLE, message="No existe un flujo que cumpla la demanda.")
+            reduced = self.cost[np.ix_(rb, ca)] - self.u[rb, None] - self.v[None, ca]
+            k = int(reduced.argmin())
+            p, q = int(rb[k // ca.size]), int(ca[k % ca.size])
+            value = max(float(reduced.flat[k]), 0.0)
+
+            up_q, up_p = self._climb(m + q, p)
+            path = up_q + up_p[::-1]
+            theta = -self._flows[leave]
+            for s in path[0::2]:
+                self._flows[s] -= theta
+            for s in path[1::2]:
+                self._flows[s] += theta
+            self._swap(leave, p, q, theta, up_q, value)
+            self.iterations += 1
+        return self._solution(ITERATION_LIMIT, "Se alcanzó el límite de iteraciones")
+
+    def _subtree(self, root):
+        """Filas y columnas del subárbol que cuelga de `root`."""
+        m = self.m
+        parent, adj = self._parent, self._adj
+        sub_rows, sub_cols = [], []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node < m:
+                sub_rows.append(node)
+            else:
+                sub_cols.append(node - m)
+            for s in adj[node]:
+                if s != parent[node]:
+                    stack.append(self._other(node, s))
+        return sub_rows, sub_cols
+
+    def optimize(self, max_iter=None):
+        """Itera MODI desde la base actual hasta optimalidad."""
+        if max_iter is None:
+            max_iter = self.iterations + 50 * (self.m + self.N) + 1000
+        cost_tol = self.tol * max(1.0, float(np.abs(self.cost).max()))
+
+        # Precio parcial: se examina un bloque de filas por iteración y se
+        # avanza circularmente; sólo un recorrido completo sin celdas de costo
+        # reducido negativo declara la optimalidad.
+        block = max(1, -(-self.m // self.PRICING_BLOCKS))
+        start = 0
+        clean = 0
+        self._potentials()
+        steps = 0
+        while self.iterations < max_iter:
+            steps += 1
+            if steps % self.CHECK_EVERY == 0:
+                halt = self._interrupted()
+                if halt:
+                    # La base es factible: se entrega la mejor hasta ahora
+                    return self._solution(halt, _STOP_MESSAGES[halt])
+            stop = min(start + block, self.m)
+            reduced = self.cost[start:stop] - self.u[start:stop, None] - self.v[None, :]
+            k = int(reduced.argmin())
+            value = float(reduced.flat[k])
+            if value < -cost_tol:
+                p, q = divmod(k, self.N)
+                self._pivot(start + p, q, value)
+                self.iterations += 1
+                clean = 0
+            else:
+                clean += stop - start
+                if clean >= self.m:
+                    # Los potenciales se actualizan por diferencias; se
+                    # recalculan desde cero antes de declarar optimalidad.
+                    self._potentials()
+                    reduced = self.cost - self.u[:, None] - self.v[None, :]
+                    if reduced.min() >= -cost_tol:
+                        return self._solution(OPTIMAL, "Solución óptima (simplex de transporte)")
+                    clean = 0
+            start = stop % self.m
+        return self._solution(ITERATION_LIMIT, "Se alcanzó el límite de iteraciones")
+
+    def flows(self):
+        """Matriz de flujos m x n (sin la columna de holgura)."""
+        flows = np.zeros((self.m, self.N))
+        flows[self._rows, self._cols] = self._flows
+        return flows[:, :self.n]
+
+    def duals(self):
+        """Precios sombra (oferta, demanda) a partir de los potenciales u-v.
+
+        Se desplazan para que la columna de holgura tenga potencial 0, que es
+        la convención de los multiplicadores de linprog/HiGHS.
+        """
+        slack = self.v[self.n]
+        return self.u + slack, self.v[:self.n] - slack
+
+    def _solution(self, status, message):
+        flows = self.flows()
+        if self.missing.any():
+            flow_tol = self.tol * max(1.0, float(self.supply.sum()))
+            if (flows[self.missing[:, :self.n]] > flow_tol).any():
+                # Flujo por rutas inexistentes: el óptimo penalizado no es factible
+                if status == OPTIMAL:
+                    status = INFEASIBLE
+                    message = "No existe un flujo que cumpla la demanda con las aristas existentes."
+                return Solution(status, message=message)
+            flows[self.missing[:, :self.n]] = 0.0
+        objective = float((flows * self.cost[:, :self.n]).sum())
+        supply_duals, demand_duals = self.duals() if status == OPTIMAL else (None, None)
+        return Solution(status, flows=flows, objective=objective, message=message,
+                        supply_duals=supply_duals, demand_duals=demand_duals)
+
+    # --------------------------------------------
+    # Solución inicial: aproximación de Vogel
+    # --------------------------------------------
+    def _vogel(self):
+        """Arma la base inicial; devuelve False si se interrumpe antes."""
+        m, N = self.m, self.N
+        C = self.cost.copy()
+        CT = C.T.copy()
+        rem_s = self.supply.copy()
+        rem_d = self.demand.copy()
+        row_active = np.ones(m, dtype=bool)
+        col_active = np.ones(N, dtype=bool)
+        n_rows, n_cols = m, N
+
+        # Penalización = diferencia entre los dos costos menores de la línea
+        row_pen = np.empty(m)
+        row_min = np.empty((m, 2), dtype=int)
+        col_pen = np.empty(N)
+        col_min = np.empty((N, 2), dtype=int)
+
+        def penalties(matrix, lines, pen, argmin):
+            sub = matrix[lines]
+            if sub.shape[1] == 1:
+                argmin[lines, 0] = 0
+                argmin[lines, 1] = -1
+                pen[lines] = sub[:, 0]
+                return
+            two = np.argpartition(sub, 1, axis=1)[:, :2]
+            vals = np.take_along_axis(sub, two, axis=1)
+            swap = vals[:, 1] < vals[:, 0]
+            two[swap] = two[swap][:, ::-1]
+            vals[swap] = vals[swap][:, ::-1]
+            argmin[lines] = two
+            # Con una sola celda activa, la penalización es su costo
+            pen[lines] = np.where(np.isinf(vals[:, 1]), vals[:, 0], vals[:, 1] - vals[:, 0])
+
+        penalties(C, np.arange(m), row_pen, row_min)
+        penalties(CT, np.arange(N), col_pen, col_min)
+
+        rows, cols, flows = [], [], []
+        while True:
+            if len(rows) % self.CHECK_EVERY == 0 and self._interrupted():
+                self._set_basis([], [], [])
+                return False
+            i_best = int(np.where(row_active, row_pen, -np.inf).argmax())
+            j_best = int(np.where(col_active, col_pen, -np.inf).argmax())
+            if row_pen[i_best] >= col_pen[j_best]:
+                i, j = i_best, int(row_min[i_best, 0])
+            else:
+                i, j = int(col_min[j_best, 0]), j_best
+
+            # Cada asignación elimina exactamente una línea (salvo la última),
+            # así la base resultante es un árbol con m + N - 1 celdas.
+            if n_rows == 1 and n_cols == 1:
+                rows.append(i); cols.append(j); flows.append(max(rem_d[j], 0.0))
+                break
+            if n_rows == 1:
+                remove_row = False
+            elif n_cols == 1:
+                remove_row = True
+            else:
+                remove_row = rem_s[i] <= rem_d[j]
+            qty = max(rem_s[i] if remove_row else rem_d[j], 0.0)
+            rows.append(i); cols.append(j); flows.append(qty)
+            rem_s[i] -= qty
+            rem_d[j] -= qty
+
+            if remove_row:
+                row_active[i] = False
+                n_rows -= 1
+                C[i, :] = np.inf
+                CT[:, i] = np.inf
+                hit = np.flatnonzero(col_active & ((col_min[:, 0] == i) | (col_min[:, 1] == i)))
+                if hit.size:
+                    penalties(CT, hit, col_pen, col_min)
+            else:
+                col_active[j] = False
+                n_cols -= 1
+                C[:, j] = np.inf
+                CT[j, :] = np.inf
+                hit = np.flatnonzero(row_active & ((row_min[:, 0] == j) | (row_min[:, 1] == j)))
+                if hit.size:
+                    penalties(C, hit, row_pen, row_min)
+
+        self._set_basis(rows, cols, flows)
+        return True
+
+    def _set_basis(self, rows, cols, flows):
+        self._rows = list(rows)
+        self._cols = list(cols)
+        self._flows = list(flows)
+        self._costs = [float(self.cost[i, j]) for i, j in zip(rows, cols)]
+        self._adj = [[] for _ in range(self.m + self.N)]
+        for s, (i, j) in enumerate(zip(rows, cols)):
+            self._adj[i].append(s)
+            self._adj[self.m + j].append(s)
+
+    # --------------------------------------------
+    # Potenciales u-v sobre el árbol básico
+    # --------------------------------------------
+    def _potentials(self):
+        """Calcula u_i + v_j = c_ij en la base, con padre y profundidad de cada nodo."""
+        m = self.m
+        rows, cols, costs, adj = self._rows, self._cols, self._costs, self._adj
+        u = [0.0] * m
+        v = [0.0] * self.N
+        parent = [-1] * (m + self.N)
+        depth = [0] * (m + self.N)
+        seen = [False] * (m + self.N)
+        seen[0] = True
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            for s in adj[node]:
+                if node < m:
+                    other = m + cols[s]
+                    if seen[other]:
+                        continue
+                    v[cols[s]] = costs[s] - u[node]
+                else:
+                    other = rows[s]
+                    if seen[other]:
+                        continue
+                    u[other] = costs[s] - v[node - m]
+                seen[other] = True
+                parent[other] = s
+                depth[other] = depth[node] + 1
+                stack.append(other)
+        self.u = np.array(u)
+        self.v = np.array(v)
+        self._parent = parent
+        self._depth = depth
+
+    def _other(self, node, s):
+        return self.m + self._cols[s] if node < self.m else self._rows[s]
+
+    def _climb(self, a, b):
+        """Celdas desde a y desde b hasta su ancestro común en el árbol."""
+        parent, depth = self._parent, self._depth
+        up_a, up_b = [], []
+        while depth[a] > depth[b]:
+            s = parent[a]
+            up_a.append(s)
+            a = self._other(a, s)
+        while depth[b] > depth[a]:
+            s = parent[b]
+            up_b.append(s)
+            b = self._other(b, s)
+        while a != b:
+            s = parent[a]
+            up_a.append(s)
+            a = self._other(a, s)
+            s = parent[b]
+            up_b.append(s)
+            b = self._other(b, s)
+        return up_a, up_b
+
+    # --------------------------------------------
+    # Pivote por el ciclo stepping-stone
+    # --------------------------------------------
+    def _pivot(self, p, q, reduced_cost):
+        # Ciclo: celda entrante (+), luego el camino columna q → fila p
+        # alternando signos (−, +, −, ...).
+        m = self.m
+        up_q, up_p = self._climb(m + q, p)
+        path = up_q + up_p[::-1]
+        minus = path[0::2]
+        plus = path[1::2]
+        leave = min(minus, key=lambda s: self._flows[s])
+        theta = self._flows[leave]
+        for s in minus:
+            self._flows[s] -= theta
+        for s in plus:
+            self._flows[s] += theta
+        self._swap(leave, p, q, theta, up_q, reduced_cost)
+
+    def _swap(self, leave, p, q, flow, up_q, reduced_cost):
+        # Al quitar la celda saliente se desprende el subárbol del extremo
+        # (columna q o fila p) que quedaba debajo de ella; ese subárbol se
+        # cuelga de la celda entrante y sólo sus potenciales cambian.
+        m = self.m
+        if leave in up_q:
+            detached, anchor, sign = m + q, p, 1.0
+        else:
+            detached, anchor, sign = p, m + q, -1.0
+        self._replace(leave, p, q, flow)
+        self._rehang(detached, anchor, leave, sign * reduced_cost)
+
+    def _replace(self, s, p, q, flow):
+        m = self.m
+        self._adj[self._rows[s]].remove(s)
+        self._adj[m + self._cols[s]].remove(s)
+        self._rows[s] = p
+        self._cols[s] = q
+        self._flows[s] = flow
+        self._costs[s] = float(self.cost[p, q])
+        self._adj[p].append(s)
+        self._adj[m + q].append(s)
+
+    def _rehang(self, root, anchor, s_enter, delta):
+        """Recorre el subárbol colgado de `root`; columnas += delta, filas -= delta."""
+        m = self.m
+        rows, cols = self._rows, self._cols
+        parent, depth, adj = self._parent, self._depth, self._adj
+        parent[root] = s_enter
+        depth[root] = depth[anchor] + 1
+        sub_rows, sub_cols = [], []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            below = depth[node] + 1
+            if node < m:
+                sub_rows.append(node)
+                for s in adj[node]:
+                    if s != parent[node]:
+                        other = m + cols[s]
+                        parent[other] = s
+                        depth[other] = below
+                        stack.append(other)
+            else:
+                sub_cols.append(node - m)
+                for s in adj[node]:
+                    if s != parent[node]:
+                        other = rows[s]
+                        parent[other] = s
+                        depth[other] = below
+                        stack.append(other)
+        self.u[sub_rows] -= delta
+        self.v[sub_cols] += delta
+
+
+def solve_transport_simplex(supply, demand, cost, max_iter=None, time_limit=None, cancel=None):
+    """Resuelve el transporte (oferta ≤, demanda =) con el simplex de transporte."""
+    return TransportSimplex(supply, demand, cost).solve(max_iter, time_limit, cancel)
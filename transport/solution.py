@@ -0,0 +1,62 @@
+# --------------------------------------------
+# Estados de la solución
+# --------------------------------------------
+OPTIMAL = "optimal"
+ITERATION_LIMIT = "iteration_limit"
+INFEASIBLE = "infeasible"
+UNBOUNDED = "unbounded"
+NUMERICAL_ERROR = "numerical_error"
+TIME_LIMIT = "time_limit"
+CANCELLED = "cancelled"
+
+
+# --------------------------------------------
+# Errores de modelado
+# --------------------------------------------
+class ModelError(ValueError):
+    """Datos de entrada que no forman un modelo válido."""
+
+
+class MissingEdgeError(ModelError):
+    """Falta la arista entre un nodo de oferta y uno de demanda."""
+
+    def __init__(self, source, target):
+        super().__init__(f"Falta la arista de {source} a {target}")
+        self.source = source
+        self.target = target
+
+
+# --------------------------------------------
+# Resultado
+# --------------------------------------------
+class Solution:
+    """Resultado de una resolución: flujos (m x n), valor objetivo y estado.
+
+    En asignación, `assignment[i]` es la tarea asignada al agente i. En
+    transporte, `supply_duals` y `demand_duals` son los precios sombra de
+    cada fila de oferta (≤ 0) y de demanda, con la convención de HiGHS.
+    Si el modelo es infactible porque una demanda no tiene aristas,
+    `unreachable` lista sus índices. `stats` son datos del solver para
+    el perfil de la resolución: "solver", "iterations", "solver_seconds"
+    (sólo la llamada al solver), "model_seconds" (armado de restricciones
+    dentro del núcleo), etc., según el método.
+    """
+
+    def __init__(self, status, flows=None, objective=None, message="", assignment=None,
+                 supply_duals=None, demand_duals=None, unreachable=None, stats=None):
+        self.status = status
+        self.flows = flows
+        self.objective = objective
+        self.message = message
+        self.assignment = assignment
+        self.supply_duals = supply_duals
+        self.demand_duals = demand_duals
+        self.unreachable = unreachable
+        self.stats = {} if stats is None else stats
+
+    @property
+    def success(self):
+        return self.status == OPTIMAL
+
+    def __repr__(self):
+        return f"Solution(status={self.status!r}, objective={self.objective!r})"
@@ -0,0 +1,103 @@
+import json
+import time
+from contextlib import contextmanager
+
+# --------------------------------------------
+# Perfil por fases de una resolución
+# --------------------------------------------
+# Una resolución de la GUI pasa por varias fases: armado del modelo,
+# llamada al solver, extracción del resultado, formato del reporte y
+# actualización del canvas. Timings mide cada una con `with
+# timings.phase("solve"): ...` y guarda al lado los datos del solver
+# (Solution.stats), para saber a qué parte culpar cuando algo tarda. Cada
+# perfil se puede agregar a un log JSON (una línea por resolución).
+#
+# De HiGHS sólo se registran tamaño del modelo, iteraciones y tiempos: las
+# filas y columnas que quita el presolve no están disponibles, porque
+# scipy.optimize.linprog no las expone.
+
+PHASES = ("build", "solve", "extract", "format", "canvas")
+
+PHASE_NAMES = {
+    "build": "modelo",
+    "solve": "solver",
+    "extract": "extracción",
+    "format": "reporte",
+    "canvas": "canvas",
+}
+
+
+class Timings:
+    """Segundos por fase de una resolución y estadísticas del solver.
+
+    `phases` acumula los segundos de cada fase (las de PHASES u otras);
+    `stats` junta datos del problema (tamaño, método, estado) y los de
+    Solution.stats.
+    """
+
+    def __init__(self, label=""):
+        self.label = label
+        self.created = time.time()
+        self.phases = {}
+        self.stats = {}
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    @property
+    def total(self):
+        return sum(self.phases.values())
+
+    def summary(self):
+        """Una línea con cada fase en ms, p. ej. "modelo 3.1 ms · solver 250.0 ms"."""
+        names = [name for name in PHASES if name in self.phases]
+        names += [name for name in self.phases if name not in PHASES]
+        parts = [f"{PHASE_NAMES.get(name, name)} {self.phases[name] * 1000:.1f} ms" for name in names]
+        parts.append(f"total {self.total * 1000:.1f} ms")
+        return " · ".join(parts)
+
+    def solver_summary(self):
+        """Una línea con los datos del solver que haya (estado, iteraciones, tamaño)."""
+        s = self.stats
+        parts = [f"{name}: {s[key]}" for key, name in
+                 (("status", "estado"), ("solver", "solver"), ("start", "arranque")) if s.get(key)]
+        if s.get("cached"):
+            parts.append("desde la caché")
+        if "iterations" in s:
+            parts.append(f"iteraciones: {s['iterations']}")
+        if "variables" in s:
+            parts.append(f"variables: {s['variables']}")
+        if "constraints" in s:
+            parts.append(f"restricciones: {s['constraints']} ({s.get('nonzeros', 0)} no nulos)")
+        for key, name in (("model_seconds", "armado A"), ("solver_seconds", "llamada")):
+            if key in s:
+                parts.append(f"{name}: {s[key] * 1000:.1f} ms")
+        return " · ".join(parts)
+
+    def as_dict(self):
+        return {
+            "label": self.label,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.created)),
+            "phases": dict(self.phases),
+            "total": self.total,
+            "stats": dict(self.stats),
+        }
+
+
+def append_log(path, timings):
+    """Agrega el perfil como una línea JSON al final del archivo `path`."""
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(timings.as_dict(), default=_plain) + "\n")
+
+
+def _plain(value):
+    """Números de NumPy y otros valores no JSON como float o texto."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return str(value)